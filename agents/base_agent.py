@@ -3,16 +3,24 @@ Base Agent - Abstract class for all agents
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import asyncio
+import logging
 import time
 from core.logging_config import get_logger
 
 logger = get_logger("base_agent")
 
+# Reasoning step names shared by every execution
+_STEP_INGEST = "ingest"
+_STEP_REASON = "reason"
+_STEP_OUTPUT = "output"
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentResult:
     """Result from agent execution"""
     agent_id: str
@@ -97,8 +105,9 @@ class BaseAgent(ABC):
         Returns:
             AgentResult with complete execution details
         """
-        start_time = time.time()
-        self.logger.info(f"Executing agent: {self.agent_id}")
+        start_ns = time.perf_counter_ns()
+        self.logger.info("Executing agent: %s", self.agent_id)
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
         
         try:
             # Track reasoning steps and tool calls
@@ -106,10 +115,11 @@ class BaseAgent(ABC):
             tool_calls = []
             
             # Ingest
-            self.logger.debug("Ingesting input")
+            if debug_enabled:
+                self.logger.debug("Ingesting input")
             processed_input = self.ingest(input_data)
             reasoning_steps.append({
-                "step": "ingest",
+                "step": _STEP_INGEST,
                 "result": "Input validated and processed"
             })
             
@@ -118,23 +128,25 @@ class BaseAgent(ABC):
                 processed_input["context"] = context
             
             # Reason
-            self.logger.debug("Applying reasoning")
+            if debug_enabled:
+                self.logger.debug("Applying reasoning")
             reasoning_result = self.reason(processed_input)
             reasoning_steps.append({
-                "step": "reason",
+                "step": _STEP_REASON,
                 "result": f"Reasoning complete with {len(reasoning_result.get('conclusions', []))} conclusions"
             })
             
             # Output
-            self.logger.debug("Formatting output")
+            if debug_enabled:
+                self.logger.debug("Formatting output")
             final_output = self.output(reasoning_result)
             reasoning_steps.append({
-                "step": "output",
+                "step": _STEP_OUTPUT,
                 "result": "Output formatted"
             })
             
             # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
             
             # Extract confidence (default to 1.0 if not provided)
             confidence = reasoning_result.get("confidence", 1.0)
@@ -149,22 +161,65 @@ class BaseAgent(ABC):
                 duration_ms=duration_ms,
                 metadata={
                     "description": self.description,
-                    "input_keys": list(input_data.keys()),
+                    "input_keys": tuple(input_data),
                     "has_context": context is not None
                 },
                 timestamp=datetime.now(timezone.utc)
             )
             
             self.logger.info(
-                f"Agent execution complete: {duration_ms:.2f}ms, "
-                f"confidence: {confidence:.2f}"
+                "Agent execution complete: %.2fms, confidence: %.2f",
+                duration_ms, confidence
             )
             
             return result
             
         except Exception as e:
-            self.logger.error(f"Agent execution failed: {e}", exc_info=True)
+            self.logger.error("Agent execution failed: %s", e, exc_info=True)
             raise
     
+    def execute_batch(
+        self,
+        inputs: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4
+    ) -> List[AgentResult]:
+        """
+        Execute the agent on several inputs concurrently
+        
+        Args:
+            inputs: Input data for each case
+            context: Additional context shared by all cases
+            max_workers: Maximum concurrent executions
+            
+        Returns:
+            AgentResults in input order
+        """
+        if len(inputs) <= 1:
+            return [self.execute(input_data, context) for input_data in inputs]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(inputs))) as pool:
+            return list(pool.map(lambda input_data: self.execute(input_data, context), inputs))
+    
+    async def aexecute(
+        self,
+        input_data: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> AgentResult:
+        """
+        Async variant of execute()
+        
+        Runs the synchronous pipeline in a worker thread so blocking LLM and
+        vector-store calls do not stall the event loop.
+        
+        Args:
+            input_data: Input data
+            context: Additional context for reasoning
+            
+        Returns:
+            AgentResult with complete execution details
+        """
+        return await asyncio.to_thread(self.execute, input_data, context)
+    
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}(id='{self.agent_id}')>"
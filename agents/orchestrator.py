@@ -3,7 +3,13 @@ Multi-Agent Orchestrator
 Coordinates execution of specialized agents with dependency management
 """
 
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import asyncio
+import copy
+import hashlib
+import json
+from typing import Dict, Any, List, Optional, Callable, Literal
 from agents.base_agent import BaseAgent, AgentResult
 from agents.specialized_agents import (
     EvidenceIngestionAgent,
@@ -16,11 +22,33 @@ from causal.graph_builder import get_graph_builder
 from causal.confidence import get_confidence_scorer, ConfidenceFactors
 from causal.trail_extractor import get_trail_extractor
 from causal.bias_detector import get_bias_detector, BiasReport
+from core.cache import LRUCache
 from core.logging_config import get_logger
 import time
 
 logger = get_logger("orchestrator")
 
+# Result detail levels accepted by execute_pipeline
+DETAIL_LEVELS = ("minimal", "standard", "full")
+
+
+@dataclass(slots=True)
+class PipelineState:
+    """Typed working state handed from one pipeline stage to the next"""
+    input_id: int
+    extracted_data: Dict[str, Any] = field(default_factory=dict)
+    context_documents: List[Dict[str, Any]] = field(default_factory=list)
+    causal_output: Dict[str, Any] = field(default_factory=dict)
+    causal_chains: List[Dict[str, Any]] = field(default_factory=list)
+    contradiction_output: Dict[str, Any] = field(default_factory=dict)
+    # Results of the agents that have finished, in pipeline order
+    agent_results: Dict[str, AgentResult] = field(default_factory=dict)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize agent payloads for the vault (JSON, non-JSON values stringified)"""
+    return json.dumps(obj, default=str)
+
 
 class AgentOrchestrator:
     """
@@ -28,9 +56,66 @@ class AgentOrchestrator:
     Implements the autonomous reasoning loop.
     """
     
-    def __init__(self):
-        """Initialize orchestrator with agents"""
-        self.vault = get_vault()
+    # Recommendation issued for each risk flag
+    _REC_TABLE = {
+        "LOW_CONFIDENCE": "Human review recommended due to low confidence",
+        "CONTRADICTIONS_FOUND": "Expert consultation advised to resolve contradictions",
+        "NO_CONTEXT_AVAILABLE": "Consider gathering additional medical context"
+    }
+    
+    def __init__(
+        self,
+        max_parallel: int = 4,
+        cache_size: int = 256,
+        max_concurrent_pipelines: int = 8,
+        recommendation_table: Optional[Dict[str, str]] = None,
+        vault: Optional[Any] = None,
+        graph_builder: Optional[Any] = None,
+        confidence_scorer: Optional[Any] = None,
+        trail_extractor: Optional[Any] = None,
+        bias_detector: Optional[Any] = None
+    ):
+        """
+        Initialize orchestrator with agents
+        
+        Args:
+            max_parallel: Maximum number of independent stages run concurrently
+            cache_size: Maximum number of memoized results per cache
+            max_concurrent_pipelines: Maximum number of pipelines served
+                concurrently through aexecute_pipeline
+            recommendation_table: Extra or overriding risk flag -> recommendation
+                entries merged over the defaults
+            vault: Audit vault (defaults to the shared get_vault() instance)
+            graph_builder: Causal graph builder (defaults to get_graph_builder())
+            confidence_scorer: Confidence scorer (defaults to get_confidence_scorer())
+            trail_extractor: Trail extractor (defaults to get_trail_extractor())
+            bias_detector: Bias detector (defaults to get_bias_detector())
+        """
+        self.vault = vault if vault is not None else get_vault()
+        self.graph_builder = graph_builder if graph_builder is not None else get_graph_builder()
+        self.confidence_scorer = (
+            confidence_scorer if confidence_scorer is not None else get_confidence_scorer()
+        )
+        self.trail_extractor = trail_extractor if trail_extractor is not None else get_trail_extractor()
+        self.bias_detector = bias_detector if bias_detector is not None else get_bias_detector()
+        self.max_parallel = max_parallel
+        self.recommendation_table = {**self._REC_TABLE, **(recommendation_table or {})}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_parallel,
+            thread_name_prefix="orchestrator"
+        )
+        # Separate pool so pipeline workers never starve the stage pool above
+        self._pipeline_executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_pipelines,
+            thread_name_prefix="pipeline"
+        )
+        
+        # Memoized pipeline results and reusable agent sub-results
+        self._result_cache = LRUCache(max_size=cache_size)
+        self._evidence_cache = LRUCache(max_size=cache_size)
+        self._context_cache = LRUCache(max_size=cache_size)
+        # Compact per-input result summaries for near-duplicate lookups
+        self._summary_cache = LRUCache(max_size=cache_size)
         
         # Initialize agents
         self.agents = {
@@ -46,7 +131,8 @@ class AgentOrchestrator:
         self,
         input_text: str,
         source: str = "user",
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        detail_level: Literal["minimal", "standard", "full"] = "full"
     ) -> Dict[str, Any]:
         """
         Execute full reasoning pipeline
@@ -55,11 +141,28 @@ class AgentOrchestrator:
             input_text: Raw input text (medical case, query, etc.)
             source: Source of input
             metadata: Additional metadata
+            detail_level: How much of the graph/trail to render in the result.
+                "minimal" skips graph stats, exports and the reasoning trail,
+                "standard" skips only the graph JSON and visual exports,
+                "full" renders everything. Skipped fields are None.
             
         Returns:
             Complete reasoning result with all agent outputs
         """
-        start_time = time.time()
+        if detail_level not in DETAIL_LEVELS:
+            raise ValueError(f"detail_level must be one of {DETAIL_LEVELS}, got '{detail_level}'")
+        
+        start_ns = time.perf_counter_ns()
+        
+        cache_key = self._cache_key(input_text, source, metadata, detail_level)
+        cached_result = self._result_cache.get(cache_key)
+        if cached_result is not None:
+            logger.info("Pipeline cache hit, returning memoized result")
+            result = copy.deepcopy(cached_result)
+            self._log_cache_hit(result, input_text, source, metadata)
+            result["total_duration_ms"] = (time.perf_counter_ns() - start_ns) / 1e6
+            return result
+        
         logger.info("Starting reasoning pipeline")
         
         # Log input to vault
@@ -69,125 +172,98 @@ class AgentOrchestrator:
             metadata=metadata or {}
         )
         
+        state = PipelineState(input_id=input_id)
+        persisted = False
+        
         try:
             # Step 1: Evidence Ingestion
             logger.info("Step 1: Evidence Ingestion")
-            evidence_result = self.agents["evidence_ingestion"].execute({
-                "text": input_text,
-                "source": source,
-                "metadata": metadata
-            })
-            
-            # Log to vault
-            exec_id_evidence = self.vault.log_agent_execution(
-                input_id=input_id,
-                agent_id="evidence_ingestion",
-                agent_input=input_text,
-                agent_output=str(evidence_result.output),
-                tool_calls=[],
-                duration_ms=evidence_result.duration_ms
-            )
+            # The evidence agent also sees source and metadata, so they key its result too
+            evidence_key = self._cache_key(input_text, source, metadata)
+            evidence_result = self._evidence_cache.get(evidence_key)
+            if evidence_result is None:
+                evidence_result = self.agents["evidence_ingestion"].execute({
+                    "text": input_text,
+                    "source": source,
+                    "metadata": metadata
+                })
+                self._evidence_cache.put(evidence_key, evidence_result)
             
-            extracted_data = evidence_result.output
+            state.agent_results["evidence_ingestion"] = evidence_result
+            state.extracted_data = evidence_result.output
             
             # Step 2: Medical Context Retrieval (RAG)
             logger.info("Step 2: Medical Context Retrieval")
-            context_result = self.agents["medical_context"].execute({
-                "extracted_data": extracted_data,
-                "top_k": 5
-            })
+            context_key = self._cache_key(state.extracted_data)
+            context_result = self._context_cache.get(context_key)
+            if context_result is None:
+                context_result = self.agents["medical_context"].execute({
+                    "extracted_data": state.extracted_data,
+                    "top_k": 5
+                })
+                self._context_cache.put(context_key, context_result)
             
-            exec_id_context = self.vault.log_agent_execution(
-                input_id=input_id,
-                agent_id="medical_context",
-                agent_input=str(extracted_data),
-                agent_output=str(context_result.output),
-                duration_ms=context_result.duration_ms
-            )
-            
-            context_documents = context_result.output
+            state.agent_results["medical_context"] = context_result
+            state.context_documents = context_result.output
             
             # Step 3: Causal Inference
             logger.info("Step 3: Causal Inference")
             causal_result = self.agents["causal_inference"].execute({
-                "extracted_data": extracted_data,
-                "context_documents": context_documents
+                "extracted_data": state.extracted_data,
+                "context_documents": state.context_documents
             })
             
-            exec_id_causal = self.vault.log_agent_execution(
-                input_id=input_id,
-                agent_id="causal_inference",
-                agent_input=str({"extracted_data": extracted_data}),
-                agent_output=str(causal_result.output),
-                duration_ms=causal_result.duration_ms
-            )
-            
-            # Log causal steps to vault
-            causal_chains = causal_result.output.get("causal_chains", [])
-            for chain in causal_chains:
-                self.vault.log_causal_step(
-                    execution_id=exec_id_causal,
-                    premise=chain.get("from", ""),
-                    conclusion=chain.get("to", ""),
-                    confidence=chain.get("confidence", 0.5),
-                    evidence_refs=[chain.get("evidence", "")],
-                    reasoning_type="causal"
-                )
+            state.agent_results["causal_inference"] = causal_result
+            state.causal_output = causal_result.output
+            state.causal_chains = state.causal_output.get("causal_chains", [])
             
             # Step 4: Contradiction Resolution
             logger.info("Step 4: Contradiction Resolution")
             contradiction_result = self.agents["contradiction_resolution"].execute({
-                "causal_chains": causal_chains,
-                "context_documents": context_documents
+                "causal_chains": state.causal_chains,
+                "context_documents": state.context_documents
             })
             
-            exec_id_contradiction = self.vault.log_agent_execution(
-                input_id=input_id,
-                agent_id="contradiction_resolution",
-                agent_input=str({"causal_chains": causal_chains}),
-                agent_output=str(contradiction_result.output),
-                duration_ms=contradiction_result.duration_ms
-            )
+            state.agent_results["contradiction_resolution"] = contradiction_result
+            state.contradiction_output = contradiction_result.output
+            contradictions = state.contradiction_output.get("contradictions", [])
+            resolutions = state.contradiction_output.get("resolutions", [])
             
             # === PHASE 3: Causal Graph & Confidence Scoring ===
             
             # Step 5: Build Causal Graph
             logger.info("Step 5: Building Causal Graph")
-            graph_builder = get_graph_builder()
-            causal_graph = graph_builder.build_from_results(
-                evidence_output=extracted_data,
-                context_output=context_documents,
-                causal_output=causal_result.output,
-                contradiction_output=contradiction_result.output
+            causal_graph = self.graph_builder.build_from_results(
+                evidence_output=state.extracted_data,
+                context_output=state.context_documents,
+                causal_output=state.causal_output,
+                contradiction_output=state.contradiction_output
             )
             
             # Step 6: Calculate Multi-Factor Confidence
             logger.info("Step 6: Calculating Multi-Factor Confidence")
-            confidence_scorer = get_confidence_scorer()
-            
             # Calculate evidence quality
-            evidence_quality = confidence_scorer.calculate_evidence_quality(
+            evidence_quality = self.confidence_scorer.calculate_evidence_quality(
                 source_credibility=0.7,  # Clinical notes/guidelines
                 recency_score=0.9,  # Recent data
                 sample_size_score=0.6  # Limited sample
             )
             
             # Calculate reasoning coherence
-            has_contradictions = len(contradiction_result.output.get("contradictions", [])) > 0
-            is_complete_chain = len(causal_chains) > 0
-            reasoning_coherence = confidence_scorer.calculate_reasoning_coherence(
+            has_contradictions = bool(contradictions)
+            is_complete_chain = bool(state.causal_chains)
+            reasoning_coherence = self.confidence_scorer.calculate_reasoning_coherence(
                 has_contradictions=has_contradictions,
                 is_complete_chain=is_complete_chain,
                 logical_consistency_score=0.85
             )
             
-            # Aggregate agent confidences for LLM confidence
-            agent_confidences = [
-                evidence_result.confidence,
-                causal_result.confidence,
-                contradiction_result.confidence
-            ]
-            llm_confidence = sum(agent_confidences) / len(agent_confidences)
+            # Aggregate agent confidences for LLM confidence (mean of the three LLM agents)
+            llm_confidence = (
+                evidence_result.confidence
+                + causal_result.confidence
+                + contradiction_result.confidence
+            ) / 3
             
             # Context match from RAG
             context_match = context_result.confidence
@@ -199,55 +275,67 @@ class AgentOrchestrator:
                 llm_confidence=llm_confidence,
                 context_match=context_match
             )
-            overall_confidence = confidence_scorer.calculate_from_factors(confidence_factors)
-            confidence_level = confidence_scorer.get_level(overall_confidence)
+            overall_confidence = self.confidence_scorer.calculate_from_factors(confidence_factors)
+            confidence_level = self.confidence_scorer.get_level(overall_confidence)
             
-            logger.info(f"Multi-factor confidence: {overall_confidence:.2%} ({confidence_level})")
+            logger.info("Multi-factor confidence: %.2f%% (%s)", overall_confidence * 100, confidence_level)
             
-            # Step 7: Detect Bias
+            # Steps 7-8 only read the finished graph, so run them concurrently
             logger.info("Step 7: Check for Bias")
-            bias_detector = get_bias_detector()
-            bias_report = bias_detector.check_graph(causal_graph, metadata or {})
+            logger.info("Step 8: Extracting Reasoning Trail")
+            stages = {
+                "bias_report": lambda: self.bias_detector.check_graph(causal_graph, metadata or {})
+            }
+            if detail_level != "minimal":
+                stages["graph_stats"] = causal_graph.get_stats
+                stages["reasoning_trail"] = lambda: self.trail_extractor.extract(causal_graph)
+            if detail_level == "full":
+                stages["visual_export"] = lambda: self.trail_extractor.export_graph_for_react_flow(causal_graph)
+                stages["export_json"] = lambda: causal_graph.to_json(indent=None)
             
-            if bias_report.has_bias:
-                logger.warning(f"Potential bias detected: {bias_report.detected_types}")
-                risk_flags.append(f"BIAS_DETECTED: {','.join(bias_report.detected_types)}")
+            stage_results = self._run_parallel(stages)
+            bias_report = stage_results["bias_report"]
+            reasoning_trail = stage_results.get("reasoning_trail")
+            trail_summary = None
+            if reasoning_trail is not None:
+                trail_summary = self.trail_extractor.generate_summary(causal_graph, reasoning_trail)
             
-            # Step 8: Extract Reasoning Trail
-            logger.info("Step 8: Extracting Reasoning Trail")
-            trail_extractor = get_trail_extractor()
-            reasoning_trail = trail_extractor.extract(causal_graph)
-            visual_export = trail_extractor.export_graph_for_react_flow(causal_graph)
-            trail_summary = trail_extractor.generate_summary(causal_graph, reasoning_trail)
+            if bias_report.has_bias:
+                logger.warning("Potential bias detected: %s", bias_report.detected_types)
             
             # Generate final conclusion
             conclusion = self._generate_conclusion(
-                extracted_data=extracted_data,
-                causal_chains=causal_chains,
-                contradictions=contradiction_result.output.get("contradictions", []),
-                resolutions=contradiction_result.output.get("resolutions", [])
+                extracted_data=state.extracted_data,
+                causal_chains=state.causal_chains,
+                contradictions=contradictions,
+                resolutions=resolutions
             )
             
             # Determine risk flags
-            risk_flags = []
-            if overall_confidence < 0.7:
-                risk_flags.append("LOW_CONFIDENCE")
-            if contradiction_result.output.get("contradictions"):
-                risk_flags.append("CONTRADICTIONS_FOUND")
-            if not context_documents:
-                risk_flags.append("NO_CONTEXT_AVAILABLE")
-            
-            # Log final output to vault
-            output_id = self.vault.log_output(
-                execution_id=exec_id_contradiction,
-                conclusion=conclusion,
-                confidence=overall_confidence,
-                risk_flags=risk_flags,
-                recommendations=self._generate_recommendations(risk_flags, overall_confidence)
-            )
+            risk_flags = [
+                flag for condition, flag in (
+                    (overall_confidence < 0.7, "LOW_CONFIDENCE"),
+                    (has_contradictions, "CONTRADICTIONS_FOUND"),
+                    (not state.context_documents, "NO_CONTEXT_AVAILABLE"),
+                    (bias_report.has_bias, f"BIAS_DETECTED: {','.join(bias_report.detected_types)}")
+                )
+                if condition
+            ]
+            
+            # Persist the audit trail in a single vault transaction
+            with self.vault.transaction():
+                exec_ids = self._log_agent_executions(state, input_text)
+                output_id = self.vault.log_output(
+                    execution_id=exec_ids["contradiction_resolution"],
+                    conclusion=conclusion,
+                    confidence=overall_confidence,
+                    risk_flags=risk_flags,
+                    recommendations=self._generate_recommendations(risk_flags, overall_confidence)
+                )
+            persisted = True
             
             # Compile full result
-            total_duration = (time.time() - start_time) * 1000
+            total_duration = (time.perf_counter_ns() - start_ns) / 1e6
             
             result = {
                 "input_id": input_id,
@@ -271,48 +359,249 @@ class AgentOrchestrator:
                 },
                 "causal_graph": {
                     "graph_id": causal_graph.graph_id,
-                    "stats": causal_graph.get_stats(),
-                    "export_json": causal_graph.to_json(),
-                    "visual_export": visual_export
+                    "stats": stage_results.get("graph_stats"),
+                    "export_json": stage_results.get("export_json"),
+                    "visual_export": stage_results.get("visual_export")
                 },
                 "reasoning_trail": reasoning_trail,
                 "trail_summary": trail_summary,
                 "agent_results": {
-                    "evidence_ingestion": {
-                        "output": evidence_result.output,
-                        "confidence": evidence_result.confidence,
-                        "duration_ms": evidence_result.duration_ms
-                    },
-                    "medical_context": {
-                        "output": context_result.output,
-                        "confidence": context_result.confidence,
-                        "duration_ms": context_result.duration_ms
-                    },
-                    "causal_inference": {
-                        "output": causal_result.output,
-                        "confidence": causal_result.confidence,
-                        "duration_ms": causal_result.duration_ms
-                    },
-                    "contradiction_resolution": {
-                        "output": contradiction_result.output,
-                        "confidence": contradiction_result.confidence,
-                        "duration_ms": contradiction_result.duration_ms
+                    agent_id: {
+                        "output": agent_result.output,
+                        "confidence": agent_result.confidence,
+                        "duration_ms": agent_result.duration_ms
                     }
+                    for agent_id, agent_result in state.agent_results.items()
                 },
                 "total_duration_ms": total_duration
             }
             
             logger.info(
-                f"Pipeline complete: {total_duration:.2f}ms, "
-                f"confidence: {overall_confidence:.2f}"
+                "Pipeline complete: %.2fms, confidence: %.2f",
+                total_duration, overall_confidence
             )
             
+            self._result_cache.put(cache_key, copy.deepcopy(result))
+            
+            input_hash = self._cache_key(input_text)
+            self._summary_cache.put(input_hash, {
+                "input_hash": input_hash,
+                "conclusion": conclusion,
+                "confidence": overall_confidence,
+                "top_diagnoses": list(state.extracted_data.get("diagnoses", [])[:3]),
+                "symptoms": frozenset(
+                    str(symptom).lower() for symptom in state.extracted_data.get("symptoms", [])
+                ),
+                "graph_size": {
+                    "num_nodes": causal_graph.graph.number_of_nodes(),
+                    "num_edges": causal_graph.graph.number_of_edges()
+                }
+            })
+            
             return result
             
         except Exception as e:
-            logger.error(f"Pipeline execution failed: {e}", exc_info=True)
+            logger.error("Pipeline execution failed: %s", e, exc_info=True)
+            if not persisted:
+                # Keep the audit trail of the agents that did run
+                try:
+                    with self.vault.transaction():
+                        self._log_agent_executions(state, input_text)
+                except Exception as log_error:
+                    logger.error("Failed to log completed agent executions: %s", log_error)
             raise
     
+    def execute_batch(
+        self,
+        input_texts: List[str],
+        source: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+        detail_level: Literal["minimal", "standard", "full"] = "full"
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute the pipeline for several cases concurrently
+        
+        Cases run side by side on the pipeline pool (at most
+        max_concurrent_pipelines at once), so their LLM and retrieval
+        round-trips overlap instead of queueing behind each other.
+        
+        Args:
+            input_texts: Raw input text for each case
+            source: Source of input
+            metadata: Additional metadata shared by all cases
+            detail_level: See execute_pipeline
+            
+        Returns:
+            Pipeline results in input order
+        """
+        return list(self._pipeline_executor.map(
+            lambda input_text: self.execute_pipeline(input_text, source, metadata, detail_level),
+            input_texts
+        ))
+    
+    async def aexecute_pipeline(
+        self,
+        input_text: str,
+        source: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+        detail_level: Literal["minimal", "standard", "full"] = "full"
+    ) -> Dict[str, Any]:
+        """
+        Async variant of execute_pipeline for event-loop callers
+        
+        The pipeline runs on a bounded worker pool, so at most
+        max_concurrent_pipelines runs are in flight per orchestrator while
+        the event loop stays free.
+        
+        Args:
+            input_text: Raw input text (medical case, query, etc.)
+            source: Source of input
+            metadata: Additional metadata
+            detail_level: See execute_pipeline
+            
+        Returns:
+            Complete reasoning result with all agent outputs
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pipeline_executor,
+            lambda: self.execute_pipeline(input_text, source, metadata, detail_level)
+        )
+    
+    async def aexecute_batch(
+        self,
+        input_texts: List[str],
+        source: str = "user",
+        metadata: Optional[Dict[str, Any]] = None,
+        detail_level: Literal["minimal", "standard", "full"] = "full"
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of execute_batch
+        
+        Cases are gathered on the event loop; the pipeline pool bounds how
+        many run at once, so one case's retrieval overlaps another's LLM call.
+        
+        Args:
+            input_texts: Raw input text for each case
+            source: Source of input
+            metadata: Additional metadata shared by all cases
+            detail_level: See execute_pipeline
+            
+        Returns:
+            Pipeline results in input order
+        """
+        return list(await asyncio.gather(*(
+            self.aexecute_pipeline(input_text, source, metadata, detail_level)
+            for input_text in input_texts
+        )))
+    
+    def get_similar(
+        self,
+        input_text: str,
+        symptoms: Optional[List[str]] = None,
+        min_similarity: float = 0.5,
+        source: str = "user",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the summary of a previous run matching this input
+        
+        Exact input matches are returned first. Otherwise previous runs are
+        ranked by Jaccard similarity of their extracted symptoms; symptoms
+        default to the memoized evidence extraction for this text (with
+        this source and metadata), if any.
+        
+        Args:
+            input_text: Raw input text
+            symptoms: Symptoms to compare against (optional)
+            min_similarity: Minimum Jaccard similarity to accept a match
+            source: Source the input was run with
+            metadata: Metadata the input was run with
+            
+        Returns:
+            Summary dict with a "similarity" score, or None if nothing matches
+        """
+        input_hash = self._cache_key(input_text)
+        exact = self._summary_cache.get(input_hash)
+        if exact is not None:
+            return {**exact, "similarity": 1.0}
+        
+        if symptoms is None:
+            evidence_result = self._evidence_cache.get(
+                self._cache_key(input_text, source, metadata)
+            )
+            if evidence_result is None:
+                return None
+            symptoms = evidence_result.output.get("symptoms", [])
+        
+        query = frozenset(str(symptom).lower() for symptom in symptoms)
+        if not query:
+            return None
+        
+        best, best_score = None, min_similarity
+        for summary in self._summary_cache.values():
+            candidate = summary["symptoms"]
+            if not candidate:
+                continue
+            score = len(query & candidate) / len(query | candidate)
+            if score >= best_score:
+                best, best_score = summary, score
+        
+        return {**best, "similarity": best_score} if best is not None else None
+    
+    @staticmethod
+    def _cache_key(*parts: Any) -> str:
+        """Content-addressable key for memoization (inputs may be unhashable dicts)"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized pipeline results and agent sub-results"""
+        self._result_cache.clear()
+        self._evidence_cache.clear()
+        self._context_cache.clear()
+        self._summary_cache.clear()
+        logger.info("Orchestrator caches cleared")
+    
+    def close(self) -> None:
+        """Shut down the stage and pipeline worker pools (running work still finishes)"""
+        self._executor.shutdown(wait=False)
+        self._pipeline_executor.shutdown(wait=False)
+    
+    def __del__(self) -> None:
+        # Release the pool threads of orchestrators that were never closed
+        if "_pipeline_executor" in self.__dict__:
+            self.close()
+    
+    def _run_parallel(self, tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Run independent pipeline stages concurrently
+        
+        Every stage runs to completion even if a sibling fails; the first
+        failure is re-raised once all stages have settled.
+        
+        Args:
+            tasks: Mapping of stage name to zero-argument callable
+            
+        Returns:
+            Mapping of stage name to stage result
+        """
+        futures = {name: self._executor.submit(task) for name, task in tasks.items()}
+        
+        results = {}
+        errors = []
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error("Pipeline stage '%s' failed: %s", name, e)
+                errors.append(e)
+        
+        if errors:
+            raise errors[0]
+        
+        return results
+    
     def _generate_conclusion(
         self,
         extracted_data: Dict[str, Any],
@@ -321,59 +610,147 @@ class AgentOrchestrator:
         resolutions: List[Dict[str, Any]]
     ) -> str:
         """Generate human-readable conclusion"""
-        parts = []
-        
         # Summary of extracted data
         symptoms = extracted_data.get("symptoms", [])
         diagnoses = extracted_data.get("diagnoses", [])
-        treatments = extracted_data.get("treatments", [])
         
-        if diagnoses:
-            parts.append(f"Identified diagnoses: {', '.join(diagnoses)}")
-        
-        if symptoms:
-            parts.append(f"Based on symptoms: {', '.join(symptoms[:3])}")
-        
-        # Causal relationships
-        if causal_chains:
-            parts.append(f"Established {len(causal_chains)} causal relationships")
-        
-        # Contradictions
-        if contradictions:
-            parts.append(
+        parts = tuple(part for part in (
+            f"Identified diagnoses: {', '.join(diagnoses)}" if diagnoses else None,
+            f"Based on symptoms: {', '.join(symptoms[:3])}" if symptoms else None,
+            # Causal relationships
+            f"Established {len(causal_chains)} causal relationships" if causal_chains else None,
+            # Contradictions
+            (
                 f"Note: {len(contradictions)} contradictions found and "
                 f"{len(resolutions)} resolutions proposed"
-            )
+            ) if contradictions else None
+        ) if part)
         
         if not parts:
-            parts.append("Insufficient information for conclusive analysis")
+            return "Insufficient information for conclusive analysis."
         
         return ". ".join(parts) + "."
     
+    def _log_agent_executions(self, state: PipelineState, input_text: str) -> Dict[str, int]:
+        """
+        Log the executions of the agents that have finished
+        
+        Agents run in order, so state.agent_results holds a prefix of the
+        pipeline; the causal inference execution also logs its causal steps.
+        Call inside vault.transaction().
+        
+        Args:
+            state: Pipeline state with the finished agents' results
+            input_text: Raw input text given to the evidence agent
+            
+        Returns:
+            Execution ID per logged agent
+        """
+        results = state.agent_results
+        exec_ids: Dict[str, int] = {}
+        if "evidence_ingestion" not in results:
+            return exec_ids
+        
+        def log(agent_id: str, agent_input: str, agent_output: str, **kwargs) -> None:
+            exec_ids[agent_id] = self.vault.log_agent_execution(
+                input_id=state.input_id,
+                agent_id=agent_id,
+                agent_input=agent_input,
+                agent_output=agent_output,
+                duration_ms=results[agent_id].duration_ms,
+                **kwargs
+            )
+        
+        # Serialize each payload once; shared payloads reuse the same string
+        extracted_json = _dumps(state.extracted_data)
+        log("evidence_ingestion", input_text, extracted_json, tool_calls=[])
+        
+        if "medical_context" in results:
+            log("medical_context", extracted_json, _dumps(state.context_documents))
+        
+        if "causal_inference" in results:
+            log(
+                "causal_inference",
+                '{"extracted_data": ' + extracted_json + '}',
+                _dumps(state.causal_output)
+            )
+            self.vault.log_causal_steps_bulk(
+                execution_id=exec_ids["causal_inference"],
+                steps=[
+                    {
+                        "premise": chain.get("from", ""),
+                        "conclusion": chain.get("to", ""),
+                        "confidence": chain.get("confidence", 0.5),
+                        "evidence_refs": [chain["evidence"]] if chain.get("evidence") else [],
+                        "reasoning_type": "causal"
+                    }
+                    for chain in state.causal_chains
+                ]
+            )
+        
+        if "contradiction_resolution" in results:
+            log(
+                "contradiction_resolution",
+                '{"causal_chains": ' + _dumps(state.causal_chains) + '}',
+                _dumps(state.contradiction_output)
+            )
+        
+        return exec_ids
+    
+    def _log_cache_hit(
+        self,
+        result: Dict[str, Any],
+        input_text: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Record a memoized result in the vault before serving it
+        
+        Logs the input (inputs are unique by content, so this returns the
+        original record), a "result_cache" execution naming the output it
+        was memoized from, and a new output repeating that conclusion.
+        The result's input_id and output_id are updated in place.
+        """
+        with self.vault.transaction():
+            input_id = self.vault.log_input(
+                source=source,
+                content=input_text,
+                metadata=metadata or {}
+            )
+            exec_id = self.vault.log_agent_execution(
+                input_id=input_id,
+                agent_id="result_cache",
+                agent_input=input_text,
+                agent_output=_dumps({"cached_output_id": result["output_id"]}),
+                duration_ms=0.0
+            )
+            output_id = self.vault.log_output(
+                execution_id=exec_id,
+                conclusion=result["conclusion"],
+                confidence=result["confidence"],
+                risk_flags=result["risk_flags"],
+                recommendations=self._generate_recommendations(
+                    result["risk_flags"], result["confidence"]
+                )
+            )
+        
+        result["input_id"] = input_id
+        result["output_id"] = output_id
+    
     def _generate_recommendations(
         self,
         risk_flags: List[str],
         confidence: float
     ) -> List[str]:
         """Generate recommendations based on risk flags"""
-        recommendations = []
-        
-        if "LOW_CONFIDENCE" in risk_flags:
-            recommendations.append("Human review recommended due to low confidence")
-        
-        if "CONTRADICTIONS_FOUND" in risk_flags:
-            recommendations.append("Expert consultation advised to resolve contradictions")
-        
-        if "NO_CONTEXT_AVAILABLE" in risk_flags:
-            recommendations.append("Consider gathering additional medical context")
+        table = self.recommendation_table
+        recommendations = [table[flag] for flag in risk_flags if flag in table]
         
         if confidence < 0.5:
             recommendations.append("CRITICAL: Confidence below threshold - do not proceed without review")
         
-        if not recommendations:
-            recommendations.append("Analysis appears sound - proceed with clinical judgment")
-        
-        return recommendations
+        return recommendations or ["Analysis appears sound - proceed with clinical judgment"]
     
     def get_reasoning_trail(self, execution_id: int) -> Dict[str, Any]:
         """Retrieve complete reasoning trail from vault"""
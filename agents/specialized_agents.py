@@ -5,9 +5,9 @@ Evidence Ingestion, Medical Context, Causal Inference, Contradiction Resolution
 
 from typing import Dict, Any, List, Optional
 import re
-import json
 from agents.base_agent import BaseAgent
 from core.llm_manager import get_llm_manager
+from core.llm_cache import LLMResponseCache
 from storage.vector_store import get_vector_store
 from core.logging_config import get_logger
 
@@ -20,12 +20,18 @@ class EvidenceIngestionAgent(BaseAgent):
     Focuses on symptoms, diagnoses, treatments, outcomes.
     """
     
+    SYSTEM_MESSAGE = """You are a medical information extraction expert. 
+Extract structured medical information from the provided text.
+Identify: symptoms, diagnoses, treatments, medications, test results, and outcomes.
+Return a JSON object with these categories."""
+    
     def __init__(self):
         super().__init__(
             agent_id="evidence_ingestion",
             description="Extracts structured medical data from inputs"
         )
         self.llm = get_llm_manager()
+        self.cache = LLMResponseCache(self.llm)
     
     def ingest(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate input has required fields"""
@@ -42,11 +48,6 @@ class EvidenceIngestionAgent(BaseAgent):
         """Extract structured medical information using LLM"""
         raw_text = processed_input["raw_text"]
         
-        system_message = """You are a medical information extraction expert. 
-Extract structured medical information from the provided text.
-Identify: symptoms, diagnoses, treatments, medications, test results, and outcomes.
-Return a JSON object with these categories."""
-        
         prompt = f"""Extract medical information from this text:
 
 {raw_text}
@@ -63,17 +64,15 @@ Return a JSON object with the following structure:
 }}"""
         
        # Call LLM with JSON response format
-        response = self.llm.generate(
+        extracted_data = self.cache.generate_json(
             prompt=prompt,
-            system_message=system_message,
+            system_message=self.SYSTEM_MESSAGE,
             temperature=0.3,  # Lower temperature for extraction
             response_format={"type": "json_object"}
         )
         
         # Parse JSON response
-        try:
-            extracted_data = json.loads(response["output"])
-        except json.JSONDecodeError:
+        if extracted_data is None:
             self.logger.warning("Failed to parse JSON, using fallback")
             extracted_data = {
                 "symptoms": [],
@@ -86,7 +85,6 @@ Return a JSON object with the following structure:
         
         return {
             "extracted_data": extracted_data,
-            "raw_text": raw_text,
             "confidence": 0.8,  # TODO: Implement confidence scoring
             "conclusions": [f"Extracted {sum(len(v) for v in extracted_data.values() if isinstance(v, list))} medical entities"]
         }
@@ -122,19 +120,18 @@ class MedicalContextAgent(BaseAgent):
     
     def reason(self, processed_input: Dict[str, Any]) -> Dict[str, Any]:
         """Retrieve relevant medical context"""
-        # Build query from extracted data or use direct query
+        # Build one query per category from extracted data or use direct query
         if processed_input["extracted_data"]:
-            query_parts = []
             extracted = processed_input["extracted_data"]
-            
-            for category in ["symptoms", "diagnoses", "treatments"]:
-                if category in extracted and extracted[category]:
-                    query_parts.extend(extracted[category])
-            
-            query = " ".join(query_parts)
+            queries = [
+                " ".join(extracted[category])
+                for category in ["symptoms", "diagnoses", "treatments"]
+                if category in extracted and extracted[category]
+            ]
         else:
-            query = processed_input["query"]
+            queries = [processed_input["query"]] if processed_input["query"] else []
         
+        query = " ".join(queries)
         if not query:
             return {
                 "context_documents": [],
@@ -142,14 +139,24 @@ class MedicalContextAgent(BaseAgent):
                 "conclusions": ["No query provided"]
             }
         
-        # Retrieve from vector store
+        # Retrieve from vector store (one batched search for all queries)
         self.logger.info(f"Retrieving context for: {query[:100]}...")
-        results = self.vector_store.retrieve(
-            query=query,
-            top_k=processed_input["top_k"],
+        top_k = processed_input["top_k"]
+        batch_results = self.vector_store.retrieve_batch(
+            queries=queries,
+            top_k=top_k,
             namespace="medical_knowledge"
         )
         
+        # Merge, keeping each document's best score, then take overall top-k
+        best: Dict[str, Dict[str, Any]] = {}
+        for query_results in batch_results:
+            for result in query_results:
+                current = best.get(result["id"])
+                if current is None or (result.get("score") or 0.0) > (current.get("score") or 0.0):
+                    best[result["id"]] = result
+        results = sorted(best.values(), key=lambda r: r.get("score") or 0.0, reverse=True)[:top_k]
+        
         return {
             "context_documents": results,
             "query": query,
@@ -168,12 +175,46 @@ class CausalInferenceAgent(BaseAgent):
     Maps: symptoms -> diagnosis -> treatment -> outcome chains.
     """
     
+    SYSTEM_MESSAGE = """You are a medical reasoning expert specializing in causal inference.
+Build cause-effect chains showing how symptoms lead to diagnoses, and how treatments affect outcomes.
+Provide confidence scores (0-1) for each causal link."""
+    
+    # Filled with str.format per case (literal JSON braces are doubled)
+    PROMPT_TEMPLATE = """Given this medical information:
+
+Symptoms: {symptoms}
+Diagnoses: {diagnoses}
+Treatments: {treatments}
+Outcomes: {outcomes}
+
+And this contextual medical knowledge:
+{context}
+
+Build causal chains showing relationships. Return JSON:
+{{
+    "causal_chains": [
+        {{
+            "from": "cause",
+            "to": "effect",
+            "relationship": "leads to|caused by|treated by",
+            "confidence": 0.0-1.0,
+            "evidence": "supporting evidence"
+        }}
+    ],
+    "overall_confidence": 0.0-1.0,
+    "uncertainties": ["list any uncertainties"]
+}}"""
+    
+    # Context documents included in the prompt
+    MAX_CONTEXT_DOCUMENTS = 3
+    
     def __init__(self):
         super().__init__(
             agent_id="causal_inference",
             description="Builds medical cause-effect relationships"
         )
         self.llm = get_llm_manager()
+        self.cache = LLMResponseCache(self.llm)
     
     def ingest(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate input contains medical data"""
@@ -188,53 +229,30 @@ class CausalInferenceAgent(BaseAgent):
     def reason(self, processed_input: Dict[str, Any]) -> Dict[str, Any]:
         """Build causal chains using LLM"""
         extracted = processed_input["extracted_data"]
-        context_docs = processed_input["context_documents"]
+        context_docs = processed_input["context_documents"][:self.MAX_CONTEXT_DOCUMENTS]
         
         # Format context
         context_text = "\n\n".join([
-            f"Document {i+1}: {doc.get('text', '')[:200]}..."
-            for i, doc in enumerate(context_docs[:3])
+            f"Document {i}: {doc.get('text', '')[:200]}..."
+            for i, doc in enumerate(context_docs, start=1)
         ])
         
-        system_message = """You are a medical reasoning expert specializing in causal inference.
-Build cause-effect chains showing how symptoms lead to diagnoses, and how treatments affect outcomes.
-Provide confidence scores (0-1) for each causal link."""
-        
-        prompt = f"""Given this medical information:
-
-Symptoms: {', '.join(extracted.get('symptoms', []))}
-Diagnoses: {', '.join(extracted.get('diagnoses', []))}
-Treatments: {', '.join(extracted.get('treatments', []))}
-Outcomes: {', '.join(extracted.get('outcomes', []))}
-
-And this contextual medical knowledge:
-{context_text if context_text else 'No additional context provided'}
-
-Build causal chains showing relationships. Return JSON:
-{{
-    "causal_chains": [
-        {{
-            "from": "cause",
-            "to": "effect",
-            "relationship": "leads to|caused by|treated by",
-            "confidence": 0.0-1.0,
-            "evidence": "supporting evidence"
-        }}
-    ],
-    "overall_confidence": 0.0-1.0,
-    "uncertainties": ["list any uncertainties"]
-}}"""
+        prompt = self.PROMPT_TEMPLATE.format(
+            symptoms=", ".join(extracted.get("symptoms", [])),
+            diagnoses=", ".join(extracted.get("diagnoses", [])),
+            treatments=", ".join(extracted.get("treatments", [])),
+            outcomes=", ".join(extracted.get("outcomes", [])),
+            context=context_text or "No additional context provided"
+        )
         
-        response = self.llm.generate(
+        causal_data = self.cache.generate_json(
             prompt=prompt,
-            system_message=system_message,
+            system_message=self.SYSTEM_MESSAGE,
             temperature=0.4,
             response_format={"type": "json_object"}
         )
         
-        try:
-            causal_data = json.loads(response["output"])
-        except json.JSONDecodeError:
+        if causal_data is None:
             causal_data = {
                 "causal_chains": [],
                 "overall_confidence": 0.5,
@@ -263,12 +281,17 @@ class ContradictionResolutionAgent(BaseAgent):
     Handles contradictions in diagnoses, treatments, or outcomes.
     """
     
+    SYSTEM_MESSAGE = """You are a medical expert specializing in evidence analysis.
+Identify contradictions or conflicts in medical reasoning.
+Resolve conflicts by weighing evidence quality and confidence scores."""
+    
     def __init__(self):
         super().__init__(
             agent_id="contradiction_resolution",
             description="Resolves conflicting medical evidence"
         )
         self.llm = get_llm_manager()
+        self.cache = LLMResponseCache(self.llm)
     
     def ingest(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate input contains causal chains or evidence"""
@@ -300,10 +323,6 @@ class ContradictionResolutionAgent(BaseAgent):
             for i, chain in enumerate(causal_chains)
         ])
         
-        system_message = """You are a medical expert specializing in evidence analysis.
-Identify contradictions or conflicts in medical reasoning.
-Resolve conflicts by weighing evidence quality and confidence scores."""
-        
         prompt = f"""Analyze these causal relationships for contradictions:
 
 {chains_text}
@@ -330,16 +349,14 @@ For each contradiction, propose a resolution. Return JSON:
     "overall_confidence": 0.0-1.0
 }}"""
         
-        response = self.llm.generate(
+        contradiction_data = self.cache.generate_json(
             prompt=prompt,
-            system_message=system_message,
+            system_message=self.SYSTEM_MESSAGE,
             temperature=0.3,
             response_format={"type": "json_object"}
         )
         
-        try:
-            contradiction_data = json.loads(response["output"])
-        except json.JSONDecodeError:
+        if contradiction_data is None:
             contradiction_data = {
                 "contradictions": [],
                 "resolutions": [],
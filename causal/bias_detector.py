@@ -3,8 +3,9 @@ Bias Detector - Fairness and Bias Detection in Medical Reasoning
 Detects potential demographic biases and generates counterfactuals
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, FrozenSet, List, Optional, Pattern, Tuple
 from dataclasses import dataclass
+import re
 from core.logging_config import get_logger
 from causal.graph import CausalGraph, NodeType
 
@@ -52,8 +53,15 @@ class BiasDetector:
         details = {}
         recommendations = []
         
-        # 1. Check for demographic usage in reasoning
-        demographic_usage = self._check_demographic_usage(graph, input_metadata)
+        # Normalize sensitive metadata values once for all checks below
+        attr_vals = self._sensitive_values(input_metadata)
+        
+        # 1. Check for demographic usage in reasoning (nothing to match
+        # without sensitive metadata values)
+        if attr_vals:
+            demographic_usage = self._check_demographic_usage(graph, input_metadata, attr_vals)
+        else:
+            demographic_usage = {"used_explicitly": False, "used_attributes": [], "impact_score": 0.0}
         if demographic_usage["used_explicitly"]:
             # It's not always bias to use demographics (e.g. breast cancer in women), 
             # but it should be flagged for review if high impact
@@ -70,7 +78,7 @@ class BiasDetector:
             recommendations.append("Consider alternative diagnoses (premature closure detected)")
         
         # 3. Generate counterfactual suggestions
-        counterfactuals = self._generate_counterfactual_suggestions(input_metadata)
+        counterfactuals = self._generate_counterfactual_suggestions(input_metadata, attr_vals)
         
         # Calculate overall score
         input_has_demographics = any(k in input_metadata for k in self.SENSITIVE_ATTRIBUTES)
@@ -89,69 +97,113 @@ class BiasDetector:
             recommendations=recommendations
         )
     
+    def _sensitive_values(self, metadata: Dict[str, Any]) -> Dict[str, str]:
+        """Lowercased string value of each sensitive attribute present in metadata"""
+        return {
+            attr: val
+            for attr in self.SENSITIVE_ATTRIBUTES
+            if (val := str(metadata.get(attr, "")).lower())
+        }
+    
     def _check_demographic_usage(
         self, 
         graph: CausalGraph, 
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        attr_vals: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """Check if/how demographics were used in the graph nodes/edges"""
-        used_explicitly = False
         impact_score = 0.0
-        used_attributes = []
+        impacts: Dict[str, float] = {}
         
-        # Scan nodes for sensitive keywords
-        for node_id, node_data in graph.graph.nodes(data=True):
-            content = node_data.get("content", "").lower()
-            
-            for attr in self.SENSITIVE_ATTRIBUTES:
-                # check if attribute value is in content
-                attr_val = str(metadata.get(attr, "")).lower()
-                if attr_val and attr_val in content:
-                    used_explicitly = True
-                    used_attributes.append(attr)
-                    # Higher confidence nodes using demographics = higher impact
-                    impact_score = max(impact_score, node_data.get("confidence", 0.0))
+        if attr_vals is None:
+            attr_vals = self._sensitive_values(metadata)
+        matcher = self._build_value_matcher(attr_vals)
+        
+        # Scan nodes for sensitive keywords, one pass over each content
+        if matcher is not None:
+            pattern, implied = matcher
+            for _, content, node_data in graph.iter_lowered_contents():
+                found = set()
+                for match in pattern.finditer(content):
+                    found.update(implied[match.group(1)])
+                if not found:
+                    continue
+                confidence = node_data.get("confidence", 0.0)
+                for attr_val in found:
+                    impacts[attr_val] = max(impacts.get(attr_val, 0.0), confidence)
+        
+        used_attributes = [attr for attr, attr_val in attr_vals.items() if attr_val in impacts]
+        if impacts:
+            # Higher confidence nodes using demographics = higher impact
+            impact_score = max(impacts.values())
+        
+        used_explicitly = bool(used_attributes)
         
         return {
             "used_explicitly": used_explicitly,
-            "used_attributes": list(set(used_attributes)),
+            "used_attributes": used_attributes,
             "impact_score": impact_score
         }
     
+    @staticmethod
+    def _build_value_matcher(
+        attr_vals: Dict[str, str]
+    ) -> Optional[Tuple[Pattern[str], Dict[str, FrozenSet[str]]]]:
+        """
+        Build a single-pass matcher for all non-empty attribute values.
+        
+        The pattern is a lookahead alternation, so it reports the longest
+        value starting at every position; values that are prefixes of that
+        value also occur there, which the implied map adds back. Together
+        they find exactly the values a separate ``in`` check would.
+        """
+        values = sorted(set(attr_vals.values()), key=len, reverse=True)
+        if not values:
+            return None
+        
+        pattern = re.compile("(?=(" + "|".join(map(re.escape, values)) + "))")
+        implied = {
+            val: frozenset(other for other in values if val.startswith(other))
+            for val in values
+        }
+        return pattern, implied
+    
     def _check_premature_closure(self, graph: CausalGraph) -> bool:
         """
         Check for premature closure (anchoring).
         Heuristic: High confidence diagnosis reached with very few evidence steps.
         """
-        # Count evidence nodes
-        evidence_nodes = graph.find_nodes_by_type(NodeType.EVIDENCE)
         diagnosis_nodes = graph.find_nodes_by_type(NodeType.DIAGNOSIS)
-        
         if not diagnosis_nodes:
             return False
-            
+        
+        # Heuristic only fires with fewer than 2 evidence nodes
+        if graph.count_nodes_by_type(NodeType.EVIDENCE) >= 2:
+            return False
+        
         # Get highest confidence diagnosis
-        max_diag_conf = 0.0
-        for nid in diagnosis_nodes:
-            node = graph.get_node(nid)
-            if node:
-                max_diag_conf = max(max_diag_conf, node.get("confidence", 0.0))
+        nodes = graph.graph.nodes
+        max_diag_conf = max(nodes[nid].get("confidence", 0.0) for nid in diagnosis_nodes)
         
         # Heuristic: High confidence (>0.8) but low evidence count (<2)
-        if max_diag_conf > 0.8 and len(evidence_nodes) < 2:
-            return True
-            
-        return False
+        return max_diag_conf > 0.8
     
-    def _generate_counterfactual_suggestions(self, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_counterfactual_suggestions(
+        self,
+        metadata: Dict[str, Any],
+        attr_vals: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Generate suggestions for counterfactual analysis.
         e.g. "Run check with gender=Female" if current is Male
         """
         suggestions = []
         
-        if "gender" in metadata:
-            curr = str(metadata["gender"]).lower()
+        if attr_vals is None:
+            attr_vals = self._sensitive_values(metadata)
+        
+        if "gender" in attr_vals:
+            curr = attr_vals["gender"]
             if curr in ["male", "m"]:
                 suggestions.append({"attribute": "gender", "original": curr, "counterfactual": "female"})
             elif curr in ["female", "f"]:
@@ -167,13 +219,11 @@ class BiasDetector:
         return suggestions
 
 
-# Singleton instance
-_detector_instance: Optional[BiasDetector] = None
+# Singleton instance (stateless and cheap to build, so created eagerly at
+# import; avoids a check-then-create race between threads)
+BIAS_DETECTOR = BiasDetector()
 
 
 def get_bias_detector() -> BiasDetector:
-    """Get or create singleton BiasDetector instance"""
-    global _detector_instance
-    if _detector_instance is None:
-        _detector_instance = BiasDetector()
-    return _detector_instance
+    """Get singleton BiasDetector instance"""
+    return BIAS_DETECTOR
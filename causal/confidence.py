@@ -5,6 +5,7 @@ Multi-factor confidence calculation for medical reasoning
 
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
+import logging
 import math
 from core.logging_config import get_logger
 
@@ -42,6 +43,14 @@ class ConfidenceScorer:
         "context_match": 0.10
     }
     
+    # Weights in factor order, resolved once instead of per-call dict lookups
+    _WEIGHT_VECTOR = (
+        WEIGHTS["evidence_quality"],
+        WEIGHTS["reasoning_coherence"],
+        WEIGHTS["llm_confidence"],
+        WEIGHTS["context_match"]
+    )
+    
     # Thresholds
     THRESHOLD_HIGH = 0.80
     THRESHOLD_MEDIUM = 0.60
@@ -50,6 +59,9 @@ class ConfidenceScorer:
     # Decay factor for chain confidence
     DECAY_FACTOR = 0.95
     
+    # DECAY_FACTOR ** n for common chain lengths
+    _DECAY_LUT = tuple(map(DECAY_FACTOR.__pow__, range(257)))
+    
     def __init__(self):
         """Initialize confidence scorer"""
         logger.info("Confidence scorer initialized")
@@ -74,23 +86,25 @@ class ConfidenceScorer:
             Weighted confidence score (0-1)
         """
         # Validate inputs
-        for value in [evidence_quality, reasoning_coherence, llm_confidence, context_match]:
+        for value in (evidence_quality, reasoning_coherence, llm_confidence, context_match):
             if not 0.0 <= value <= 1.0:
                 raise ValueError(f"Confidence factor must be between 0 and 1, got {value}")
         
         # Weighted sum
+        w_evidence, w_coherence, w_llm, w_context = self._WEIGHT_VECTOR
         confidence = (
-            evidence_quality * self.WEIGHTS["evidence_quality"] +
-            reasoning_coherence * self.WEIGHTS["reasoning_coherence"] +
-            llm_confidence * self.WEIGHTS["llm_confidence"] +
-            context_match * self.WEIGHTS["context_match"]
+            evidence_quality * w_evidence +
+            reasoning_coherence * w_coherence +
+            llm_confidence * w_llm +
+            context_match * w_context
         )
         
-        logger.debug(
-            f"Calculated confidence: {confidence:.3f} "
-            f"(evidence: {evidence_quality:.2f}, coherence: {reasoning_coherence:.2f}, "
-            f"llm: {llm_confidence:.2f}, context: {context_match:.2f})"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Calculated confidence: {confidence:.3f} "
+                f"(evidence: {evidence_quality:.2f}, coherence: {reasoning_coherence:.2f}, "
+                f"llm: {llm_confidence:.2f}, context: {context_match:.2f})"
+            )
         
         return confidence
     
@@ -124,15 +138,17 @@ class ConfidenceScorer:
         if use_decay:
             # Apply decay factor based on chain length
             # Longer chains have more uncertainty
-            decay = self.DECAY_FACTOR ** len(confidences)
+            n = len(confidences)
+            decay = self._DECAY_LUT[n] if n < len(self._DECAY_LUT) else self.DECAY_FACTOR ** n
             aggregated = min_confidence * decay
         else:
             aggregated = min_confidence
         
-        logger.debug(
-            f"Chain aggregation: {aggregated:.3f} "
-            f"(min: {min_confidence:.3f}, steps: {len(confidences)}, decay: {use_decay})"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Chain aggregation: {aggregated:.3f} "
+                f"(min: {min_confidence:.3f}, steps: {len(confidences)}, decay: {use_decay})"
+            )
         
         return aggregated
     
@@ -152,10 +168,11 @@ class ConfidenceScorer:
         
         avg_confidence = sum(confidences) / len(confidences)
         
-        logger.debug(
-            f"Parallel aggregation: {avg_confidence:.3f} "
-            f"(paths: {len(confidences)})"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Parallel aggregation: {avg_confidence:.3f} "
+                f"(paths: {len(confidences)})"
+            )
         
         return avg_confidence
     
@@ -290,13 +307,10 @@ class ConfidenceScorer:
         return explanation
 
 
-# Singleton instance
-_scorer_instance: Optional[ConfidenceScorer] = None
+# Singleton instance, created at import since the scorer holds no state
+CONFIDENCE_SCORER = ConfidenceScorer()
 
 
 def get_confidence_scorer() -> ConfidenceScorer:
-    """Get or create singleton ConfidenceScorer instance"""
-    global _scorer_instance
-    if _scorer_instance is None:
-        _scorer_instance = ConfidenceScorer()
-    return _scorer_instance
+    """Get singleton ConfidenceScorer instance"""
+    return CONFIDENCE_SCORER
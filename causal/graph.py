@@ -3,13 +3,17 @@ Causal Graph - Medical Domain Reasoning Graph Structure
 NetworkX-based graph for representing causal relationships in medical reasoning
 """
 
-from typing import Dict, Any, List, Optional, Tuple, Set
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Set
 import networkx as nx
+import numpy as np
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from functools import lru_cache
 import json
 import hashlib
+import threading
+import uuid
 from core.logging_config import get_logger
 
 logger = get_logger("causal_graph")
@@ -87,6 +91,32 @@ class CausalEdge:
         }
 
 
+@dataclass
+class GraphArrays:
+    """
+    Array (CSR) snapshot of a causal graph for traversal-heavy code.
+    Node i is node_ids[i]; its successors are
+    indices[indptr[i]:indptr[i + 1]], with matching edge_confidence entries.
+    """
+    node_ids: List[str]
+    index: Dict[str, int]
+    node_confidence: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    edge_confidence: np.ndarray
+    
+    def edge_sources(self) -> np.ndarray:
+        """Source node index of every edge (aligned with indices)"""
+        return np.repeat(np.arange(len(self.node_ids)), np.diff(self.indptr))
+
+
+@lru_cache(maxsize=4096)
+def _node_id(node_type: str, content: str) -> str:
+    """Content-derived node ID (memoized: builders re-add the same entities)"""
+    content_hash = hashlib.blake2b(f"{node_type}:{content}".encode(), digest_size=4).hexdigest()
+    return f"{node_type}_{content_hash}"
+
+
 class CausalGraph:
     """
     Medical domain causal graph using NetworkX.
@@ -105,17 +135,36 @@ class CausalGraph:
         self.created_at = datetime.now(timezone.utc)
         self.metadata = {}
         
+        # node_id -> (content, content.lower()) memo for text scans
+        self._lowered_contents: Dict[str, Tuple[str, str]] = {}
+        
+        # node_type value -> node IDs (dict as insertion-ordered set), kept
+        # current by add_node; rebuilt if graph.graph is modified directly
+        self._nodes_by_type: Dict[str, Dict[str, None]] = {}
+        self._indexed_nodes = 0
+        
+        # Bumped by every mutating method; keys the cached array snapshot
+        self._version = 0
+        self._arrays_key: Optional[Tuple[int, int, int]] = None
+        self._arrays_cache: Optional[GraphArrays] = None
+        # (snapshot, reach bitsets) swapped as one object, so a concurrent
+        # reader never pairs a new snapshot with the previous bitsets
+        self._reach_cache: Optional[Tuple[GraphArrays, List[int]]] = None
+        
+        # Derived structural results (stats, cycle/connectivity checks) as
+        # one (state key, results) pair, replaced under the lock on change
+        self._derived_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any]]] = None
+        self._derived_lock = threading.Lock()
+        
         logger.info(f"Causal graph initialized: {self.graph_id}")
     
     def _generate_id(self) -> str:
         """Generate unique graph ID"""
-        timestamp = datetime.now(timezone.utc).isoformat()
-        return hashlib.md5(timestamp.encode()).hexdigest()[:12]
+        return uuid.uuid4().hex[:12]
     
     def _generate_node_id(self, content: str, node_type: NodeType) -> str:
         """Generate unique node ID"""
-        content_hash = hashlib.md5(f"{node_type.value}:{content}".encode()).hexdigest()[:8]
-        return f"{node_type.value}_{content_hash}"
+        return _node_id(node_type.value, content)
     
     def add_node(
         self,
@@ -149,11 +198,69 @@ class CausalGraph:
             metadata=metadata or {}
         )
         
+        previous = self.graph.nodes[node_id].get("node_type") if node_id in self.graph else None
         self.graph.add_node(node_id, **node.to_dict())
+        
+        # Keep type index current
+        if previous is None:
+            self._indexed_nodes += 1
+        else:
+            self._nodes_by_type.get(previous, {}).pop(node_id, None)
+        self._nodes_by_type.setdefault(node_type.value, {})[node_id] = None
+        self._version += 1
+        
         logger.debug(f"Added node: {node_id} ({node_type.value})")
         
         return node_id
     
+    def add_nodes_bulk(
+        self,
+        rows: Iterable[Tuple[str, NodeType, float]],
+        timestamp: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Add many nodes at once
+        
+        Writes node attributes directly (no CausalNode per row) and stamps
+        every node with one shared timestamp.
+        
+        Args:
+            rows: (content, node_type, confidence) per node
+            timestamp: Creation time for all nodes (default: now)
+            
+        Returns:
+            Node IDs in row order
+        """
+        ts = (timestamp or datetime.now(timezone.utc)).isoformat()
+        nodes = self.graph.nodes
+        index = self._nodes_by_type
+        node_ids = []
+        
+        for content, node_type, confidence in rows:
+            type_value = node_type.value
+            node_id = _node_id(type_value, content)
+            if node_id in nodes:
+                index.get(nodes[node_id].get("node_type"), {}).pop(node_id, None)
+            else:
+                self._indexed_nodes += 1
+            
+            self.graph.add_node(
+                node_id,
+                node_id=node_id,
+                node_type=type_value,
+                content=content,
+                confidence=confidence,
+                metadata={},
+                timestamp=ts
+            )
+            index.setdefault(type_value, {})[node_id] = None
+            node_ids.append(node_id)
+        
+        self._version += 1
+        logger.debug(f"Added {len(node_ids)} nodes")
+        
+        return node_ids
+    
     def add_symptom(self, content: str, confidence: float, **kwargs) -> str:
         """Add a symptom node"""
         return self.add_node(content, NodeType.SYMPTOM, confidence, **kwargs)
@@ -218,37 +325,314 @@ class CausalGraph:
         )
         
         self.graph.add_edge(source, target, **edge.to_dict())
+        self._version += 1
         logger.debug(f"Added edge: {source} → {target} ({edge_type.value})")
         
         return (source, target)
     
+    def add_edges_bulk(
+        self,
+        rows: Iterable[Tuple[str, str, EdgeType, float, CausalStrength]],
+        reasoning_type: str = "symbolic"
+    ) -> List[Tuple[str, str]]:
+        """
+        Add many edges at once
+        
+        Writes edge attributes directly (no CausalEdge per row). Every
+        endpoint is checked before any edge is added.
+        
+        Args:
+            rows: (source, target, edge_type, confidence, causal_strength) per edge
+            reasoning_type: Type of reasoning used for all edges
+            
+        Returns:
+            List of (source, target) in row order
+        """
+        rows = list(rows)
+        nodes = self.graph.nodes
+        for source, target, *_ in rows:
+            if source not in nodes:
+                raise ValueError(f"Source node {source} not in graph")
+            if target not in nodes:
+                raise ValueError(f"Target node {target} not in graph")
+        
+        for source, target, edge_type, confidence, causal_strength in rows:
+            self.graph.add_edge(
+                source,
+                target,
+                source=source,
+                target=target,
+                edge_type=edge_type.value,
+                confidence=confidence,
+                causal_strength=causal_strength.value,
+                evidence_refs=[],
+                reasoning_type=reasoning_type,
+                metadata={}
+            )
+        
+        self._version += 1
+        logger.debug(f"Added {len(rows)} edges")
+        
+        return [(source, target) for source, target, *_ in rows]
+    
     def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Get node data"""
         if node_id not in self.graph.nodes:
             return None
         return dict(self.graph.nodes[node_id])
     
+    def iter_lowered_contents(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Iterate nodes with their lowercased content
+        
+        Lowercased content is memoized per node and revalidated against the
+        current content, so repeated text scans (e.g. bias checks with
+        different metadata) do not re-lowercase unchanged nodes.
+        
+        Yields:
+            (node_id, lowercased content, node data) tuples
+        """
+        memo = self._lowered_contents
+        for node_id, node_data in self.graph.nodes(data=True):
+            content = node_data.get("content", "")
+            cached = memo.get(node_id)
+            if cached is None or cached[0] is not content:
+                cached = (content, content.lower())
+                memo[node_id] = cached
+            yield node_id, cached[1], node_data
+    
     def get_edge(self, source: str, target: str) -> Optional[Dict[str, Any]]:
         """Get edge data"""
         if not self.graph.has_edge(source, target):
             return None
         return dict(self.graph.edges[source, target])
     
-    def get_all_paths(self, source: str, target: str) -> List[List[str]]:
+    def _successor_lists(self) -> List[List[int]]:
+        """Successor index lists per node for the current snapshot"""
+        def compute() -> List[List[int]]:
+            arrays = self.arrays()
+            indptr = arrays.indptr.tolist()
+            indices = arrays.indices.tolist()
+            return [indices[indptr[i]:indptr[i + 1]] for i in range(len(arrays.node_ids))]
+        return self._memoized("successors", compute)
+    
+    def _topological_order(self) -> List[int]:
+        """
+        Node indices in topological order (Kahn's algorithm)
+        
+        Nodes on or downstream of a cycle never reach indegree zero, so the
+        order is shorter than the node count exactly when the graph is cyclic.
+        """
+        def compute() -> List[int]:
+            arrays = self.arrays()
+            n = len(arrays.node_ids)
+            successors = self._successor_lists()
+            indegree = np.bincount(arrays.indices, minlength=n).tolist()
+            order = [i for i in range(n) if indegree[i] == 0]
+            for u in order:
+                for v in successors[u]:
+                    indegree[v] -= 1
+                    if indegree[v] == 0:
+                        order.append(v)
+            return order
+        return self._memoized("topological_order", compute)
+    
+    def _reachability(self) -> Tuple[GraphArrays, List[int]]:
+        """
+        Per-node descendant bitsets for the current array snapshot
+        
+        Bit j of reach[i] is set when node j is reachable from node i by a
+        path of at least one edge. Computed in reverse topological order
+        (Kahn's algorithm); cyclic graphs fall back to a fixpoint iteration.
+        """
+        arrays = self.arrays()
+        cached = self._reach_cache
+        if cached is not None and cached[0] is arrays:
+            return cached
+        
+        n = len(arrays.node_ids)
+        successors = self._successor_lists()
+        order = self._topological_order()
+        
+        reach = [0] * n
+        if len(order) == n:
+            for u in reversed(order):
+                bits = 0
+                for v in successors[u]:
+                    bits |= reach[v] | (1 << v)
+                reach[u] = bits
+        else:
+            changed = True
+            while changed:
+                changed = False
+                for u in range(n):
+                    bits = reach[u]
+                    for v in successors[u]:
+                        bits |= reach[v] | (1 << v)
+                    if bits != reach[u]:
+                        reach[u] = bits
+                        changed = True
+        
+        self._reach_cache = (arrays, reach)
+        return arrays, reach
+    
+    def reaches(self, source: str, target: str) -> bool:
+        """Check whether target is reachable from source (path of >= 1 edge)"""
+        arrays, reach = self._reachability()
+        source_idx = arrays.index.get(source)
+        target_idx = arrays.index.get(target)
+        if source_idx is None or target_idx is None:
+            return False
+        return bool((reach[source_idx] >> target_idx) & 1)
+    
+    def iter_simple_paths(
+        self,
+        source: str,
+        target: str,
+        cutoff: Optional[int] = None
+    ) -> Iterator[List[str]]:
+        """
+        Lazily yield simple paths from source to target
+        
+        Iterative DFS over the CSR snapshot; only descends into nodes that
+        can still reach the target, so dead-end branches are never walked.
+        Paths come out in the same order as nx.all_simple_paths.
+        
+        Args:
+            source: Source node ID
+            target: Target node ID
+            cutoff: Maximum path length in edges (None for unlimited)
+            
+        Yields:
+            Paths as lists of node IDs
+        """
+        arrays, reach = self._reachability()
+        source_idx = arrays.index.get(source)
+        target_idx = arrays.index.get(target)
+        if source_idx is None or target_idx is None:
+            return
+        if source_idx == target_idx:
+            yield [source]
+            return
+        
+        node_ids = arrays.node_ids
+        indptr = arrays.indptr.tolist()
+        indices = arrays.indices.tolist()
+        target_bit = 1 << target_idx
+        max_depth = len(node_ids) if cutoff is None else cutoff
+        
+        def children(u: int) -> Iterator[int]:
+            return (
+                v for v in indices[indptr[u]:indptr[u + 1]]
+                if v == target_idx or reach[v] & target_bit
+            )
+        
+        visited = dict.fromkeys([source_idx])
+        stack = [children(source_idx)]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                visited.popitem()
+            elif child in visited:
+                continue
+            elif child == target_idx:
+                if len(visited) <= max_depth:
+                    yield [node_ids[i] for i in visited] + [target]
+            elif len(visited) < max_depth:
+                visited[child] = None
+                stack.append(children(child))
+    
+    def get_all_paths(
+        self,
+        source: str,
+        target: str,
+        cutoff: Optional[int] = None
+    ) -> List[List[str]]:
         """
         Find all paths from source to target
         
         Args:
             source: Source node ID
             target: Target node ID
+            cutoff: Maximum path length in edges (None for unlimited)
             
         Returns:
             List of paths (each path is a list of node IDs)
         """
-        try:
-            return list(nx.all_simple_paths(self.graph, source, target))
-        except (nx.NodeNotFound, nx.NetworkXNoPath):
-            return []
+        return list(self.iter_simple_paths(source, target, cutoff))
+    
+    def count_paths(
+        self,
+        sources: Iterable[str],
+        targets: Iterable[str],
+        cutoff: Optional[int] = None
+    ) -> Optional[Tuple[int, Dict[str, int]]]:
+        """
+        Count source-to-target paths without enumerating them
+        
+        Equivalent to enumerating get_all_paths for every (source, target)
+        pair, but computed by dynamic programming over the topological order:
+        forward[v][i] counts i-edge paths from any source to v, backward[v][j]
+        counts j-edge paths from v to any target, and every path through v
+        pairs one of each with i + j <= cutoff. Only valid on acyclic graphs,
+        where every path is simple.
+        
+        Args:
+            sources: Path start node IDs
+            targets: Path end node IDs
+            cutoff: Maximum path length in edges (None for unlimited)
+            
+        Returns:
+            (number of paths, {node_id: number of paths through it}) with
+            nodes in topological order, or None if the graph has cycles
+        """
+        order = self._topological_order()
+        arrays = self.arrays()
+        node_ids = arrays.node_ids
+        n = len(node_ids)
+        if len(order) != n:
+            return None
+        
+        max_len = n - 1 if cutoff is None else min(cutoff, n - 1)
+        if max_len < 0:
+            return 0, {}
+        successors = self._successor_lists()
+        index = arrays.index
+        forward = [[0] * (max_len + 1) for _ in range(n)]
+        backward = [[0] * (max_len + 1) for _ in range(n)]
+        for node_id in set(sources):
+            if node_id in index:
+                forward[index[node_id]][0] = 1
+        ends = {index[node_id] for node_id in targets if node_id in index}
+        for t in ends:
+            backward[t][0] = 1
+        
+        for u in order:
+            counts = forward[u]
+            for v in successors[u]:
+                ahead = forward[v]
+                for i in range(max_len):
+                    ahead[i + 1] += counts[i]
+        for u in reversed(order):
+            counts = backward[u]
+            for v in successors[u]:
+                behind = backward[v]
+                for j in range(max_len):
+                    counts[j + 1] += behind[j]
+        
+        total = sum(sum(forward[t]) for t in ends)
+        through = {}
+        for u in order:
+            counts, behind = forward[u], backward[u]
+            paths = sum(
+                counts[i] * behind[j]
+                for i in range(max_len + 1) if counts[i]
+                for j in range(max_len + 1 - i)
+            )
+            if paths:
+                through[node_ids[u]] = paths
+        return total, through
     
     def get_shortest_path(self, source: str, target: str) -> Optional[List[str]]:
         """Get shortest path from source to target"""
@@ -257,24 +641,91 @@ class CausalGraph:
         except (nx.NodeNotFound, nx.NetworkXNoPath):
             return None
     
+    def _state_key(self) -> Tuple[int, int, int]:
+        """Token that changes whenever the graph structure changes"""
+        return (self._version, self.graph.number_of_nodes(), self.graph.number_of_edges())
+    
+    def _memoized(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return compute() cached until the graph next changes"""
+        key = self._state_key()
+        with self._derived_lock:
+            cache = self._derived_cache
+            if cache is None or cache[0] != key:
+                cache = self._derived_cache = (key, {})
+            derived = cache[1]
+            if name in derived:
+                return derived[name]
+        
+        # Computed outside the lock: compute() may memoize other results
+        value = compute()
+        with self._derived_lock:
+            derived[name] = value
+        return value
+    
+    def arrays(self) -> GraphArrays:
+        """
+        CSR snapshot of the graph, rebuilt only after the graph changes
+        
+        Changes through CausalGraph methods are always picked up; direct
+        edits to self.graph are detected when they change node/edge counts.
+        
+        Returns:
+            GraphArrays snapshot (treat as read-only)
+        """
+        key = self._state_key()
+        if self._arrays_key != key:
+            node_ids = list(self.graph.nodes)
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+            indices = []
+            edge_confidence = []
+            for i, node_id in enumerate(node_ids):
+                successors = self.graph.succ[node_id]
+                for target, data in successors.items():
+                    indices.append(index[target])
+                    edge_confidence.append(data.get("confidence", 1.0))
+                indptr[i + 1] = len(indices)
+            
+            self._arrays_cache = GraphArrays(
+                node_ids=node_ids,
+                index=index,
+                node_confidence=np.fromiter(
+                    (data.get("confidence", 0.0) for _, data in self.graph.nodes(data=True)),
+                    dtype=np.float64,
+                    count=len(node_ids)
+                ),
+                indptr=indptr,
+                indices=np.asarray(indices, dtype=np.int64),
+                edge_confidence=np.asarray(edge_confidence, dtype=np.float64)
+            )
+            self._arrays_key = key
+        return self._arrays_cache
+    
+    def _type_index(self) -> Dict[str, Dict[str, None]]:
+        """Node IDs grouped by node type, rebuilt if nodes changed outside add_node"""
+        if self._indexed_nodes != self.graph.number_of_nodes():
+            index: Dict[str, Dict[str, None]] = {}
+            for node_id, data in self.graph.nodes(data=True):
+                index.setdefault(data.get("node_type"), {})[node_id] = None
+            self._nodes_by_type = index
+            self._indexed_nodes = self.graph.number_of_nodes()
+        return self._nodes_by_type
+    
     def find_nodes_by_type(self, node_type: NodeType) -> List[str]:
         """Find all nodes of a specific type"""
-        return [
-            node_id for node_id, data in self.graph.nodes(data=True)
-            if data.get("node_type") == node_type.value
-        ]
+        return list(self._type_index().get(node_type.value, ()))
+    
+    def count_nodes_by_type(self, node_type: NodeType) -> int:
+        """Count nodes of a specific type"""
+        return len(self._type_index().get(node_type.value, ()))
     
     def has_cycles(self) -> bool:
         """Check if graph has cycles (should not in valid causal graph)"""
-        try:
-            nx.find_cycle(self.graph)
-            return True
-        except nx.NetworkXNoCycle:
-            return False
+        return len(self._topological_order()) != self.graph.number_of_nodes()
     
     def is_connected(self) -> bool:
         """Check if graph is weakly connected"""
-        return nx.is_weakly_connected(self.graph)
+        return self._memoized("is_connected", lambda: nx.is_weakly_connected(self.graph))
     
     def prune_low_confidence(self, threshold: float = 0.3) -> int:
         """
@@ -286,12 +737,17 @@ class CausalGraph:
         Returns:
             Number of edges removed
         """
+        arrays = self.arrays()
+        low = np.flatnonzero(arrays.edge_confidence < threshold)
+        node_ids = arrays.node_ids
         edges_to_remove = [
-            (u, v) for u, v, data in self.graph.edges(data=True)
-            if data.get("confidence", 1.0) < threshold
+            (node_ids[u], node_ids[v])
+            for u, v in zip(arrays.edge_sources()[low].tolist(), arrays.indices[low].tolist())
         ]
         
-        self.graph.remove_edges_from(edges_to_remove)
+        if edges_to_remove:
+            self.graph.remove_edges_from(edges_to_remove)
+            self._version += 1
         logger.info(f"Pruned {len(edges_to_remove)} low-confidence edges")
         
         return len(edges_to_remove)
@@ -312,8 +768,16 @@ class CausalGraph:
             ]
         }
     
-    def to_json(self, indent: int = 2) -> str:
-        """Export graph to JSON string"""
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """
+        Export graph to JSON string
+        
+        Args:
+            indent: Pretty-print indentation; None emits compact JSON, which
+                skips the encoder's pretty-printing path (for machine consumers)
+        """
+        if indent is None:
+            return json.dumps(self.to_dict(), separators=(",", ":"))
         return json.dumps(self.to_dict(), indent=indent)
     
     def to_graphml(self, filepath: str):
@@ -348,18 +812,26 @@ class CausalGraph:
         return cls.from_dict(data)
     
     def get_stats(self) -> Dict[str, Any]:
-        """Get graph statistics"""
+        """Get graph statistics (cached until the graph changes)"""
+        stats = self._memoized("stats", self._compute_stats)
+        return {**stats, "nodes_by_type": dict(stats["nodes_by_type"])}
+    
+    def _compute_stats(self) -> Dict[str, Any]:
+        """Uncached graph statistics"""
+        num_nodes = self.graph.number_of_nodes()
+        num_edges = self.graph.number_of_edges()
         return {
             "graph_id": self.graph_id,
-            "num_nodes": self.graph.number_of_nodes(),
-            "num_edges": self.graph.number_of_edges(),
+            "num_nodes": num_nodes,
+            "num_edges": num_edges,
             "nodes_by_type": {
-                nt.value: len(self.find_nodes_by_type(nt))
+                nt.value: self.count_nodes_by_type(nt)
                 for nt in NodeType
             },
             "has_cycles": self.has_cycles(),
             "is_connected": self.is_connected(),
-            "density": nx.density(self.graph)
+            # nx.density for a directed graph, without re-counting
+            "density": num_edges / (num_nodes * (num_nodes - 1)) if num_nodes > 1 else 0.0
         }
     
     def __repr__(self) -> str:
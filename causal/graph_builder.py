@@ -3,13 +3,27 @@ Graph Builder - Automatic Causal Graph Construction
 Builds causal graphs from agent reasoning outputs
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from itertools import islice
+import re
 from causal.graph import CausalGraph, NodeType, EdgeType, CausalStrength
 from causal.confidence import get_confidence_scorer
 from core.logging_config import get_logger
 
 logger = get_logger("graph_builder")
 
+# Relationship keywords by edge type, in priority order. Each alternative
+# is anchored at the start with a lookahead, so the first group whose
+# keywords appear anywhere wins (not the earliest keyword in the text).
+_RELATIONSHIP_RE = re.compile(
+    r"^(?=.*?(cause|leads to))|^(?=.*?(treat))|^(?=.*?(result|outcome))",
+    re.DOTALL
+)
+_RELATIONSHIP_EDGE_TYPES = (None, EdgeType.CAUSES, EdgeType.TREATED_BY, EdgeType.LEADS_TO)
+
+# Causal strength indexed by how many thresholds (0.6, 0.8) are met
+_STRENGTH_LADDER = (CausalStrength.WEAK, CausalStrength.MODERATE, CausalStrength.STRONG)
+
 
 class GraphBuilder:
     """
@@ -45,33 +59,25 @@ class GraphBuilder:
         
         graph = CausalGraph()
         
-        # Step 1: Add symptom nodes from evidence
+        # Steps 1-4: Add symptom, diagnosis, treatment and outcome nodes
+        # from evidence in one bulk insert
         symptoms = evidence_output.get("symptoms", [])
-        symptom_nodes = {}
-        for symptom in symptoms:
-            node_id = graph.add_symptom(symptom, confidence=0.85)
-            symptom_nodes[symptom] = node_id
-        
-        # Step 2: Add diagnosis nodes from evidence
         diagnoses = evidence_output.get("diagnoses", [])
-        diagnosis_nodes = {}
-        for diagnosis in diagnoses:
-            node_id = graph.add_diagnosis(diagnosis, confidence=0.80)
-            diagnosis_nodes[diagnosis] = node_id
-        
-        # Step 3: Add treatment nodes from evidence
         treatments = evidence_output.get("treatments", [])
-        treatment_nodes = {}
-        for treatment in treatments:
-            node_id = graph.add_treatment(treatment, confidence=0.75)
-            treatment_nodes[treatment] = node_id
-        
-        # Step 4: Add outcome nodes from evidence
         outcomes = evidence_output.get("outcomes", [])
-        outcome_nodes = {}
-        for outcome in outcomes:
-            node_id = graph.add_outcome(outcome, confidence=0.70)
-            outcome_nodes[outcome] = node_id
+        
+        node_ids = graph.add_nodes_bulk(
+            [(symptom, NodeType.SYMPTOM, 0.85) for symptom in symptoms] +
+            [(diagnosis, NodeType.DIAGNOSIS, 0.80) for diagnosis in diagnoses] +
+            [(treatment, NodeType.TREATMENT, 0.75) for treatment in treatments] +
+            [(outcome, NodeType.OUTCOME, 0.70) for outcome in outcomes]
+        )
+        
+        ids = iter(node_ids)
+        symptom_nodes = dict(zip(symptoms, ids))
+        diagnosis_nodes = dict(zip(diagnoses, ids))
+        treatment_nodes = dict(zip(treatments, ids))
+        outcome_nodes = dict(zip(outcomes, ids))
         
         # Step 5: Add evidence nodes from context
         evidence_nodes = {}
@@ -85,16 +91,18 @@ class GraphBuilder:
             evidence_nodes[i] = node_id
         
         # Step 6: Add causal edges from causal inference output
+        node_index = self._build_node_index(symptom_nodes, diagnosis_nodes, treatment_nodes, outcome_nodes)
         causal_chains = causal_output.get("causal_chains", [])
         for chain in causal_chains:
             from_entity = chain.get("from", "")
             to_entity = chain.get("to", "")
             relationship = chain.get("relationship", "")
             confidence = chain.get("confidence", 0.5)
+            evidence = chain.get("evidence")
             
             # Find source and target nodes
-            source_id = self._find_node_id(from_entity, symptom_nodes, diagnosis_nodes, treatment_nodes, outcome_nodes)
-            target_id = self._find_node_id(to_entity, symptom_nodes, diagnosis_nodes, treatment_nodes, outcome_nodes)
+            source_id = self._find_node_id(from_entity, node_index)
+            target_id = self._find_node_id(to_entity, node_index)
             
             if source_id and target_id:
                 # Determine edge type based on relationship
@@ -110,24 +118,20 @@ class GraphBuilder:
                         edge_type=edge_type,
                         confidence=confidence,
                         causal_strength=causal_strength,
-                        evidence_refs=[chain.get("evidence", "")],
+                        evidence_refs=[evidence] if evidence else None,
                         reasoning_type="llm_based"
                     )
                 except ValueError as e:
                     logger.warning(f"Failed to add edge: {e}")
         
         # Step 7: Connect evidence to diagnoses/treatments
-        for i, evidence_id in evidence_nodes.items():
-            # Connect to first diagnosis (simplified)
-            if diagnosis_nodes:
-                first_diagnosis = list(diagnosis_nodes.values())[0]
-                graph.add_edge(
-                    source=evidence_id,
-                    target=first_diagnosis,
-                    edge_type=EdgeType.SUPPORTS,
-                    confidence=0.7,
-                    causal_strength=CausalStrength.MODERATE
-                )
+        # Connect to first diagnosis (simplified)
+        first_diagnosis = next(iter(diagnosis_nodes.values()), None)
+        if first_diagnosis:
+            graph.add_edges_bulk(
+                (evidence_id, first_diagnosis, EdgeType.SUPPORTS, 0.7, CausalStrength.MODERATE)
+                for evidence_id in evidence_nodes.values()
+            )
         
         # Step 8: Validate and prune graph
         graph.prune_low_confidence(threshold=0.3)
@@ -145,42 +149,54 @@ class GraphBuilder:
         
         return graph
     
+    def _build_node_index(
+        self,
+        *node_dicts: Dict[str, str]
+    ) -> Tuple[List[Tuple[str, str]], Dict[str, int]]:
+        """
+        Lowercase entity index for _find_node_id, built once per graph
+        
+        Returns:
+            ((lowercased entity, node ID) entries in dictionary order,
+             lowercased entity -> position of its first entry)
+        """
+        entries = [
+            (key.lower(), node_id)
+            for node_dict in node_dicts
+            for key, node_id in node_dict.items()
+        ]
+        first_position: Dict[str, int] = {}
+        for position, (key_lower, _) in enumerate(entries):
+            first_position.setdefault(key_lower, position)
+        return entries, first_position
+    
     def _find_node_id(
         self,
         entity: str,
-        *node_dicts: Dict[str, str]
+        node_index: Tuple[List[Tuple[str, str]], Dict[str, int]]
     ) -> Optional[str]:
-        """Find node ID for entity across multiple node dictionaries"""
+        """Find node ID of the first indexed entity containing entity (case-insensitive)"""
+        entries, first_position = node_index
         entity_lower = entity.lower()
         
-        for node_dict in node_dicts:
-            for key, node_id in node_dict.items():
-                if key.lower() == entity_lower or entity_lower in key.lower():
-                    return node_id
+        # An exact match bounds the scan: only earlier entries can win
+        exact = first_position.get(entity_lower)
+        for key_lower, node_id in islice(entries, exact):
+            if entity_lower in key_lower:
+                return node_id
         
-        return None
+        return entries[exact][1] if exact is not None else None
     
     def _determine_edge_type(self, relationship: str) -> EdgeType:
         """Determine edge type from relationship string"""
-        relationship_lower = relationship.lower()
-        
-        if "cause" in relationship_lower or "leads to" in relationship_lower:
-            return EdgeType.CAUSES
-        elif "treat" in relationship_lower:
-            return EdgeType.TREATED_BY
-        elif "result" in relationship_lower or "outcome" in relationship_lower:
-            return EdgeType.LEADS_TO
-        else:
+        match = _RELATIONSHIP_RE.match(relationship.lower())
+        if match is None:
             return EdgeType.SUPPORTS
+        return _RELATIONSHIP_EDGE_TYPES[match.lastindex]
     
     def _determine_causal_strength(self, confidence: float) -> CausalStrength:
         """Determine causal strength from confidence score"""
-        if confidence >= 0.8:
-            return CausalStrength.STRONG
-        elif confidence >= 0.6:
-            return CausalStrength.MODERATE
-        else:
-            return CausalStrength.WEAK
+        return _STRENGTH_LADDER[(confidence >= 0.6) + (confidence >= 0.8)]
 
 
 # Singleton instance
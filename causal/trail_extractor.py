@@ -4,12 +4,23 @@ Extract reasoning paths and generate explanations
 """
 
 from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from itertools import islice
 from causal.graph import CausalGraph, NodeType
 from causal.confidence import get_confidence_scorer
 from core.logging_config import get_logger
 
 logger = get_logger("trail_extractor")
 
+# Narrative line per node type
+_NARRATIVE_TEMPLATES = {
+    NodeType.SYMPTOM.value: "Patient presented with {content} (confidence: {confidence:.0%})",
+    NodeType.DIAGNOSIS.value: "Diagnosed with {content} (confidence: {confidence:.0%})",
+    NodeType.TREATMENT.value: "Treatment: {content} (confidence: {confidence:.0%})",
+    NodeType.OUTCOME.value: "Expected outcome: {content} (confidence: {confidence:.0%})",
+    NodeType.EVIDENCE.value: "Supporting evidence: {content:.50}...",
+}
+
 
 class TrailExtractor:
     """
@@ -17,6 +28,9 @@ class TrailExtractor:
     Generates human-readable explanations and visualization data.
     """
     
+    # Longest reasoning path (in edges) considered; bounds path enumeration
+    MAX_PATH_LENGTH = 8
+    
     def __init__(self):
         """Initialize trail extractor"""
         self.confidence_scorer = get_confidence_scorer()
@@ -38,41 +52,89 @@ class TrailExtractor:
         symptom_nodes = graph.find_nodes_by_type(NodeType.SYMPTOM)
         outcome_nodes = graph.find_nodes_by_type(NodeType.OUTCOME)
         
-        # Extract all paths from symptoms to outcomes
-        all_paths = []
-        for symptom in symptom_nodes:
-            for outcome in outcome_nodes:
-                paths = graph.get_all_paths(symptom, outcome)
-                for path in paths:
-                    all_paths.append({
-                        "path": path,
-                        "start": symptom,
-                        "end": outcome,
-                        "length": len(path)
-                    })
+        # Count paths and per-node frequencies without enumerating them;
+        # only the shortest few paths are materialized
+        counts = graph.count_paths(symptom_nodes, outcome_nodes, cutoff=self.MAX_PATH_LENGTH)
+        if counts is not None:
+            num_paths, node_frequency = counts
+            top_paths = self._shortest_paths(graph, symptom_nodes, outcome_nodes, min(num_paths, 10))
+        else:
+            # Cyclic graph: fall back to full simple-path enumeration
+            all_paths = [
+                self._path_entry(path)
+                for symptom in symptom_nodes
+                for outcome in outcome_nodes
+                for path in graph.iter_simple_paths(symptom, outcome, cutoff=self.MAX_PATH_LENGTH)
+            ]
+            # Shortest (most direct) paths first; stable, so ties keep DFS order
+            all_paths.sort(key=lambda path_data: path_data["length"])
+            num_paths = len(all_paths)
+            node_frequency = Counter(
+                node_id for path_data in all_paths for node_id in path_data["path"]
+            )
+            top_paths = all_paths[:10]
         
         # Generate narrative for each path
-        narratives = []
-        for path_data in all_paths[:5]:  # Limit to top 5 paths
-            narrative = self._generate_narrative(graph, path_data["path"])
-            narratives.append(narrative)
+        narratives = [
+            self._generate_narrative(graph, path_data["path"])
+            for path_data in top_paths[:5]  # Limit to top 5 paths
+        ]
         
         # Extract key steps
-        key_steps = self._extract_key_steps(graph, all_paths)
+        key_steps = self._extract_key_steps(graph, node_frequency)
         
         trail = {
             "graph_id": graph.graph_id,
-            "num_paths": len(all_paths),
-            "paths": all_paths[:10],  # Include top 10 paths
+            "num_paths": num_paths,
+            "paths": top_paths,  # Include top 10 paths
             "narratives": narratives,
             "key_steps": key_steps,
             "graph_stats": graph.get_stats()
         }
         
-        logger.info(f"Extracted {len(all_paths)} reasoning paths")
+        logger.info(f"Extracted {num_paths} reasoning paths")
         
         return trail
     
+    @staticmethod
+    def _path_entry(path: List[str]) -> Dict[str, Any]:
+        """Trail entry for one path"""
+        return {
+            "path": path,
+            "start": path[0],
+            "end": path[-1],
+            "length": len(path)
+        }
+    
+    def _shortest_paths(
+        self,
+        graph: CausalGraph,
+        symptom_nodes: List[str],
+        outcome_nodes: List[str],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        First `limit` paths in (length, symptom, outcome, DFS) order
+        
+        Deepens the enumeration cutoff one edge at a time, so paths longer
+        than the last one returned are never walked.
+        """
+        paths = []
+        for num_edges in range(1, self.MAX_PATH_LENGTH + 1):
+            if len(paths) >= limit:
+                break
+            paths.extend(islice(
+                (
+                    self._path_entry(path)
+                    for symptom in symptom_nodes
+                    for outcome in outcome_nodes
+                    for path in graph.iter_simple_paths(symptom, outcome, cutoff=num_edges)
+                    if len(path) == num_edges + 1
+                ),
+                limit - len(paths)
+            ))
+        return paths
+    
     def _generate_narrative(self, graph: CausalGraph, path: List[str]) -> str:
         """
         Generate human-readable narrative for a reasoning path
@@ -88,32 +150,26 @@ class TrailExtractor:
             return "No reasoning path available."
         
         narrative_parts = []
+        nodes = graph.graph.nodes
+        successors = graph.graph.succ
+        last = len(path) - 1
         
         for i, node_id in enumerate(path):
-            node_data = graph.get_node(node_id)
-            if not node_data:
+            if node_id not in nodes:
                 continue
-            
-            content = node_data.get("content", "Unknown")
-            confidence = node_data.get("confidence", 0.0)
-            node_type = node_data.get("node_type", "unknown")
+            node_data = nodes[node_id]
             
             # Format based on node type
-            if node_type == NodeType.SYMPTOM.value:
-                narrative_parts.append(f"Patient presented with {content} (confidence: {confidence:.0%})")
-            elif node_type == NodeType.DIAGNOSIS.value:
-                narrative_parts.append(f"Diagnosed with {content} (confidence: {confidence:.0%})")
-            elif node_type == NodeType.TREATMENT.value:
-                narrative_parts.append(f"Treatment: {content} (confidence: {confidence:.0%})")
-            elif node_type == NodeType.OUTCOME.value:
-                narrative_parts.append(f"Expected outcome: {content} (confidence: {confidence:.0%})")
-            elif node_type == NodeType.EVIDENCE.value:
-                narrative_parts.append(f"Supporting evidence: {content[:50]}...")
+            template = _NARRATIVE_TEMPLATES.get(node_data.get("node_type", "unknown"))
+            if template is not None:
+                narrative_parts.append(template.format(
+                    content=node_data.get("content", "Unknown"),
+                    confidence=node_data.get("confidence", 0.0)
+                ))
             
             # Add edge information if not last node
-            if i < len(path) - 1:
-                next_node_id = path[i + 1]
-                edge_data = graph.get_edge(node_id, next_node_id)
+            if i < last:
+                edge_data = successors[node_id].get(path[i + 1])
                 if edge_data:
                     edge_type = edge_data.get("edge_type", "related to")
                     edge_confidence = edge_data.get("confidence", 0.0)
@@ -124,26 +180,12 @@ class TrailExtractor:
     def _extract_key_steps(
         self,
         graph: CausalGraph,
-        all_paths: List[Dict[str, Any]]
+        node_frequency: Dict[str, int]
     ) -> List[Dict[str, Any]]:
-        """Extract key reasoning steps from paths"""
-        # Find most common nodes across all paths
-        node_frequency = {}
-        
-        for path_data in all_paths:
-            for node_id in path_data["path"]:
-                node_frequency[node_id] = node_frequency.get(node_id, 0) + 1
-        
-        # Sort by frequency
-        sorted_nodes = sorted(
-            node_frequency.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
+        """Extract key reasoning steps (most common nodes across all paths)"""
         # Extract top nodes askey steps
         key_steps = []
-        for node_id, frequency in sorted_nodes[:5]:
+        for node_id, frequency in Counter(node_frequency).most_common(5):
             node_data = graph.get_node(node_id)
             if node_data:
                 key_steps.append({
@@ -178,12 +220,9 @@ class TrailExtractor:
         Returns:
             Dict with 'nodes' and 'edges' for React Flow
         """
-        react_flow_nodes = []
-        react_flow_edges = []
-        
         # Convert nodes
-        for node_id, node_data in graph.graph.nodes(data=True):
-            react_flow_nodes.append({
+        react_flow_nodes = [
+            {
                 "id": node_id,
                 "data": {
                     "label": node_data.get("content", ""),
@@ -192,11 +231,13 @@ class TrailExtractor:
                 },
                 "type": node_data.get("node_type", "default"),
                 "position": {"x": 0, "y": 0}  # Layout will be computed client-side
-            })
+            }
+            for node_id, node_data in graph.graph.nodes(data=True)
+        ]
         
         # Convert edges
-        for source, target, edge_data in graph.graph.edges(data=True):
-            react_flow_edges.append({
+        react_flow_edges = [
+            {
                 "id": f"{source}-{target}",
                 "source": source,
                 "target": target,
@@ -206,7 +247,9 @@ class TrailExtractor:
                     "strength": edge_data.get("causal_strength", "")
                 },
                 "animated": edge_data.get("confidence", 0.0) > 0.8
-            })
+            }
+            for source, target, edge_data in graph.graph.edges(data=True)
+        ]
         
         return {
             "nodes": react_flow_nodes,
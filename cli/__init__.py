@@ -6,17 +6,46 @@ Simple interface for testing the reasoning pipeline
 import argparse
 import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from agents.orchestrator import get_orchestrator
+from typing import List, Optional
 from core.logging_config import setup_logging, get_logger
-from core.config import get_settings
 
-# Initialize logging
-setup_logging()
+# The orchestrator (and with it openai, tiktoken and the vector store) is
+# imported inside the handlers, so --help and argument errors stay fast
 logger = get_logger("cli")
 
 
+def _start_backends() -> List[Future]:
+    """
+    Start loading the pipeline's slowest independent backends in the background
+    
+    The embedding model/Pinecone connection and the LLM client/tokenizer
+    do not depend on each other, so they load side by side (and overlap
+    with reading the input) instead of one after another inside
+    get_orchestrator().
+    
+    Returns:
+        Futures to wait on before building the orchestrator
+    """
+    from core.llm_manager import get_llm_manager
+    from storage.vector_store import get_vector_store
+    
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup")
+    futures = [pool.submit(get_vector_store), pool.submit(get_llm_manager)]
+    pool.shutdown(wait=False)
+    return futures
+
+
+def _get_orchestrator(backends: List[Future]):
+    """Wait for warm-up (re-raising its errors) and return the orchestrator"""
+    from agents.orchestrator import get_orchestrator
+    
+    for backend in backends:
+        backend.result()
+    return get_orchestrator()
+
+
 def format_output(result: dict, format_type: str = "text") -> str:
     """
     Format reasoning result for display
@@ -32,23 +61,23 @@ def format_output(result: dict, format_type: str = "text") -> str:
         return json.dumps(result, indent=2)
     
     # Text format
-    output_lines = []
-    output_lines.append("=" * 60)
-    output_lines.append("SEVAI - Medical Reasoning Analysis")
-    output_lines.append("=" * 60)
-    output_lines.append("")
-    
-    # Summary
-    output_lines.append(f"Conclusion: {result['conclusion']}")
-    output_lines.append(f"Confidence: {result['confidence']:.2%}")
-    output_lines.append(f"Duration: {result['total_duration_ms']:.2f}ms")
-    output_lines.append("")
+    risk_flags = result['risk_flags']
+    output_lines = [
+        "=" * 60,
+        "SEVAI - Medical Reasoning Analysis",
+        "=" * 60,
+        "",
+        # Summary
+        f"Conclusion: {result['conclusion']}",
+        f"Confidence: {result['confidence']:.2%}",
+        f"Duration: {result['total_duration_ms']:.2f}ms",
+        ""
+    ]
     
     # Risk Flags
-    if result['risk_flags']:
+    if risk_flags:
         output_lines.append("⚠️  Risk Flags:")
-        for flag in result['risk_flags']:
-            output_lines.append(f"  - {flag}")
+        output_lines.extend(f"  - {flag}" for flag in risk_flags)
         output_lines.append("")
     
     # Agent Results
@@ -66,16 +95,18 @@ def format_output(result: dict, format_type: str = "text") -> str:
             if 'causal_chains' in output:
                 chains = output['causal_chains']
                 output_lines.append(f"  Causal Chains: {len(chains)}")
-                for i, chain in enumerate(chains[:3], 1):  # Show first 3
-                    output_lines.append(
-                        f"    {i}. {chain.get('from', '')} → {chain.get('to', '')} "
-                        f"(confidence: {chain.get('confidence', 0):.2f})"
-                    )
+                output_lines.extend(
+                    f"    {i}. {chain.get('from', '')} → {chain.get('to', '')} "
+                    f"(confidence: {chain.get('confidence', 0):.2f})"
+                    for i, chain in enumerate(chains[:3], 1)  # Show first 3
+                )
             elif 'contradictions' in output:
                 contradictions = output['contradictions']
                 output_lines.append(f"  Contradictions Found: {len(contradictions)}")
-                for i, contradiction in enumerate(contradictions, 1):
-                    output_lines.append(f"    {i}. {contradiction.get('type', 'unknown')}: severity {contradiction.get('severity', 'unknown')}")
+                output_lines.extend(
+                    f"    {i}. {contradiction.get('type', 'unknown')}: severity {contradiction.get('severity', 'unknown')}"
+                    for i, contradiction in enumerate(contradictions, 1)
+                )
     
     output_lines.append("")
     output_lines.append("=" * 60)
@@ -94,12 +125,14 @@ def process_file(file_path: Path, output_format: str = "text") -> None:
     logger.info(f"Processing file: {file_path}")
     
     try:
+        backends = _start_backends()
+        
         # Read input
         with open(file_path, 'r', encoding='utf-8') as f:
             input_text = f.read()
         
         # Get orchestrator
-        orchestrator = get_orchestrator()
+        orchestrator = _get_orchestrator(backends)
         
         # Execute pipeline
         result = orchestrator.execute_pipeline(
@@ -134,7 +167,7 @@ def process_text(text: str, output_format: str = "text") -> None:
     
     try:
         # Get orchestrator
-        orchestrator = get_orchestrator()
+        orchestrator = _get_orchestrator(_start_backends())
         
         # Execute pipeline
         result = orchestrator.execute_pipeline(
@@ -165,7 +198,7 @@ def export_trail(execution_id: int, output_file: Optional[Path] = None) -> None:
     logger.info(f"Exporting reasoning trail for execution {execution_id}")
     
     try:
-        orchestrator = get_orchestrator()
+        orchestrator = _get_orchestrator(_start_backends())
         trail = orchestrator.get_reasoning_trail(execution_id)
         
         trail_json = json.dumps(trail, indent=2)
@@ -237,6 +270,9 @@ Examples:
     
     args = parser.parse_args()
     
+    # Initialize logging
+    setup_logging()
+    
     # Route to appropriate handler
     if args.file:
         process_file(args.file, args.format)
@@ -0,0 +1,60 @@
+"""
+In-process caching utilities
+Bounded, thread-safe LRU cache shared by pipeline components
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a fixed capacity.
+    Keys must be hashable; callers hash unhashable inputs themselves.
+    """
+
+    def __init__(self, max_size: int = 128):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Maximum number of entries kept before evicting the oldest
+        """
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return cached value and mark it as most recently used"""
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def values(self) -> List[Any]:
+        """Snapshot of cached values, least recently used first"""
+        with self._lock:
+            return list(self._data.values())
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
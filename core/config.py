@@ -3,6 +3,7 @@ Configuration management for SEVAI
 Load and validate environment variables
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -21,21 +22,35 @@ class Settings(BaseSettings):
     pinecone_api_key: str
     pinecone_environment: str
     pinecone_index_name: str = "sevai-medical-knowledge"
+    pinecone_metric: str = "dotproduct"  # Metric for newly created indexes (embeddings are normalized)
+    pinecone_use_grpc: bool = False  # gRPC data plane (requires pinecone[grpc])
     
     # Database Configuration
     database_url: str = "sqlite:///./sevai_vault.db"
+    vault_maintenance_interval: int = 300  # Seconds between WAL checkpoint/ANALYZE runs (0 disables)
     
     # Application Settings
     app_env: str = "development"
     log_level: str = "INFO"
     max_retries: int = 3
     request_timeout: int = 30
+    llm_cache_path: Optional[str] = None  # SQLite file for temperature-0 responses
     
     # Vector Store Settings
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_cache_path: Optional[str] = None  # SQLite file caching embeddings by content hash
+    embedding_backend: str = "torch"  # torch, onnx or openvino (faster CPU inference)
+    embedding_dim: Optional[int] = None  # Set to skip loading the model just to size a new index
+    embedding_model_file: Optional[str] = None  # Optimized/quantized ONNX or OpenVINO file in the model repo
+    embedding_provider: Optional[str] = None  # ONNX Runtime execution provider, e.g. CUDAExecutionProvider
+    embedding_workers: int = 1  # >1 encodes large batches in that many CPU processes
     max_vectors: int = 95000
     chunk_size: int = 512
     chunk_overlap: int = 50
+    chunking_strategy: str = "sentence"  # sentence, or token (tokenizer-aware, fewer chunks)
+    chunk_max_tokens: int = 200  # Hard token limit per chunk for the token strategy
+    retrieval_cache_size: int = 1024  # Cached retrieve() results (LRU)
+    retrieval_cache_ttl: int = 300  # Seconds a cached retrieval is served; 0 disables
     
     # Confidence Thresholds
     confidence_threshold_high: float = 0.85
@@ -60,6 +75,12 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings singleton"""
+    """
+    Get application settings singleton
+    
+    Built (and .env parsed) once per process; call get_settings.cache_clear()
+    to reload after changing the environment.
+    """
     return Settings()
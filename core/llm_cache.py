@@ -0,0 +1,230 @@
+"""
+LLM Response Cache
+Serves repeated prompts without an LLM round-trip
+"""
+
+from typing import Optional, Dict, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from core.cache import LRUCache
+from core.logging_config import get_logger
+
+logger = get_logger("llm_cache")
+
+
+@dataclass
+class _CacheEntry:
+    """Cached LLM response"""
+    response: Dict[str, Any]
+    created_at: float
+
+
+class LLMResponseCache:
+    """
+    Exact-match response cache in front of an LLMManager.
+
+    A request hits only when its system message, prompt and generation
+    parameters all match a cached one. Near-duplicate prompts are not
+    reused: in clinical text a one-word difference ("no fever") can
+    change the answer.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        max_size: int = 2000,
+        ttl_seconds: float = 600
+    ):
+        """
+        Initialize cache
+
+        Args:
+            llm: Object exposing generate(prompt, system_message=None, **kwargs)
+            max_size: Maximum cached responses (LRU eviction)
+            ttl_seconds: Time-to-live of cached responses
+        """
+        self.llm = llm
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._parsed = LRUCache(max_size=max_size)
+        # (system_message, serialized kwargs) -> namespace digest; agents pass
+        # the same constant system message every call, so hash it only once
+        self._namespaces = LRUCache(max_size=64)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(*parts: Any) -> str:
+        """Stable digest of request parts"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _namespace(self, system_message: Optional[str], kwargs: Dict[str, Any]) -> str:
+        """Digest of system message and generation parameters, memoized"""
+        params = json.dumps(kwargs, sort_keys=True, default=str)
+        namespace = self._namespaces.get((system_message, params))
+        if namespace is None:
+            namespace = self._digest(system_message, kwargs)
+            self._namespaces.put((system_message, params), namespace)
+        return namespace
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop entries past their TTL (oldest first)"""
+        expired = [
+            key for key, entry in self._entries.items()
+            if now - entry.created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+
+    def generate(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Return a cached response or call the wrapped LLM
+
+        Args:
+            prompt: User prompt/query
+            system_message: System message for context/instructions
+            **kwargs: Generation parameters forwarded to the LLM
+
+        Returns:
+            Response dict (with "cache_hit": True when served from cache)
+        """
+        namespace = self._namespace(system_message, kwargs)
+        key = self._digest(namespace, prompt)
+        now = time.monotonic()
+
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is not None:
+            logger.debug(f"LLM cache hit ({self.hits} hits / {self.misses} misses)")
+            return {**entry.response, "cache_hit": True}
+
+        response = self.llm.generate(prompt, system_message=system_message, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _CacheEntry(response=response, created_at=now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return response
+
+    def generate_json(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        **kwargs
+    ) -> Optional[Any]:
+        """
+        Generate a JSON response and return it parsed
+
+        Parsed values are cached by output text, so cache hits skip
+        json.loads; each call returns its own copy of the cached value.
+
+        Args:
+            prompt: User prompt/query
+            system_message: System message for context/instructions
+            **kwargs: Generation parameters forwarded to the LLM
+
+        Returns:
+            Parsed JSON value, or None if the output is not valid JSON
+        """
+        output = self.generate(prompt, system_message=system_message, **kwargs)["output"]
+
+        parsed = self._parsed.get(output)
+        if parsed is None:
+            try:
+                parsed = json.loads(output)
+            except json.JSONDecodeError:
+                return None
+            self._parsed.put(output, parsed)
+        return copy.deepcopy(parsed)
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+        self._parsed.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class DiskResponseCache:
+    """
+    Persistent response store for deterministic LLM calls.
+
+    Responses live in a small SQLite file keyed by a digest of the full
+    request, so temperature-0 calls are served across process restarts.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file path (":memory:" for a process-local store)
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(**request: Any) -> str:
+        """Digest of the canonical request JSON"""
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored response for key, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response"""
+        payload = json.dumps(response, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                (key, payload, time.time())
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all stored responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
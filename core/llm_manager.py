@@ -4,11 +4,15 @@ Provides API-based LLM access without GPU requirements
 """
 
 from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 import openai
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
+import threading
 import tiktoken
 import time
 from core.config import get_settings
+from core.llm_cache import DiskResponseCache
 from core.logging_config import get_logger
 
 logger = get_logger("llm_manager")
@@ -20,12 +24,22 @@ class LLMManager:
     Optimized for GPT-4 with fallback to GPT-3.5-turbo for cost savings.
     """
     
+    # Tokenizers by model name, shared by all instances
+    _ENCODINGS: Dict[str, "tiktoken.Encoding"] = {}
+    # One HTTP connection pool for all instances, so keep-alive TLS
+    # sessions are reused across managers and batch workers
+    _HTTP_CLIENT: Optional[httpx.Client] = None
+    # Guards creation of the shared objects above, so concurrent managers
+    # never build (and leak) a duplicate tokenizer or connection pool
+    _SHARED_LOCK = threading.Lock()
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         max_retries: int = 3,
-        timeout: int = 30
+        timeout: int = 30,
+        cache_path: Optional[str] = None
     ):
         """
         Initialize LLM Manager
@@ -35,6 +49,8 @@ class LLMManager:
             model: Model to use (defaults to settings, typically gpt-4)
             max_retries: Maximum number of retry attempts
             timeout: Request timeout in seconds
+            cache_path: SQLite file caching temperature-0 responses
+                (defaults to settings.llm_cache_path; None disables)
         """
         settings = get_settings()
         
@@ -44,14 +60,14 @@ class LLMManager:
         self.timeout = timeout
         
         # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=self._get_http_client())
+        
+        # Persistent cache for deterministic (temperature 0) requests
+        cache_path = cache_path or settings.llm_cache_path
+        self.response_cache = DiskResponseCache(cache_path) if cache_path else None
         
         # Initialize tokenizer for token counting
-        try:
-            self.encoding = tiktoken.encoding_for_model(self.model)
-        except KeyError:
-            logger.warning(f"Model {self.model} not found, using cl100k_base encoding")
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.encoding = self._get_encoding(self.model)
         
         # Context window sizes
         self.context_windows = {
@@ -64,6 +80,37 @@ class LLMManager:
         
         logger.info(f"LLM Manager initialized with model: {self.model}")
     
+    @classmethod
+    def _get_http_client(cls) -> httpx.Client:
+        """Shared HTTP client (OpenAI defaults, longer keep-alive)"""
+        if cls._HTTP_CLIENT is None:
+            with cls._SHARED_LOCK:
+                if cls._HTTP_CLIENT is None:
+                    cls._HTTP_CLIENT = DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=100,
+                            max_keepalive_connections=50,
+                            keepalive_expiry=30.0  # LLM calls are often seconds apart
+                        )
+                    )
+        return cls._HTTP_CLIENT
+    
+    @classmethod
+    def _get_encoding(cls, model: str) -> "tiktoken.Encoding":
+        """Tokenizer for a model, loaded once per model name"""
+        encoding = cls._ENCODINGS.get(model)
+        if encoding is None:
+            with cls._SHARED_LOCK:
+                encoding = cls._ENCODINGS.get(model)
+                if encoding is None:
+                    try:
+                        encoding = tiktoken.encoding_for_model(model)
+                    except KeyError:
+                        logger.warning(f"Model {model} not found, using cl100k_base encoding")
+                        encoding = tiktoken.get_encoding("cl100k_base")
+                    cls._ENCODINGS[model] = encoding
+        return encoding
+    
     def count_tokens(self, text: str) -> int:
         """
         Count tokens in a text string
@@ -122,7 +169,23 @@ class LLMManager:
             
         Returns:
             Dict containing response, token counts, and metadata
+            (with "cache_hit": True when served from the response cache)
         """
+        cache_key = None
+        if self.response_cache is not None and temperature == 0 and not kwargs.get("stream"):
+            cache_key = DiskResponseCache.key(
+                model=self.model,
+                system_message=system_message,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                params=kwargs
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM response served from disk cache")
+                return {**cached, "cache_hit": True}
+        
         messages = []
         
         if system_message:
@@ -130,9 +193,10 @@ class LLMManager:
         
         messages.append({"role": "user", "content": prompt})
         
-        # Count input tokens
-        input_text = system_message or "" + prompt
-        input_tokens = self.count_tokens(input_text)
+        # Count input tokens (system message and prompt both use the context window)
+        input_tokens = self.count_tokens(prompt)
+        if system_message:
+            input_tokens += self.count_tokens(system_message)
         
         # Validate context window
         if input_tokens > self.max_tokens - 500:  # Leave room for response
@@ -181,7 +245,7 @@ class LLMManager:
                     f"cost: ${cost:.4f}"
                 )
                 
-                return {
+                result = {
                     "output": output,
                     "finish_reason": finish_reason,
                     "prompt_tokens": prompt_tokens,
@@ -190,6 +254,9 @@ class LLMManager:
                     "cost": cost,
                     "model": self.model,
                 }
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, result)
+                return result
                 
             except openai.RateLimitError as e:
                 logger.warning(f"Rate limit hit, retrying in {2 ** attempt} seconds...")
@@ -249,28 +316,37 @@ class LLMManager:
         self,
         prompts: List[str],
         system_message: Optional[str] = None,
+        max_workers: int = 4,
         **kwargs
     ) -> List[Dict[str, Any]]:
         """
         Generate completions for multiple prompts
         
+        Requests are sent concurrently (the OpenAI client is thread-safe),
+        so the batch takes roughly as long as its slowest call rather than
+        the sum of all round-trips.
+        
         Args:
             prompts: List of prompts
             system_message: System message (shared across all)
+            max_workers: Maximum concurrent API requests
             **kwargs: Additional parameters
             
         Returns:
-            List of response dicts
+            List of response dicts, in prompt order
         """
-        results = []
-        total_cost = 0.0
+        logger.info(f"Processing {len(prompts)} prompts")
+        
+        def generate_one(prompt: str) -> Dict[str, Any]:
+            return self.generate(prompt, system_message, **kwargs)
         
-        for i, prompt in enumerate(prompts):
-            logger.info(f"Processing prompt {i+1}/{len(prompts)}")
-            result = self.generate(prompt, system_message, **kwargs)
-            results.append(result)
-            total_cost += result.get("cost", 0.0)
+        if len(prompts) <= 1:
+            results = [generate_one(prompt) for prompt in prompts]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(prompts))) as pool:
+                results = list(pool.map(generate_one, prompts))
         
+        total_cost = sum(result.get("cost", 0.0) for result in results)
         logger.info(f"Batch generation complete. Total cost: ${total_cost:.4f}")
         return results
 
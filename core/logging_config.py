@@ -3,13 +3,41 @@ Logging configuration for SEVAI
 Provides structured logging with HIPAA-compliant audit trails
 """
 
+import atexit
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
 import os
 
+# Background listeners started by setup_logging (stopped on re-setup and exit)
+_listeners: List[QueueListener] = []
+
+
+def _attach_queue(logger: logging.Logger, *handlers: logging.Handler) -> None:
+    """
+    Route a logger's records through a queue to handlers on a background thread
+    
+    Callers only enqueue the record; formatting and file/console writes
+    happen on the listener thread, off the request path.
+    """
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def _stop_listeners() -> None:
+    """Flush and stop all queue listeners"""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(_stop_listeners)
+
 
 def setup_logging(
     log_level: Optional[str] = None,
@@ -35,6 +63,13 @@ def setup_logging(
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
+    # Replace handlers from an earlier setup instead of stacking duplicates
+    _stop_listeners()
+    for name in ("sevai", "sevai.audit"):
+        existing = logging.getLogger(name)
+        for handler in [h for h in existing.handlers if isinstance(h, QueueHandler)]:
+            existing.removeHandler(handler)
+    
     # Configure root logger
     logger = logging.getLogger("sevai")
     logger.setLevel(getattr(logging, log_level.upper()))
@@ -47,7 +82,6 @@ def setup_logging(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
     
     # File handler (rotating)
     if log_file is None:
@@ -64,7 +98,7 @@ def setup_logging(
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    _attach_queue(logger, console_handler, file_handler)
     
     # Audit logger (HIPAA compliance)
     if enable_audit:
@@ -82,7 +116,7 @@ def setup_logging(
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         audit_handler.setFormatter(audit_formatter)
-        audit_logger.addHandler(audit_handler)
+        _attach_queue(audit_logger, audit_handler)
         audit_logger.propagate = False  # Don't propagate to root logger
     
     logger.info(f"Logging initialized at {log_level} level")
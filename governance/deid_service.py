@@ -3,11 +3,39 @@ De-identification Service - PII/PHI masking for medical records
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from core.logging_config import get_logger
 
 logger = get_logger("deid_service")
 
+
+# Basic patterns for common PHI entities
+_PHI_PATTERNS = {
+    "MRN": r"\b\d{7,10}\b", # Medical Record Number
+    "SSN": r"\b\d{3}-\d{2}-\d{4}\b",
+    "PHONE": r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
+    "EMAIL": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
+    "DOB": r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",
+    "ZIP": r"\b\d{5}(?:-\d{4})?\b"
+}
+
+# All categories fused into one pattern (compiled once, shared by every
+# instance) so text is scanned once; alternatives keep the priority order
+# above and the matching category is read back from the named group
+_COMBINED_PATTERN = re.compile("|".join(
+    f"(?P<{label}>{pattern})" for label, pattern in _PHI_PATTERNS.items()
+))
+
+_DEFAULT_SENSITIVE_KEYS = frozenset({"name", "address", "dob", "patient_id", "mrn", "content"})
+
+
+@lru_cache(maxsize=32)
+def _mask_tokens(replacement: str, labels: Tuple[str, ...]) -> Dict[str, str]:
+    """Replacement string per PHI label (built once per replacement text)"""
+    return {label: f"{replacement} (PHI:{label})" for label in labels}
+
+
 class DeidService:
     """
     Detects and masks Protected Health Information (PHI) and 
@@ -15,53 +43,53 @@ class DeidService:
     """
     
     def __init__(self):
-        # Basic patterns for common PHI entities
-        self.patterns = {
-            "MRN": r"\b\d{3}-\d{2}-\d{4}\b|\b\d{7,10}\b", # Medical Record Number
-            "SSN": r"\b\d{3}-\d{2}-\d{4}\b",
-            "PHONE": r"\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b",
-            "EMAIL": r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b",
-            "DOB": r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b",
-            "ZIP": r"\b\d{5}(?:-\d{4})?\b"
-        }
+        self.patterns = _PHI_PATTERNS
+        self._combined = _COMBINED_PATTERN
+        self._labels = tuple(self.patterns)
         logger.info("De-identification Service initialized")
 
     def mask_text(self, text: str, replacement: str = "[REDACTED]") -> str:
         """
         Scan text for PHI patterns and mask them
         """
-        masked_text = text
-        for label, pattern in self.patterns.items():
-            matches = re.findall(pattern, masked_text)
-            if matches:
-                logger.debug(f"Detected {len(matches)} occurrences of {label}")
-                masked_text = re.sub(pattern, f"{replacement} (PHI:{label})", masked_text)
+        tokens = _mask_tokens(replacement, self._labels)
+        masked_text, count = self._combined.subn(lambda match: tokens[match.lastgroup], text)
+        if count:
+            logger.debug(f"Detected {count} PHI occurrences")
         
         return masked_text
 
     def mask_dict(self, data: Dict[str, Any], sensitive_keys: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        Recursively mask values in a dictionary
+        Mask values in a dictionary, including nested dicts
+        
+        Walks nested dicts (and dicts inside lists) with an explicit stack
+        rather than recursion, so deeply nested payloads cost no call frames.
         """
-        masked_dict = {}
-        target_keys = sensitive_keys or ["name", "address", "dob", "patient_id", "mrn", "content"]
+        target_keys = frozenset(sensitive_keys) if sensitive_keys else _DEFAULT_SENSITIVE_KEYS
         
-        for k, v in data.items():
-            if isinstance(v, str):
-                if k.lower() in target_keys:
-                    masked_dict[k] = self.mask_text(v)
+        masked_dict: Dict[str, Any] = {}
+        stack = [(data, masked_dict)]
+        while stack:
+            source, masked = stack.pop()
+            for k, v in source.items():
+                if isinstance(v, str):
+                    masked[k] = self.mask_text(v) if k.lower() in target_keys else v
+                elif isinstance(v, dict):
+                    masked[k] = {}
+                    stack.append((v, masked[k]))
+                elif isinstance(v, list):
+                    items = []
+                    for item in v:
+                        if isinstance(item, dict):
+                            items.append({})
+                            stack.append((item, items[-1]))
+                        else:
+                            items.append(item)
+                    masked[k] = items
                 else:
-                    masked_dict[k] = v
-            elif isinstance(v, dict):
-                masked_dict[k] = self.mask_dict(v, target_keys)
-            elif isinstance(v, list):
-                masked_dict[k] = [
-                    self.mask_dict(item, target_keys) if isinstance(item, dict) else item 
-                    for item in v
-                ]
-            else:
-                masked_dict[k] = v
-                
+                    masked[k] = v
+        
         return masked_dict
 
 # Singleton
@@ -15,9 +15,9 @@ class PolicyAction(Enum):
     BLOCK = "block"
     ESCALATE = "escalate"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Rule:
-    """A governance rule definition"""
+    """A governance rule definition (immutable; evaluated for every check)"""
     id: str
     description: str
     priority: int  # Higher is more critical
@@ -25,6 +25,34 @@ class Rule:
     condition_type: str  # e.g., "contains_pii", "confidence_threshold", "keyword_match"
     parameters: Dict[str, Any]
 
+# Default HIPAA and safety rules (immutable, shared by all engines)
+_DEFAULT_RULES = (
+    Rule(
+        id="HIPAA-001",
+        description="Prevent unmasked PHI in final output",
+        priority=100,
+        action=PolicyAction.BLOCK,
+        condition_type="contains_phi",
+        parameters={}
+    ),
+    Rule(
+        id="SAFETY-001",
+        description="Minimum confidence for treatment suggestions",
+        priority=90,
+        action=PolicyAction.WARN,
+        condition_type="confidence_threshold",
+        parameters={"threshold": 0.7}
+    ),
+    Rule(
+        id="SAFETY-002",
+        description="Halt on critical contradictions in diagnosis",
+        priority=95,
+        action=PolicyAction.ESCALATE,
+        condition_type="critical_contradiction",
+        parameters={}
+    )
+)
+
 class PolicyEngine:
     """
     Evaluates agent outputs and system actions against regulatory policies.
@@ -32,37 +60,14 @@ class PolicyEngine:
     """
     
     def __init__(self, rules: Optional[List[Rule]] = None):
-        self.rules = rules or self._load_default_rules()
+        # Kept in evaluation order (highest priority first) so evaluate()
+        # does not re-sort on every call
+        self.rules = sorted(rules or self._load_default_rules(), key=lambda x: x.priority, reverse=True)
         logger.info(f"Policy Engine initialized with {len(self.rules)} rules")
 
     def _load_default_rules(self) -> List[Rule]:
         """Load default HIPAA and safety rules"""
-        return [
-            Rule(
-                id="HIPAA-001",
-                description="Prevent unmasked PHI in final output",
-                priority=100,
-                action=PolicyAction.BLOCK,
-                condition_type="contains_phi",
-                parameters={}
-            ),
-            Rule(
-                id="SAFETY-001",
-                description="Minimum confidence for treatment suggestions",
-                priority=90,
-                action=PolicyAction.WARN,
-                condition_type="confidence_threshold",
-                parameters={"threshold": 0.7}
-            ),
-            Rule(
-                id="SAFETY-002",
-                description="Halt on critical contradictions in diagnosis",
-                priority=95,
-                action=PolicyAction.ESCALATE,
-                condition_type="critical_contradiction",
-                parameters={}
-            )
-        ]
+        return list(_DEFAULT_RULES)
 
     def evaluate(self, data: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
@@ -72,7 +77,7 @@ class PolicyEngine:
             List of violations/findings
         """
         findings = []
-        for rule in sorted(self.rules, key=lambda x: x.priority, reverse=True):
+        for rule in self.rules:
             logger.debug(f"Evaluating rule: {rule.id}")
             # Logic for specific condition types will be implemented in Step 2
             # For now, this is a stub for the structure
@@ -6,7 +6,10 @@ Ingests medical guidelines and documents into Pinecone Vector Store
 import sys
 import os
 import argparse
-from typing import List, Dict, Any
+import queue
+import threading
+from typing import List, Dict, Any, Iterator
+from concurrent.futures import ThreadPoolExecutor
 import glob
 
 # Add project root to path
@@ -17,34 +20,144 @@ from core.logging_config import get_logger
 
 logger = get_logger("ingestion_script")
 
+# Files larger than this are streamed block by block instead of read whole
+STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024
+BLOCK_CHARS = 1024 * 1024
+# Blocks read ahead of the embedding/upsert consumer
+QUEUE_SIZE = 16
+
+
+def _file_metadata(filepath: str, source_name: str, topic: str) -> Dict[str, Any]:
+    """Vector store metadata for a guideline file"""
+    return {
+        "source": source_name,
+        "topic": topic,
+        "filename": os.path.basename(filepath),
+        "type": "medical_guideline"
+    }
+
+
+def load_document(filepath: str, source_name: str, topic: str) -> Dict[str, Any]:
+    """Read a file into a vector store document"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    return {
+        "text": text,
+        "metadata": _file_metadata(filepath, source_name, topic)
+    }
+
+
+def iter_text_blocks(filepath: str, block_chars: int = BLOCK_CHARS) -> Iterator[str]:
+    """
+    Yield a file's text in blocks of roughly block_chars characters
+    
+    Blocks end on a sentence boundary ('. ', the separator the vector store
+    chunker splits on), so no sentence is cut in half.
+    """
+    carry = ""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        while True:
+            data = f.read(block_chars)
+            if not data:
+                break
+            
+            text = carry + data
+            cut = text.rfind('. ')
+            if cut < 0:
+                # No boundary yet; give up waiting once the carry gets large
+                if len(text) < 2 * block_chars:
+                    carry = text
+                    continue
+                yield text
+                carry = ""
+                continue
+            
+            yield text[:cut]
+            carry = text[cut + 2:]
+    
+    if carry.strip():
+        yield carry
+
+
+def stream_file(filepath: str, source_name: str, topic: str) -> Dict[str, Any]:
+    """
+    Ingest a large file without loading it whole
+    
+    A reader thread fills a bounded queue with text blocks while the
+    caller embeds and upserts them, overlapping file IO with compute.
+    """
+    vector_store = get_vector_store()
+    metadata = _file_metadata(filepath, source_name, topic)
+    blocks: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+    
+    def read_blocks():
+        try:
+            for block in iter_text_blocks(filepath):
+                blocks.put(block)
+        except Exception as e:
+            blocks.put(e)
+            return
+        blocks.put(None)
+    
+    threading.Thread(target=read_blocks, daemon=True).start()
+    
+    totals = {"blocks": 0, "chunks": 0, "vectors": 0}
+    while (block := blocks.get()) is not None:
+        if isinstance(block, Exception):
+            raise block
+        
+        stats = vector_store.upsert_documents([{
+            "text": block,
+            "metadata": {**metadata, "block": totals["blocks"]}
+        }])
+        totals["blocks"] += 1
+        totals["chunks"] += stats["chunks"]
+        totals["vectors"] += stats["vectors"]
+    
+    return totals
+
 
 def ingest_file(filepath: str, source_name: str, topic: str):
     """Ingest a single file"""
     logger.info(f"Ingesting file: {filepath}")
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        vector_store = get_vector_store()
+        if os.path.getsize(filepath) > STREAM_THRESHOLD_BYTES:
+            stats = stream_file(filepath, source_name, topic)
+        else:
+            document = load_document(filepath, source_name, topic)
+            
+            # Upsert
+            stats = get_vector_store().upsert_documents([document])
+        logger.info(f"Ingestion complete: {stats}")
         
-        # Prepare document
-        document = {
-            "text": text,
-            "metadata": {
-                "source": source_name,
-                "topic": topic,
-                "filename": os.path.basename(filepath),
-                "type": "medical_guideline"
-            }
-        }
+    except Exception as e:
+        logger.error(f"Failed to ingest file {filepath}: {e}")
+
+
+def ingest_directory(pattern: str, source_name: str, topic: str):
+    """Ingest every file matching a glob pattern with one batched upsert"""
+    filepaths = sorted(glob.glob(pattern, recursive=True))
+    if not filepaths:
+        logger.warning(f"No files match: {pattern}")
+        return
+    
+    logger.info(f"Ingesting {len(filepaths)} files matching: {pattern}")
+    
+    try:
+        # File reads are IO-bound, so load them concurrently
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, len(filepaths))) as pool:
+            documents = list(pool.map(
+                lambda filepath: load_document(filepath, source_name, topic),
+                filepaths
+            ))
         
-        # Upsert
-        stats = vector_store.upsert_documents([document])
+        stats = get_vector_store().upsert_documents(documents)
         logger.info(f"Ingestion complete: {stats}")
         
     except Exception as e:
-        logger.error(f"Failed to ingest file {filepath}: {e}")
+        logger.error(f"Failed to ingest files matching {pattern}: {e}")
 
 
 def ingest_sample_knowledge():
@@ -92,26 +205,27 @@ def ingest_sample_knowledge():
         }
     ]
     
-    vector_store = get_vector_store()
-    
-    documents = []
-    for sample in samples:
-        documents.append({
+    documents = [
+        {
             "text": sample["text"],
             "metadata": {
                 "source": sample["source"],
                 "topic": sample["topic"],
                 "type": "guideline_summary"
             }
-        })
+        }
+        for sample in samples
+    ]
     
-    stats = vector_store.upsert_documents(documents)
+    # Single upsert call for all samples
+    stats = get_vector_store().upsert_documents(documents)
     logger.info(f"Sample ingestion stats: {stats}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ingest medical knowledge into Vector Store")
     parser.add_argument("--file", help="Path to text file to ingest")
+    parser.add_argument("--pattern", help="Glob pattern of text files to ingest (e.g. 'docs/**/*.txt')")
     parser.add_argument("--source", help="Source name (e.g., 'WHO Guidelines')", default="Manual Import")
     parser.add_argument("--topic", help="Medical topic", default="General")
     parser.add_argument("--sample", action="store_true", help="Ingest sample medical knowledge")
@@ -122,5 +236,7 @@ if __name__ == "__main__":
         ingest_sample_knowledge()
     elif args.file:
         ingest_file(args.file, args.source, args.topic)
+    elif args.pattern:
+        ingest_directory(args.pattern, args.source, args.topic)
     else:
         parser.print_help()
@@ -0,0 +1,117 @@
+"""
+Embedding Cache
+Content-addressed SQLite store so unchanged text is never re-embedded
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from core.logging_config import get_logger
+
+logger = get_logger("embedding_cache")
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (999)
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store keyed by SHA-256 of the text.
+
+    Vectors are stored as float32 blobs under (hash, provider, model), so
+    switching embedding models never serves stale vectors.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite file path (":memory:" for a process-local store)
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash TEXT NOT NULL, provider TEXT NOT NULL, model TEXT NOT NULL, "
+            "vector BLOB NOT NULL, PRIMARY KEY (hash, provider, model))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Content hash of text"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(
+        self,
+        hashes: Sequence[str],
+        provider: str,
+        model: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors
+
+        Args:
+            hashes: Content hashes to look up
+            provider: Embedding provider name
+            model: Embedding model name
+
+        Returns:
+            Dict of hash -> float32 vector for the hashes found
+        """
+        unique = list(dict.fromkeys(hashes))
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for i in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[i:i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embedding_cache "
+                    f"WHERE provider = ? AND model = ? AND hash IN ({placeholders})",
+                    (provider, model, *batch)
+                ).fetchall()
+                for content_hash, blob in rows:
+                    found[content_hash] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def put_many(
+        self,
+        items: Iterable[Tuple[str, Sequence[float]]],
+        provider: str,
+        model: str
+    ) -> None:
+        """
+        Store vectors (existing entries are kept)
+
+        Args:
+            items: (hash, vector) pairs
+            provider: Embedding provider name
+            model: Embedding model name
+        """
+        rows = [
+            (content_hash, provider, model, np.asarray(vector, dtype=np.float32).tobytes())
+            for content_hash, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (hash, provider, model, vector) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached vectors"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embedding_cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
@@ -3,12 +3,19 @@ Explainability Vault - Immutable Audit Trail Storage
 SQLite-based append-only storage for HIPAA compliance
 """
 
-from typing import Optional, Dict, Any, List
-from sqlalchemy import create_engine, Column, Integer, String, Text, Float, DateTime, JSON
+from typing import Optional, Dict, Any, List, Iterator, Callable
+from sqlalchemy import bindparam, create_engine, event, insert, select, Column, Index, Integer, String, Text, Float, DateTime, JSON
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import hashlib
 import json
+import sys
+import threading
+import time
 from core.config import get_settings
 from core.logging_config import get_logger, get_audit_logger
 
@@ -17,6 +24,38 @@ audit_logger = get_audit_logger()
 
 Base = declarative_base()
 
+# Per-connection SQLite tuning for the append-only audit workload: WAL lets
+# readers run alongside the writer, and NORMAL sync is durable in WAL mode
+# up to the last checkpoint
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA wal_autocheckpoint=1000",
+) + (("PRAGMA fullfsync=true",) if sys.platform == "darwin" else ())
+
+
+# Maintenance: truncate the WAL once it holds this many pages (~40 MB at
+# 4 KiB pages) and refresh planner statistics at most daily
+_WAL_TRUNCATE_PAGES = 10000
+_ANALYZE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Serializer for JSON columns: compact separators keep tool_calls and other
+# list-heavy columns ~10-15% smaller on disk; reads use the stock json.loads
+_COMPACT_JSON = json.JSONEncoder(separators=(",", ":"))
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Engine connect hook applying _SQLITE_PRAGMAS to each new connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 class Input(Base):
     """Input records - raw inputs to the system"""
@@ -34,6 +73,9 @@ class Input(Base):
 class AgentExecution(Base):
     """Agent execution records"""
     __tablename__ = "agent_executions"
+    __table_args__ = (
+        Index("ix_agent_executions_input_ts", "input_id", "timestamp"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     input_id = Column(Integer, nullable=False)
@@ -51,7 +93,7 @@ class CausalStep(Base):
     __tablename__ = "causal_steps"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    execution_id = Column(Integer, nullable=False)
+    execution_id = Column(Integer, nullable=False, index=True)
     premise = Column(Text, nullable=False)
     conclusion = Column(Text, nullable=False)
     confidence = Column(Float, nullable=False)
@@ -66,7 +108,7 @@ class PolicyCheck(Base):
     __tablename__ = "policy_checks"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    execution_id = Column(Integer, nullable=False)
+    execution_id = Column(Integer, nullable=False, index=True)
     policy_name = Column(String(100), nullable=False)
     result = Column(String(20), nullable=False)  # pass, warn, fail
     details = Column(JSON)
@@ -80,7 +122,7 @@ class Output(Base):
     __tablename__ = "outputs"
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    execution_id = Column(Integer, nullable=False)
+    execution_id = Column(Integer, nullable=False, index=True)
     conclusion = Column(Text, nullable=False)
     confidence = Column(Float, nullable=False)
     risk_flags = Column(JSON)  # List of risk flags
@@ -89,42 +131,298 @@ class Output(Base):
     prev_hash = Column(String(64))
 
 
+# Shared canonical encoder for record hashes; json.dumps(sort_keys=...)
+# would construct a new JSONEncoder on every call
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, default=str)
+
+# Columns covered by each record's chain hash (everything but id/timestamp,
+# including prev_hash so every record commits to its predecessor)
+_CHAIN_FIELDS = {
+    table_class: tuple(
+        column.name for column in table_class.__table__.columns
+        if column.name not in ("id", "timestamp")
+    )
+    for table_class in (Input, AgentExecution, CausalStep, PolicyCheck, Output)
+}
+
+
+def _round_trip_json(value: Any) -> Any:
+    """Value as a JSON column reads it back (tuples become lists, keys strings)"""
+    return json.loads(_COMPACT_JSON.encode(value))
+
+
+# Values are hashed as their columns read them back, so an int confidence
+# hashes like the 1.0 that verify_chain and the cold-start tail see
+_COLUMN_COERCERS = {Float: float, Integer: int, JSON: _round_trip_json}
+_CHAIN_COERCERS = {
+    table_class: tuple(
+        _COLUMN_COERCERS.get(type(table_class.__table__.columns[name].type))
+        for name in fields
+    )
+    for table_class, fields in _CHAIN_FIELDS.items()
+}
+
+# Statements built once and executed with bound parameters, so every log
+# call hits SQLAlchemy's compiled cache instead of rebuilding the statement
+_INSERTS = {table_class: insert(table_class.__table__) for table_class in _CHAIN_FIELDS}
+_INPUT_ID_BY_HASH = select(Input.id).where(Input.content_hash == bindparam("content_hash"))
+
+
+def _chain_record(table_class, values: List[Any]) -> Dict[str, Any]:
+    """Map a table's chain field values, in _CHAIN_FIELDS order, to their hashed form"""
+    return {
+        name: value if value is None or coerce is None else coerce(value)
+        for name, coerce, value in zip(
+            _CHAIN_FIELDS[table_class], _CHAIN_COERCERS[table_class], values
+        )
+    }
+
+
 class ExplainabilityVault:
     """
     Manages immutable storage of all reasoning steps.
     Implements hash chaining for tamper detection.
     """
     
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self, database_url: Optional[str] = None, max_pending_writes: int = 4096):
         """
         Initialize Explainability Vault
         
         Args:
             database_url: SQLAlchemy database URL
+            max_pending_writes: Write-behind queue depth before submitters block
         """
         settings = get_settings()
         self.database_url = database_url or settings.database_url
         
         # Create engine and session
-        self.engine = create_engine(self.database_url, echo=False)
+        url = make_url(self.database_url)
+        is_sqlite = url.get_backend_name() == "sqlite"
+        in_memory = is_sqlite and url.database in (None, "", ":memory:")
+        engine_options: Dict[str, Any] = {"json_serializer": _COMPACT_JSON.encode}
+        if in_memory:
+            # One shared connection, so every thread sees the same in-memory
+            # database (the default pool gives each thread its own, empty one)
+            engine_options.update(
+                poolclass=StaticPool,
+                connect_args={"check_same_thread": False}
+            )
+        self.engine = create_engine(self.database_url, echo=False, **engine_options)
+        if is_sqlite:
+            event.listen(self.engine, "connect", _apply_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
+        # create_all skips tables that already exist, so add indexes
+        # introduced after a vault file was first created
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         
         self.SessionLocal = sessionmaker(bind=self.engine)
         
+        # Per-thread session of the active transaction() block, if any
+        self._local = threading.local()
+        
+        # Chain hash of the newest committed record per table; this process
+        # is the only writer, so the tail is read from the database once
+        self._last_hash: Dict[type, Optional[str]] = {}
+        self._hash_lock = threading.Lock()
+        # Held by the writing thread from reading a chain tail through commit,
+        # so concurrent writers cannot both chain from the same record
+        self._chain_lock = threading.Lock()
+        
+        # Write-behind: one background writer, created on first use
+        self.max_pending_writes = max_pending_writes
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._writer_lock = threading.Lock()
+        self._write_slots = threading.BoundedSemaphore(max_pending_writes)
+        self._pending_writes: "set[Future]" = set()
+        
+        # Periodic WAL checkpoint / ANALYZE for file-backed SQLite vaults
+        self._last_analyze: Optional[float] = None
+        self._maintenance_stop = threading.Event()
+        interval = settings.vault_maintenance_interval
+        if is_sqlite and not in_memory and interval > 0:
+            threading.Thread(
+                target=self._maintenance_loop,
+                args=(interval,),
+                name="vault-maintenance",
+                daemon=True
+            ).start()
+        
         logger.info(f"Explainability Vault initialized: {self.database_url}")
         audit_logger.info("Vault initialized")
     
+    def maintenance(self) -> Dict[str, Any]:
+        """
+        Keep a WAL-mode SQLite vault compact and its query plans current
+        
+        Runs a passive checkpoint; if the WAL still holds at least
+        _WAL_TRUNCATE_PAGES pages it is checkpointed and truncated.
+        ANALYZE runs on the first call and then at most once a day.
+        
+        Returns:
+            Dict with WAL pages before checkpointing and the actions taken
+        """
+        with self.engine.connect() as conn:
+            _, wal_pages, _ = conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()
+            
+            truncated = wal_pages >= _WAL_TRUNCATE_PAGES
+            if truncated:
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            
+            now = time.monotonic()
+            analyzed = (
+                self._last_analyze is None
+                or now - self._last_analyze >= _ANALYZE_INTERVAL_SECONDS
+            )
+            if analyzed:
+                conn.exec_driver_sql("ANALYZE")
+                conn.commit()
+                self._last_analyze = now
+        
+        logger.debug(
+            f"Vault maintenance: wal_pages={wal_pages}, "
+            f"truncated={truncated}, analyzed={analyzed}"
+        )
+        return {"wal_pages": wal_pages, "truncated": truncated, "analyzed": analyzed}
+    
+    def _maintenance_loop(self, interval: float) -> None:
+        """Run maintenance() every interval seconds until close()"""
+        while not self._maintenance_stop.wait(interval):
+            try:
+                self.maintenance()
+            except Exception as e:
+                logger.error(f"Vault maintenance failed: {e}")
+    
+    def close(self) -> None:
+        """Stop background maintenance, finish queued writes and release connections"""
+        self._maintenance_stop.set()
+        self.flush()
+        self.engine.dispose()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Group vault writes into a single commit
+        
+        All log_* calls made on this thread inside the block share one
+        session and are committed together (or rolled back together on
+        error). Nested blocks join the outermost transaction.
+        """
+        if getattr(self._local, "session", None) is not None:
+            yield
+            return
+        
+        session = self.SessionLocal()
+        self._local.session = session
+        self._local.pending_hashes = {}
+        try:
+            yield
+            session.commit()
+            self._publish_hashes()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Vault transaction rolled back: {e}")
+            raise
+        finally:
+            self._local.session = None
+            self._local.pending_hashes = None
+            session.close()
+            self._release_chain()
+    
+    @contextmanager
+    def _session_scope(self) -> Iterator[Session]:
+        """Yield the active transaction session, or a short-lived committing one"""
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            yield session
+            return
+        
+        session = self.SessionLocal()
+        self._local.pending_hashes = {}
+        try:
+            yield session
+            session.commit()
+            self._publish_hashes()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self._local.pending_hashes = None
+            session.close()
+            self._release_chain()
+    
     def _compute_hash(self, data: Dict[str, Any]) -> str:
         """Compute SHA-256 hash of data"""
-        data_str = json.dumps(data, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        return hashlib.sha256(_CANONICAL_JSON.encode(data).encode()).hexdigest()
+    
+    def _chain_hash(self, table_class, values: Dict[str, Any]) -> str:
+        """Compute chain hash of a record from its column values"""
+        return self._compute_hash(_chain_record(
+            table_class, [values.get(name) for name in _CHAIN_FIELDS[table_class]]
+        ))
     
     def _get_last_hash(self, session: Session, table_class) -> Optional[str]:
-        """Get hash of most recent record in table"""
+        """Get hash of most recent record in table (cold-start path)"""
         last_record = session.query(table_class).order_by(
             table_class.id.desc()
         ).first()
-        return last_record.prev_hash if last_record else None
+        if last_record is None:
+            return None
+        return self._chain_hash(table_class, {
+            name: getattr(last_record, name) for name in _CHAIN_FIELDS[table_class]
+        })
+    
+    def _chain_tail(self, session: Session, table_class) -> Optional[str]:
+        """
+        Hash the next record in table_class should chain from
+        
+        Takes the vault's chain lock for the rest of the current session
+        scope; it is released after commit (or rollback) publishes the tails.
+        """
+        if not getattr(self._local, "holds_chain_lock", False):
+            self._chain_lock.acquire()
+            self._local.holds_chain_lock = True
+        
+        pending = self._local.pending_hashes
+        if table_class in pending:
+            return pending[table_class]
+        
+        with self._hash_lock:
+            if table_class in self._last_hash:
+                return self._last_hash[table_class]
+        
+        last_hash = self._get_last_hash(session, table_class)
+        with self._hash_lock:
+            return self._last_hash.setdefault(table_class, last_hash)
+    
+    def _release_chain(self) -> None:
+        """Release the chain lock if this thread's session scope took it"""
+        if getattr(self._local, "holds_chain_lock", False):
+            self._local.holds_chain_lock = False
+            self._chain_lock.release()
+    
+    def _advance_chain(self, table_class, values: Dict[str, Any]) -> None:
+        """Record values as the new (uncommitted) tail of table_class"""
+        self._local.pending_hashes[table_class] = self._chain_hash(table_class, values)
+    
+    def _publish_hashes(self) -> None:
+        """Promote this thread's tails to the shared cache after commit"""
+        with self._hash_lock:
+            self._last_hash.update(self._local.pending_hashes)
+    
+    def _insert_row(self, session: Session, table_class, values: Dict[str, Any]) -> int:
+        """Insert one row with a cached Core INSERT (no ORM unit of work) and return its ID"""
+        result = session.execute(_INSERTS[table_class], values)
+        return result.inserted_primary_key[0]
+    
+    def _chain_rows(self, session: Session, table_class, rows: List[Dict[str, Any]]) -> None:
+        """Set prev_hash on rows so they chain in insertion order"""
+        prev_hash = self._chain_tail(session, table_class)
+        for row in rows:
+            row["prev_hash"] = prev_hash
+            prev_hash = self._chain_hash(table_class, row)
+        self._local.pending_hashes[table_class] = prev_hash
     
     def log_input(
         self,
@@ -135,6 +433,9 @@ class ExplainabilityVault:
         """
         Log an input to the vault
         
+        Inputs are unique by content: logging identical content again
+        returns the existing record's ID instead of inserting.
+        
         Args:
             source: Source of the input (e.g., "user", "file", "api")
             content: Input content
@@ -143,27 +444,33 @@ class ExplainabilityVault:
         Returns:
             Input ID
         """
-        session = self.SessionLocal()
         try:
-            # Compute content hash
-            content_hash = self._compute_hash({"content": content})
-            
-            # Get previous hash for chaining
-            prev_hash = self._get_last_hash(session, Input)
-            
-            # Create input record
-            input_record = Input(
-                source=source,
-                content=content,
-                content_hash=content_hash,
-                meta_data=metadata or {},
-                prev_hash=prev_hash
-            )
-            
-            session.add(input_record)
-            session.commit()
-            
-            input_id = input_record.id
+            with self._session_scope() as session:
+                # Compute content hash
+                content_hash = self._compute_hash({"content": content})
+                
+                # Get previous hash for chaining; this takes the chain lock
+                # first, so a concurrent duplicate waits and then finds this row
+                prev_hash = self._chain_tail(session, Input)
+                
+                # Repeated content (unique index probe) reuses the existing record
+                existing_id = session.execute(
+                    _INPUT_ID_BY_HASH, {"content_hash": content_hash}
+                ).scalar()
+                if existing_id is not None:
+                    logger.debug(f"Input {existing_id} already logged with hash: {content_hash[:16]}...")
+                    return existing_id
+                
+                # Create input record
+                values = {
+                    "source": source,
+                    "content": content,
+                    "content_hash": content_hash,
+                    "meta_data": metadata or {},
+                    "prev_hash": prev_hash
+                }
+                input_id = self._insert_row(session, Input, values)
+                self._advance_chain(Input, values)
             
             audit_logger.info(f"Input logged: ID={input_id}, source={source}")
             logger.debug(f"Input {input_id} logged with hash: {content_hash[:16]}...")
@@ -171,11 +478,8 @@ class ExplainabilityVault:
             return input_id
             
         except Exception as e:
-            session.rollback()
             logger.error(f"Failed to log input: {e}")
             raise
-        finally:
-            session.close()
     
     def log_agent_execution(
         self,
@@ -200,24 +504,19 @@ class ExplainabilityVault:
         Returns:
             Execution ID
         """
-        session = self.SessionLocal()
         try:
-            prev_hash = self._get_last_hash(session, AgentExecution)
-            
-            execution = AgentExecution(
-                input_id=input_id,
-                agent_id=agent_id,
-                agent_input=agent_input,
-                agent_output=agent_output,
-                tool_calls=tool_calls or [],
-                duration_ms=duration_ms,
-                prev_hash=prev_hash
-            )
-            
-            session.add(execution)
-            session.commit()
-            
-            execution_id = execution.id
+            with self._session_scope() as session:
+                values = {
+                    "input_id": input_id,
+                    "agent_id": agent_id,
+                    "agent_input": agent_input,
+                    "agent_output": agent_output,
+                    "tool_calls": tool_calls or [],
+                    "duration_ms": duration_ms,
+                    "prev_hash": self._chain_tail(session, AgentExecution)
+                }
+                execution_id = self._insert_row(session, AgentExecution, values)
+                self._advance_chain(AgentExecution, values)
             
             audit_logger.info(
                 f"Agent execution logged: ID={execution_id}, agent={agent_id}"
@@ -226,11 +525,8 @@ class ExplainabilityVault:
             return execution_id
             
         except Exception as e:
-            session.rollback()
             logger.error(f"Failed to log agent execution: {e}")
             raise
-        finally:
-            session.close()
     
     def log_causal_step(
         self,
@@ -255,31 +551,68 @@ class ExplainabilityVault:
         Returns:
             Step ID
         """
-        session = self.SessionLocal()
         try:
-            prev_hash = self._get_last_hash(session, CausalStep)
-            
-            step = CausalStep(
-                execution_id=execution_id,
-                premise=premise,
-                conclusion=conclusion,
-                confidence=confidence,
-                evidence_refs=evidence_refs or [],
-                reasoning_type=reasoning_type,
-                prev_hash=prev_hash
-            )
+            with self._session_scope() as session:
+                values = {
+                    "execution_id": execution_id,
+                    "premise": premise,
+                    "conclusion": conclusion,
+                    "confidence": confidence,
+                    "evidence_refs": evidence_refs or [],
+                    "reasoning_type": reasoning_type,
+                    "prev_hash": self._chain_tail(session, CausalStep)
+                }
+                step_id = self._insert_row(session, CausalStep, values)
+                self._advance_chain(CausalStep, values)
+                
+                return step_id
             
-            session.add(step)
-            session.commit()
+        except Exception as e:
+            logger.error(f"Failed to log causal step: {e}")
+            raise
+    
+    def log_causal_steps_bulk(
+        self,
+        execution_id: int,
+        steps: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Log many causal reasoning steps with a single executemany INSERT
+        
+        Args:
+            execution_id: Related execution ID
+            steps: Step dicts with premise, conclusion, confidence and
+                optional evidence_refs / reasoning_type (as in log_causal_step)
+            
+        Returns:
+            Number of steps written
+        """
+        if not steps:
+            return 0
+        
+        try:
+            with self._session_scope() as session:
+                rows = [
+                    {
+                        "execution_id": execution_id,
+                        "premise": step["premise"],
+                        "conclusion": step["conclusion"],
+                        "confidence": step["confidence"],
+                        "evidence_refs": step.get("evidence_refs") or [],
+                        "reasoning_type": step.get("reasoning_type", "symbolic")
+                    }
+                    for step in steps
+                ]
+                self._chain_rows(session, CausalStep, rows)
+                session.execute(_INSERTS[CausalStep], rows)
             
-            return step.id
+            logger.debug(f"Logged {len(rows)} causal steps for execution {execution_id}")
+            
+            return len(rows)
             
         except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to log causal step: {e}")
+            logger.error(f"Failed to log causal steps: {e}")
             raise
-        finally:
-            session.close()
     
     def log_policy_check(
         self,
@@ -302,21 +635,18 @@ class ExplainabilityVault:
         Returns:
             Check ID
         """
-        session = self.SessionLocal()
         try:
-            prev_hash = self._get_last_hash(session, PolicyCheck)
-            
-            check = PolicyCheck(
-                execution_id=execution_id,
-                policy_name=policy_name,
-                result=result,
-                details=details or {},
-                violations=violations or [],
-                prev_hash=prev_hash
-            )
-            
-            session.add(check)
-            session.commit()
+            with self._session_scope() as session:
+                values = {
+                    "execution_id": execution_id,
+                    "policy_name": policy_name,
+                    "result": result,
+                    "details": details or {},
+                    "violations": violations or [],
+                    "prev_hash": self._chain_tail(session, PolicyCheck)
+                }
+                check_id = self._insert_row(session, PolicyCheck, values)
+                self._advance_chain(PolicyCheck, values)
             
             audit_logger.info(
                 f"Policy check logged: policy={policy_name}, result={result}"
@@ -328,14 +658,60 @@ class ExplainabilityVault:
                     f"POLICY VIOLATION: {policy_name} - {violations}"
                 )
             
-            return check.id
+            return check_id
             
         except Exception as e:
-            session.rollback()
             logger.error(f"Failed to log policy check: {e}")
             raise
-        finally:
-            session.close()
+    
+    def log_policy_checks_bulk(
+        self,
+        execution_id: int,
+        checks: List[Dict[str, Any]]
+    ) -> int:
+        """
+        Log many policy checks with a single executemany INSERT
+        
+        Args:
+            execution_id: Related execution ID
+            checks: Check dicts with policy_name, result and optional
+                details / violations (as in log_policy_check)
+            
+        Returns:
+            Number of checks written
+        """
+        if not checks:
+            return 0
+        
+        try:
+            with self._session_scope() as session:
+                rows = [
+                    {
+                        "execution_id": execution_id,
+                        "policy_name": check["policy_name"],
+                        "result": check["result"],
+                        "details": check.get("details") or {},
+                        "violations": check.get("violations") or []
+                    }
+                    for check in checks
+                ]
+                self._chain_rows(session, PolicyCheck, rows)
+                session.execute(_INSERTS[PolicyCheck], rows)
+            
+            for row in rows:
+                audit_logger.info(
+                    f"Policy check logged: policy={row['policy_name']}, result={row['result']}"
+                )
+                if row["result"] == "fail":
+                    audit_logger.warning(
+                        f"POLICY VIOLATION: {row['policy_name']} - {row['violations']}"
+                    )
+            
+            return len(rows)
+            
+        except Exception as e:
+            logger.error(f"Failed to log policy checks: {e}")
+            raise
     
     def log_output(
         self,
@@ -358,34 +734,175 @@ class ExplainabilityVault:
         Returns:
             Output ID
         """
-        session = self.SessionLocal()
         try:
-            prev_hash = self._get_last_hash(session, Output)
-            
-            output = Output(
-                execution_id=execution_id,
-                conclusion=conclusion,
-                confidence=confidence,
-                risk_flags=risk_flags or [],
-                recommendations=recommendations or [],
-                prev_hash=prev_hash
-            )
-            
-            session.add(output)
-            session.commit()
+            with self._session_scope() as session:
+                values = {
+                    "execution_id": execution_id,
+                    "conclusion": conclusion,
+                    "confidence": confidence,
+                    "risk_flags": risk_flags or [],
+                    "recommendations": recommendations or [],
+                    "prev_hash": self._chain_tail(session, Output)
+                }
+                output_id = self._insert_row(session, Output, values)
+                self._advance_chain(Output, values)
             
             audit_logger.info(
-                f"Output logged: ID={output.id}, confidence={confidence:.2f}"
+                f"Output logged: ID={output_id}, confidence={confidence:.2f}"
             )
             
-            return output.id
+            return output_id
             
         except Exception as e:
-            session.rollback()
             logger.error(f"Failed to log output: {e}")
             raise
-        finally:
-            session.close()
+    
+    def log_trail(
+        self,
+        input_dict: Dict[str, Any],
+        execution_dict: Dict[str, Any],
+        causal_steps: List[Dict[str, Any]],
+        policy_checks: List[Dict[str, Any]],
+        output_dict: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """
+        Log a complete reasoning trail in one transaction
+        
+        Causal steps and policy checks are written with one executemany
+        INSERT each, and the whole trail is committed once.
+        
+        Args:
+            input_dict: Keyword arguments for log_input
+            execution_dict: Keyword arguments for log_agent_execution
+                (without input_id)
+            causal_steps: Step dicts for log_causal_steps_bulk
+            policy_checks: Check dicts for log_policy_checks_bulk
+            output_dict: Keyword arguments for log_output (without execution_id)
+            
+        Returns:
+            Dictionary with input_id, execution_id and output_id
+        """
+        with self.transaction():
+            input_id = self.log_input(**input_dict)
+            execution_id = self.log_agent_execution(input_id=input_id, **execution_dict)
+            self.log_causal_steps_bulk(execution_id, causal_steps)
+            self.log_policy_checks_bulk(execution_id, policy_checks)
+            output_id = self.log_output(execution_id=execution_id, **output_dict)
+        
+        return {
+            "input_id": input_id,
+            "execution_id": execution_id,
+            "output_id": output_id
+        }
+    
+    def verify_chain(self, table_class, batch_size: int = 10000) -> Dict[str, Any]:
+        """
+        Recompute the hash chain of a table to detect tampering
+        
+        Rows are streamed as plain column tuples in batches, so memory stays
+        flat and no ORM objects are built during long audit scans.
+        
+        Args:
+            table_class: Vault model to verify (e.g. CausalStep)
+            batch_size: Rows fetched per database round-trip
+            
+        Returns:
+            Dict with records checked, validity and the id of the first
+            record whose prev_hash does not match its predecessor
+        """
+        fields = _CHAIN_FIELDS[table_class]
+        prev_hash_index = fields.index("prev_hash")
+        encode = _CANONICAL_JSON.encode
+        sha256 = hashlib.sha256
+        
+        expected = None
+        checked = 0
+        first_invalid_id = None
+        
+        with self.SessionLocal() as session:
+            rows = session.execute(
+                select(table_class.id, *(getattr(table_class, name) for name in fields))
+                .order_by(table_class.id)
+                .execution_options(yield_per=batch_size)
+            )
+            for row_id, *values in rows:
+                if values[prev_hash_index] != expected:
+                    first_invalid_id = row_id
+                    break
+                expected = sha256(encode(_chain_record(table_class, values)).encode()).hexdigest()
+                checked += 1
+        
+        if first_invalid_id is not None:
+            audit_logger.warning(
+                f"HASH CHAIN BROKEN: {table_class.__tablename__} at ID={first_invalid_id}"
+            )
+        
+        return {
+            "table": table_class.__tablename__,
+            "records": checked,
+            "valid": first_invalid_id is None,
+            "first_invalid_id": first_invalid_id
+        }
+    
+    def write_behind(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Run a vault write on the background writer thread
+        
+        The caller only pays for the enqueue; the returned future resolves
+        to fn's result (e.g. record IDs) once the write has committed. When
+        max_pending_writes are queued, further submitters block until the
+        writer catches up.
+        
+        Args:
+            fn: Vault write, e.g. self.log_trail
+            *args, **kwargs: Arguments for fn
+            
+        Returns:
+            Future of fn's result
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="vault-writer"
+                )
+        
+        self._write_slots.acquire()
+        future = self._writer.submit(fn, *args, **kwargs)
+        with self._writer_lock:
+            self._pending_writes.add(future)
+            depth = len(self._pending_writes)
+        future.add_done_callback(self._write_done)
+        
+        if depth == int(self.max_pending_writes * 0.8):
+            audit_logger.warning(
+                f"Vault write-behind queue at {depth}/{self.max_pending_writes}"
+            )
+        
+        return future
+    
+    def _write_done(self, future: Future) -> None:
+        """Release the queue slot of a finished write"""
+        with self._writer_lock:
+            self._pending_writes.discard(future)
+        self._write_slots.release()
+        
+        if future.exception() is not None:
+            logger.error(f"Write-behind vault write failed: {future.exception()}")
+    
+    def log_trail_async(self, *args, **kwargs) -> Future:
+        """log_trail() on the background writer; resolves to the same IDs"""
+        return self.write_behind(self.log_trail, *args, **kwargs)
+    
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until all queued write-behind writes have finished
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        """
+        with self._writer_lock:
+            pending = list(self._pending_writes)
+        wait(pending, timeout=timeout)
     
     def get_reasoning_trail(self, execution_id: int) -> Dict[str, Any]:
         """
@@ -397,70 +914,73 @@ class ExplainabilityVault:
         Returns:
             Complete reasoning trail with all steps
         """
-        session = self.SessionLocal()
-        try:
-            # Get execution
-            execution = session.query(AgentExecution).filter_by(
-                id=execution_id
-            ).first()
+        with self.SessionLocal() as session:
+            # Execution and its output in one round-trip; plain column
+            # rows skip ORM object construction for this read-only path
+            head = session.execute(
+                select(
+                    AgentExecution.agent_id,
+                    AgentExecution.agent_input,
+                    AgentExecution.agent_output,
+                    AgentExecution.tool_calls,
+                    AgentExecution.duration_ms,
+                    Output.id.label("output_id"),
+                    Output.conclusion,
+                    Output.confidence,
+                    Output.risk_flags,
+                    Output.recommendations
+                )
+                .outerjoin(Output, Output.execution_id == AgentExecution.id)
+                .where(AgentExecution.id == execution_id)
+                .order_by(Output.id)
+                .limit(1)
+            ).mappings().first()
             
-            if not execution:
+            if not head:
                 raise ValueError(f"Execution {execution_id} not found")
             
-            # Get causal steps
-            causal_steps = session.query(CausalStep).filter_by(
-                execution_id=execution_id
-            ).all()
-            
-            # Get policy checks
-            policy_checks = session.query(PolicyCheck).filter_by(
-                execution_id=execution_id
-            ).all()
-            
-            # Get output
-            output = session.query(Output).filter_by(
-                execution_id=execution_id
-            ).first()
+            causal_steps = session.execute(
+                select(
+                    CausalStep.premise,
+                    CausalStep.conclusion,
+                    CausalStep.confidence,
+                    CausalStep.evidence_refs,
+                    CausalStep.reasoning_type
+                )
+                .where(CausalStep.execution_id == execution_id)
+                .order_by(CausalStep.id)
+            ).mappings().all()
+            
+            policy_checks = session.execute(
+                select(
+                    PolicyCheck.policy_name,
+                    PolicyCheck.result,
+                    PolicyCheck.details,
+                    PolicyCheck.violations
+                )
+                .where(PolicyCheck.execution_id == execution_id)
+                .order_by(PolicyCheck.id)
+            ).mappings().all()
             
             # Format trail
             trail = {
                 "execution_id": execution_id,
-                "agent_id": execution.agent_id,
-                "agent_input": execution.agent_input,
-                "agent_output": execution.agent_output,
-                "tool_calls": execution.tool_calls,
-                "duration_ms": execution.duration_ms,
-                "causal_steps": [
-                    {
-                        "premise": step.premise,
-                        "conclusion": step.conclusion,
-                        "confidence": step.confidence,
-                        "evidence_refs": step.evidence_refs,
-                        "reasoning_type": step.reasoning_type
-                    }
-                    for step in causal_steps
-                ],
-                "policy_checks": [
-                    {
-                        "policy_name": check.policy_name,
-                        "result": check.result,
-                        "details": check.details,
-                        "violations": check.violations
-                    }
-                    for check in policy_checks
-                ],
+                "agent_id": head["agent_id"],
+                "agent_input": head["agent_input"],
+                "agent_output": head["agent_output"],
+                "tool_calls": head["tool_calls"],
+                "duration_ms": head["duration_ms"],
+                "causal_steps": [dict(step) for step in causal_steps],
+                "policy_checks": [dict(check) for check in policy_checks],
                 "output": {
-                    "conclusion": output.conclusion if output else None,
-                    "confidence": output.confidence if output else None,
-                    "risk_flags": output.risk_flags if output else [],
-                    "recommendations": output.recommendations if output else []
-                } if output else None
+                    "conclusion": head["conclusion"],
+                    "confidence": head["confidence"],
+                    "risk_flags": head["risk_flags"],
+                    "recommendations": head["recommendations"]
+                } if head["output_id"] is not None else None
             }
             
             return trail
-            
-        finally:
-            session.close()
 
 
 # Singleton instance
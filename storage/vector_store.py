@@ -3,16 +3,102 @@ Vector Store - Pinecone Integration
 Optimized for free tier (100k vectors, 1 index)
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pinecone import Pinecone, ServerlessSpec
-from sentence_transformers import SentenceTransformer
+import copy
 import hashlib
 import json
+import re
+import threading
+import time
+import numpy as np
+from core.cache import LRUCache
 from core.config import get_settings
+from storage.embedding_cache import EmbeddingCache
 from core.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 logger = get_logger("vector_store")
 
+# Resolved on first model load: importing sentence-transformers pulls in
+# torch, which takes seconds and is not needed for stats or deletes
+SentenceTransformer = None
+
+# Provider component of embedding cache keys (models run locally; vectors
+# are L2-normalized, so entries from before normalization are never reused)
+_EMBEDDING_PROVIDER = "sentence-transformers/normalized"
+
+# Smallest encode call worth fanning out to the multi-process pool
+_MULTI_PROCESS_MIN_TEXTS = 64
+
+# How long a server-side vector count is trusted before describe_index_stats
+# is called again (ingests add to it locally in between)
+_VECTOR_COUNT_TTL_SECONDS = 60
+
+# Split points for token-aware chunking, coarsest first
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _sentence_transformer_class() -> type:
+    """Import SentenceTransformer on first use"""
+    global SentenceTransformer
+    if SentenceTransformer is None:
+        from sentence_transformers import SentenceTransformer
+    return SentenceTransformer
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether a Pinecone error is an HTTP 429 (too many requests)"""
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    return status == 429
+
+
+class _AdaptiveConcurrency:
+    """
+    AIMD cap on in-flight requests: grows by one after a window of
+    successes and halves whenever the server throttles.
+    """
+    
+    def __init__(self, limit: int):
+        self.max_limit = limit
+        self.limit = limit
+        self._active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+    
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one request slot, waiting while the cap is reached"""
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+    
+    def success(self) -> None:
+        with self._cond:
+            self._successes += 1
+            if self._successes >= self.limit and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+    
+    def throttled(self) -> None:
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
 
 class VectorStore:
     """
@@ -25,7 +111,10 @@ class VectorStore:
         api_key: Optional[str] = None,
         environment: Optional[str] = None,
         index_name: Optional[str] = None,
-        embedding_model: Optional[str] = None
+        embedding_model: Optional[str] = None,
+        embedding_cache_path: Optional[str] = None,
+        embedding_backend: Optional[str] = None,
+        use_grpc: Optional[bool] = None
     ):
         """
         Initialize Vector Store
@@ -35,32 +124,106 @@ class VectorStore:
             environment: Pinecone environment
             index_name: Name of the Pinecone index
             embedding_model: Sentence transformer model name
+            embedding_cache_path: SQLite file caching embeddings by content hash
+                (defaults to settings.embedding_cache_path; None disables)
+            embedding_backend: Inference backend ("torch", "onnx" or "openvino";
+                defaults to settings.embedding_backend)
+            use_grpc: Use Pinecone's gRPC data plane for upserts and queries
+                (defaults to settings.pinecone_use_grpc)
         """
         settings = get_settings()
         
         self.api_key = api_key or settings.pinecone_api_key
         self.environment = environment or settings.pinecone_environment
         self.index_name = index_name or settings.pinecone_index_name
+        self.index_metric = settings.pinecone_metric
         self.embedding_model_name = embedding_model or settings.embedding_model
+        self.embedding_backend = embedding_backend or settings.embedding_backend
         
-        # Initialize embedding model first (needed for dimension)
-        logger.info(f"Loading embedding model: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
-        self.embedding_dim = self.embedding_model.get_sentence_embedding_dimension()
+        # The model is loaded on first use (see embedding_model), so callers
+        # that only need stats or deletes never pay the load cost
+        self.embedding_model_file = settings.embedding_model_file
+        self.embedding_provider = settings.embedding_provider
+        self._embedding_model: Optional["SentenceTransformer"] = None
+        self._embedding_dim: Optional[int] = settings.embedding_dim
+        self._model_lock = threading.Lock()
+        self.embedding_workers = settings.embedding_workers
+        self._encode_pool: Optional[Dict[str, Any]] = None
+        
+        embedding_cache_path = embedding_cache_path or settings.embedding_cache_path
+        self.embedding_cache = (
+            EmbeddingCache(embedding_cache_path) if embedding_cache_path else None
+        )
         
         # Initialize Pinecone client (new API)
-        self.pc = Pinecone(api_key=self.api_key)
+        self.use_grpc = settings.pinecone_use_grpc if use_grpc is None else use_grpc
+        if self.use_grpc:
+            # Persistent HTTP/2 channel with protobuf payloads; imported lazily
+            # because it needs the optional pinecone[grpc] extra
+            from pinecone.grpc import PineconeGRPC
+            self.pc = PineconeGRPC(api_key=self.api_key)
+        else:
+            self.pc = Pinecone(api_key=self.api_key)
         
         # Get or create index
         self.index = self._get_or_create_index()
         
         # Track vector count (important for free tier limit)
         self.max_vectors = settings.max_vectors
+        self.max_retries = settings.max_retries
+        self.chunking_strategy = settings.chunking_strategy
+        self.chunk_max_tokens = settings.chunk_max_tokens
+        self.retrieval_cache_ttl = settings.retrieval_cache_ttl
+        # (query, top_k, namespace, filter, include_metadata) -> (created_at, results)
+        self._retrieval_cache = LRUCache(max_size=settings.retrieval_cache_size)
         self._warn_threshold = int(self.max_vectors * 0.9)  # Warn at 90%
+        self._vector_count = 0
+        self._vector_count_at: Optional[float] = None
+        self._count_lock = threading.Lock()
         
         logger.info(
             f"Vector Store initialized: {self.index_name}, "
-            f"dimension: {self.embedding_dim}"
+            f"transport: {'grpc' if self.use_grpc else 'rest'}"
+        )
+    
+    @property
+    def embedding_model(self) -> "SentenceTransformer":
+        """Sentence transformer, loaded on first access"""
+        if self._embedding_model is None:
+            with self._model_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = self._load_embedding_model()
+        return self._embedding_model
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Embedding dimension (settings.embedding_dim avoids loading the model)"""
+        if self._embedding_dim is None:
+            self._embedding_dim = self.embedding_model.get_sentence_embedding_dimension()
+        return self._embedding_dim
+    
+    def _load_embedding_model(self) -> "SentenceTransformer":
+        """Load the sentence transformer on the configured backend"""
+        model_class = _sentence_transformer_class()
+        logger.info(
+            f"Loading embedding model: {self.embedding_model_name} "
+            f"({self.embedding_backend} backend)"
+        )
+        if self.embedding_backend == "torch":
+            return model_class(self.embedding_model_name)
+        
+        # ONNX/OpenVINO need sentence-transformers>=3.2 with the
+        # matching extra installed (e.g. sentence-transformers[onnx])
+        model_kwargs = {}
+        if self.embedding_model_file:
+            # Pre-exported optimized/quantized graph, e.g. onnx/model_O4.onnx
+            model_kwargs["file_name"] = self.embedding_model_file
+        if self.embedding_provider:
+            model_kwargs["provider"] = self.embedding_provider
+        return model_class(
+            self.embedding_model_name,
+            backend=self.embedding_backend,
+            **({"model_kwargs": model_kwargs} if model_kwargs else {})
         )
     
     def _get_or_create_index(self):
@@ -72,7 +235,9 @@ class VectorStore:
             self.pc.create_index(
                 name=self.index_name,
                 dimension=self.embedding_dim,
-                metric="cosine",
+                # Embeddings are unit-length, so dot product ranks like
+                # cosine without the server-side normalization
+                metric=self.index_metric,
                 spec=ServerlessSpec(
                     cloud="aws",
                     region="us-east-1"  # Free tier region
@@ -93,25 +258,89 @@ class VectorStore:
         Returns:
             Embedding vector
         """
-        embedding = self.embedding_model.encode(text, convert_to_tensor=False)
+        embedding = self.embedding_model.encode(
+            text,
+            convert_to_tensor=False,
+            normalize_embeddings=True
+        )
         return embedding.tolist()
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts (batched)
         
+        With an embedding cache configured, only texts whose content hash
+        is not cached yet are encoded.
+        
         Args:
             texts: List of texts to embed
             
         Returns:
             List of embedding vectors
         """
+        return self._embedding_matrix(texts).tolist()
+    
+    def _embedding_matrix(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as one float32 matrix (row per text), using the cache if set"""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.embedding_cache is None:
+            # Boilerplate repeats across documents; encode each text once
+            unique = list(dict.fromkeys(texts))
+            if len(unique) == len(texts):
+                return self._encode(texts)
+            rows = {text: i for i, text in enumerate(unique)}
+            return self._encode(unique)[[rows[text] for text in texts]]
+        
+        hashes = [EmbeddingCache.key(text) for text in texts]
+        cached = self.embedding_cache.get_many(
+            hashes, _EMBEDDING_PROVIDER, self.embedding_model_name
+        )
+        
+        misses = {h: text for h, text in zip(hashes, texts) if h not in cached}
+        if misses:
+            fresh = dict(zip(misses, self._encode(list(misses.values()))))
+            self.embedding_cache.put_many(
+                fresh.items(), _EMBEDDING_PROVIDER, self.embedding_model_name
+            )
+            cached.update(fresh)
+        
+        logger.debug(f"Embedding cache: {len(texts) - len(misses)}/{len(texts)} hits")
+        return np.stack([cached[h] for h in hashes])
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence transformer"""
+        kwargs = {}
+        if self.embedding_workers > 1 and len(texts) >= _MULTI_PROCESS_MIN_TEXTS:
+            # Tokenization holds the GIL, so large batches scale with worker
+            # processes rather than threads
+            kwargs["pool"] = self._get_encode_pool()
         embeddings = self.embedding_model.encode(
             texts,
             convert_to_tensor=False,
-            show_progress_bar=len(texts) > 10
+            normalize_embeddings=True,
+            show_progress_bar=len(texts) > 10,
+            **kwargs
         )
-        return [emb.tolist() for emb in embeddings]
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def _get_encode_pool(self) -> Dict[str, Any]:
+        """Start the multi-process encode pool on first use"""
+        model = self.embedding_model  # load outside the lock it takes
+        with self._model_lock:
+            if self._encode_pool is None:
+                logger.info(f"Starting {self.embedding_workers} embedding worker processes")
+                self._encode_pool = model.start_multi_process_pool(
+                    target_devices=["cpu"] * self.embedding_workers
+                )
+            return self._encode_pool
+    
+    def close(self) -> None:
+        """Stop embedding worker processes, if any were started"""
+        with self._model_lock:
+            if self._encode_pool is not None:
+                self._embedding_model.stop_multi_process_pool(self._encode_pool)
+                self._encode_pool = None
     
     def chunk_document(
         self,
@@ -127,7 +356,8 @@ class VectorStore:
         Args:
             text: Document text
             chunk_size: Target size in characters (approximate)
-            chunk_overlap: Overlap between chunks
+            chunk_overlap: Minimum characters carried into the next chunk
+                (whole trailing sentences; 0 disables overlap)
             medical_keywords: Medical terms to preserve in chunking
             
         Returns:
@@ -158,10 +388,18 @@ class VectorStore:
                 })
                 chunk_id += 1
                 
-                # Start new chunk with overlap
-                overlap_sentences = current_chunk[-2:] if len(current_chunk) >= 2 else current_chunk
+                # Start new chunk with the fewest trailing sentences that
+                # cover chunk_overlap characters
+                overlap_sentences = []
+                overlap_length = 0
+                for previous in reversed(current_chunk):
+                    if overlap_length >= chunk_overlap:
+                        break
+                    overlap_sentences.append(previous)
+                    overlap_length += len(previous)
+                overlap_sentences.reverse()
                 current_chunk = overlap_sentences + [sentence]
-                current_length = sum(len(s) for s in current_chunk)
+                current_length = overlap_length + sentence_length
             else:
                 current_chunk.append(sentence)
                 current_length += sentence_length
@@ -178,91 +416,282 @@ class VectorStore:
         logger.debug(f"Document chunked into {len(chunks)} chunks")
         return chunks
     
+    def _token_counts(self, texts: List[str]) -> List[int]:
+        """Token counts of texts under the embedding model's tokenizer"""
+        input_ids = self.embedding_model.tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in input_ids]
+    
+    def _split_to_fit(self, text: str, max_tokens: int) -> List[Tuple[str, int]]:
+        """Split text into (segment, token_count) pieces of at most max_tokens"""
+        pieces = []
+        for paragraph in _PARAGRAPH_RE.split(text):
+            sentences = [s for s in _SENTENCE_RE.split(paragraph.strip()) if s]
+            if not sentences:
+                continue
+            
+            for sentence, count in zip(sentences, self._token_counts(sentences)):
+                if count <= max_tokens:
+                    pieces.append((sentence, count))
+                    continue
+                
+                # Sentence alone is too long: pack its words
+                words = sentence.split()
+                window, window_tokens = [], 0
+                for word, word_tokens in zip(words, self._token_counts(words)):
+                    if window and window_tokens + word_tokens > max_tokens:
+                        pieces.append((" ".join(window), window_tokens))
+                        window, window_tokens = [], 0
+                    window.append(word)
+                    window_tokens += word_tokens
+                if window:
+                    pieces.append((" ".join(window), window_tokens))
+        return pieces
+    
+    def chunk_document_by_tokens(
+        self,
+        text: str,
+        max_tokens: int = 200
+    ) -> List[Dict[str, Any]]:
+        """
+        Chunk document by embedding-model tokens rather than characters.
+        
+        Text is split hierarchically (paragraph, then sentence, then
+        whitespace) until every piece fits max_tokens, and consecutive
+        pieces are then packed greedily up to max_tokens, so small
+        fragments are merged into their neighbours.
+        
+        Args:
+            text: Document text
+            max_tokens: Hard token limit per chunk
+            
+        Returns:
+            List of chunk dicts with text and metadata
+        """
+        chunks = []
+        current, current_tokens = [], 0
+        
+        def flush():
+            chunk_text = " ".join(current)
+            chunks.append({
+                "text": chunk_text,
+                "chunk_id": len(chunks),
+                "char_count": len(chunk_text),
+                "token_count": current_tokens
+            })
+        
+        for piece, piece_tokens in self._split_to_fit(text, max_tokens):
+            if current and current_tokens + piece_tokens > max_tokens:
+                flush()
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+        
+        if current:
+            flush()
+        
+        logger.debug(f"Document chunked into {len(chunks)} token-bounded chunks")
+        return chunks
+    
+    def _chunk(self, text: str) -> List[Dict[str, Any]]:
+        """Chunk text with the configured strategy"""
+        if self.chunking_strategy == "token":
+            return self.chunk_document_by_tokens(text, max_tokens=self.chunk_max_tokens)
+        return self.chunk_document(text)
+    
     def generate_doc_id(self, text: str, source: str = "") -> str:
         """Generate unique ID for document"""
+        # Opaque, stable vector ID (not a security boundary); changing the
+        # hash would orphan every vector already upserted under MD5 IDs
         content = f"{source}:{text}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
     
     def upsert_documents(
         self,
-        documents: List[Dict[str, Any]],
+        documents: Iterable[Dict[str, Any]],
         namespace: str = "default",
-        batch_size: int = 100
+        batch_size: int = 100,
+        max_workers: int = 8,
+        embed_batch_size: int = 1024
     ) -> Dict[str, Any]:
         """
         Ingest documents into vector store
         
+        Chunks are streamed in windows of embed_batch_size: each window is
+        embedded in one batched encode call and its upsert batches are sent
+        to Pinecone concurrently while the next window is encoded. At most
+        two windows are held in memory, however large the corpus.
+        Concurrency backs off (halves) on rate limiting and recovers
+        additively as batches succeed.
+        
         Args:
-            documents: List of dicts with 'text' and 'metadata' keys
+            documents: Dicts with 'text' and 'metadata' keys (any iterable)
             namespace: Pinecone namespace for organization
             batch_size: Batch size for upserts
+            max_workers: Maximum concurrent upsert requests
+            embed_batch_size: Chunks embedded per encode call
             
         Returns:
             Dict with ingestion stats
         """
-        total_docs = len(documents)
-        total_chunks = 0
-        
         # Check vector count
-        current_stats = self.index.describe_index_stats()
-        current_vectors = current_stats.get('total_vector_count', 0)
+        current_vectors = self._current_vector_count()
         
         if current_vectors >= self._warn_threshold:
             logger.warning(
                 f"Approaching free tier limit: {current_vectors}/{self.max_vectors} vectors"
             )
         
-        all_vectors = []
+        doc_count = [0]
         
-        for doc in documents:
-            text = doc.get("text", "")
-            metadata = doc.get("metadata", {})
-            source = metadata.get("source", "unknown")
-            
-            # Chunk document
-            chunks = self.chunk_document(text)
-            total_chunks += len(chunks)
-            
-            # Generate embeddings for chunks
-            chunk_texts = [chunk["text"] for chunk in chunks]
-            embeddings = self.generate_embeddings(chunk_texts)
-            
-            # Prepare vectors for upsert
-            for chunk, embedding in zip(chunks, embeddings):
-                vector_id = self.generate_doc_id(chunk["text"], source)
+        def chunk_stream() -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+            for doc in documents:
+                doc_count[0] += 1
+                metadata = doc.get("metadata", {})
+                for chunk in self._chunk(doc.get("text", "")):
+                    yield chunk, metadata
+        
+        chunks = chunk_stream()
+        total_chunks = 0
+        total_vectors = 0
+        limiter = _AdaptiveConcurrency(max_workers)
+        in_flight: List[Future] = []
+        
+        logger.info(f"Upserting vectors in batches of {batch_size}")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                window = list(islice(chunks, embed_batch_size))
+                if not window:
+                    break
+                if not total_chunks:
+                    # Cached retrievals may no longer reflect the index
+                    self._retrieval_cache.clear()
+                total_chunks += len(window)
                 
-                chunk_metadata = {
-                    **metadata,
-                    "chunk_id": chunk["chunk_id"],
-                    "chunk_text": chunk["text"],
-                    "char_count": chunk["char_count"]
+                # Same source and text means the same vector ID; upsert it once
+                # (the last occurrence wins, as it would in Pinecone)
+                by_id = {
+                    self.generate_doc_id(chunk["text"], metadata.get("source", "unknown")):
+                        (chunk, metadata)
+                    for chunk, metadata in window
                 }
+                ids = list(by_id)
+                window = list(by_id.values())
+                total_vectors += len(ids)
                 
-                all_vectors.append({
-                    "id": vector_id,
-                    "values": embedding,
-                    "metadata": chunk_metadata
-                })
-        
-        # Batch upsert
-        logger.info(f"Upserting {len(all_vectors)} vectors in batches of {batch_size}")
-        
-        for i in range(0, len(all_vectors), batch_size):
-            batch = all_vectors[i:i+batch_size]
-            self.index.upsert(vectors=batch, namespace=namespace)
+                # One float32 matrix plus parallel id/metadata lists; per-vector
+                # payload dicts are only built for the batch being sent
+                embeddings = self._embedding_matrix([chunk["text"] for chunk, _ in window])
+                metadatas = [
+                    {
+                        **metadata,
+                        "chunk_id": chunk["chunk_id"],
+                        "chunk_text": chunk["text"],
+                        "char_count": chunk["char_count"]
+                    }
+                    for chunk, metadata in window
+                ]
+                
+                previous = in_flight
+                in_flight = [
+                    pool.submit(
+                        self._upsert_rows, ids, embeddings, metadatas,
+                        start, start + batch_size, namespace, limiter
+                    )
+                    for start in range(0, len(window), batch_size)
+                ]
+                # Drain the previous window so only two stay in memory;
+                # result() surfaces the first failed upsert
+                for future in previous:
+                    future.result()
+            
+            for future in in_flight:
+                future.result()
         
         logger.info(
-            f"Ingestion complete: {total_docs} documents, "
-            f"{total_chunks} chunks, {len(all_vectors)} vectors"
+            f"Ingestion complete: {doc_count[0]} documents, "
+            f"{total_chunks} chunks, {total_vectors} vectors"
         )
         
         return {
-            "documents": total_docs,
+            "documents": doc_count[0],
             "chunks": total_chunks,
-            "vectors": len(all_vectors),
+            "vectors": total_vectors,
             "namespace": namespace
         }
     
+    def _upsert_rows(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+        start: int,
+        stop: int,
+        namespace: str,
+        limiter: _AdaptiveConcurrency
+    ) -> None:
+        """Build the payload for rows [start, stop) and upsert it"""
+        batch = [
+            {"id": vector_id, "values": values, "metadata": metadata}
+            for vector_id, values, metadata in zip(
+                ids[start:stop], embeddings[start:stop].tolist(), metadatas[start:stop]
+            )
+        ]
+        self._upsert_batch(batch, namespace, limiter)
+    
+    def _upsert_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        namespace: str,
+        limiter: _AdaptiveConcurrency
+    ) -> None:
+        """Upsert one batch, retrying with backoff when rate limited"""
+        for attempt in range(self.max_retries):
+            try:
+                with limiter.slot():
+                    self.index.upsert(vectors=batch, namespace=namespace)
+                limiter.success()
+                # Re-upserted IDs do not grow the index; the drift only
+                # affects the capacity warning and is corrected on refresh
+                with self._count_lock:
+                    self._vector_count += len(batch)
+                return
+            except Exception as e:
+                if not _is_rate_limited(e) or attempt == self.max_retries - 1:
+                    raise
+                limiter.throttled()
+                logger.warning(
+                    f"Upsert rate limited, concurrency now {limiter.limit}; "
+                    f"retrying in {2 ** attempt} seconds..."
+                )
+                time.sleep(2 ** attempt)
+    
+    @staticmethod
+    def _retrieval_key(
+        query: str,
+        top_k: int,
+        namespace: str,
+        filter_dict: Optional[Dict[str, Any]],
+        include_metadata: bool
+    ) -> Tuple:
+        """Hashable cache key for a retrieval request"""
+        filter_key = json.dumps(filter_dict, sort_keys=True, default=str)
+        return (query, top_k, namespace, filter_key, include_metadata)
+    
+    def _cached_results(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """Fresh cached results for key, or None"""
+        if self.retrieval_cache_ttl <= 0:
+            return None
+        entry = self._retrieval_cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.retrieval_cache_ttl:
+            return None
+        return copy.deepcopy(entry[1])
+    
+    def _cache_results(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        """Store results for key"""
+        if self.retrieval_cache_ttl > 0:
+            self._retrieval_cache.put(key, (time.monotonic(), copy.deepcopy(results)))
+    
     def retrieve(
         self,
         query: str,
@@ -284,6 +713,13 @@ class VectorStore:
         Returns:
             List of results with similarity scores and metadata
         """
+        # Repeated queries skip both the embedding and the Pinecone round-trip
+        cache_key = self._retrieval_key(query, top_k, namespace, filter_dict, include_metadata)
+        cached = self._cached_results(cache_key)
+        if cached is not None:
+            logger.debug(f"Retrieved {len(cached)} cached results for query")
+            return cached
+        
         # Generate query embedding
         query_embedding = self.generate_embedding(query)
         
@@ -296,7 +732,76 @@ class VectorStore:
             include_metadata=include_metadata
         )
         
-        # Format results
+        formatted_results = self._format_matches(results, include_metadata)
+        self._cache_results(cache_key, formatted_results)
+        
+        logger.debug(f"Retrieved {len(formatted_results)} results for query")
+        return formatted_results
+    
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        namespace: str = "default",
+        filter_dict: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True,
+        max_workers: int = 4
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve relevant documents for several queries at once
+        
+        Queries not in the retrieval cache are embedded in a single batched
+        encode call, then the Pinecone queries are issued concurrently.
+        
+        Args:
+            queries: Query texts
+            top_k: Number of results to return per query
+            namespace: Pinecone namespace to query
+            filter_dict: Metadata filters
+            include_metadata: Whether to include metadata in results
+            max_workers: Maximum concurrent Pinecone queries
+            
+        Returns:
+            One result list per query, in query order
+        """
+        if not queries:
+            return []
+        
+        cache_keys = [
+            self._retrieval_key(query, top_k, namespace, filter_dict, include_metadata)
+            for query in queries
+        ]
+        batch_results = [self._cached_results(key) for key in cache_keys]
+        missing = [i for i, results in enumerate(batch_results) if results is None]
+        if not missing:
+            return batch_results
+        
+        # Generate all missing query embeddings in one batch
+        query_embeddings = self.generate_embeddings([queries[i] for i in missing])
+        
+        def query_one(query_embedding: List[float]) -> List[Dict[str, Any]]:
+            results = self.index.query(
+                vector=query_embedding,
+                top_k=top_k,
+                namespace=namespace,
+                filter=filter_dict,
+                include_metadata=include_metadata
+            )
+            return self._format_matches(results, include_metadata)
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            fetched = list(pool.map(query_one, query_embeddings))
+        
+        for i, results in zip(missing, fetched):
+            self._cache_results(cache_keys[i], results)
+            batch_results[i] = results
+        
+        logger.debug(f"Retrieved results for {len(queries)} queries")
+        return batch_results
+    
+    @staticmethod
+    def _format_matches(results: Any, include_metadata: bool) -> List[Dict[str, Any]]:
+        """Format Pinecone query matches as result dicts"""
         formatted_results = []
         for match in results.get("matches", []):
             result = {
@@ -310,14 +815,32 @@ class VectorStore:
             
             formatted_results.append(result)
         
-        logger.debug(f"Retrieved {len(formatted_results)} results for query")
         return formatted_results
     
+    def _current_vector_count(self) -> int:
+        """Vector count, refreshed from Pinecone only when the cached value is stale"""
+        with self._count_lock:
+            fresh = (
+                self._vector_count_at is not None
+                and time.monotonic() - self._vector_count_at <= _VECTOR_COUNT_TTL_SECONDS
+            )
+            if fresh:
+                return self._vector_count
+        return self._refresh_vector_count(self.index.describe_index_stats())
+    
+    def _refresh_vector_count(self, stats: Any) -> int:
+        """Record the server-side vector count from describe_index_stats output"""
+        total_vectors = stats.get('total_vector_count', 0)
+        with self._count_lock:
+            self._vector_count = total_vectors
+            self._vector_count_at = time.monotonic()
+        return total_vectors
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get vector store statistics"""
         stats = self.index.describe_index_stats()
         
-        total_vectors = stats.get('total_vector_count', 0)
+        total_vectors = self._refresh_vector_count(stats)
         utilization = (total_vectors / self.max_vectors) * 100
         
         return {
@@ -325,7 +848,7 @@ class VectorStore:
             "max_vectors": self.max_vectors,
             "utilization_percent": utilization,
             "namespaces": stats.get('namespaces', {}),
-            "dimension": self.embedding_dim,
+            "dimension": stats.get('dimension', self._embedding_dim),
             "index_name": self.index_name
         }
     
@@ -333,6 +856,9 @@ class VectorStore:
         """Delete all vectors in a namespace (use with caution)"""
         logger.warning(f"Deleting all vectors in namespace: {namespace}")
         self.index.delete(delete_all=True, namespace=namespace)
+        self._retrieval_cache.clear()
+        with self._count_lock:
+            self._vector_count_at = None
 
 
 # Singleton instance
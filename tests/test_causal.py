@@ -2,11 +2,14 @@
 Tests for Phase 3 causal inference components
 """
 
+import json
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from causal.graph import CausalGraph, NodeType, EdgeType, CausalStrength
 from causal.confidence import get_confidence_scorer, ConfidenceFactors
 from causal.graph_builder import get_graph_builder
 from causal.trail_extractor import get_trail_extractor
+from causal.bias_detector import BiasDetector
 
 
 class TestCausalGraph:
@@ -27,6 +30,42 @@ class TestCausalGraph:
         assert node_data["confidence"] == 0.9
         assert node_data["node_type"] == NodeType.SYMPTOM.value
     
+    def test_bulk_node_creation(self):
+        """Test bulk insert matches single-node insert"""
+        graph = CausalGraph()
+        single_id = graph.add_symptom("fever", confidence=0.9)
+        
+        bulk = CausalGraph()
+        node_ids = bulk.add_nodes_bulk([
+            ("fever", NodeType.SYMPTOM, 0.9),
+            ("pneumonia", NodeType.DIAGNOSIS, 0.8)
+        ])
+        
+        assert node_ids[0] == single_id
+        assert bulk.get_node(single_id).keys() == graph.get_node(single_id).keys()
+        assert bulk.get_node(node_ids[1])["confidence"] == 0.8
+        assert bulk.find_nodes_by_type(NodeType.DIAGNOSIS) == [node_ids[1]]
+    
+    def test_bulk_edge_creation(self):
+        """Test bulk edge insert matches single-edge insert"""
+        graph = CausalGraph()
+        evidence_id = graph.add_evidence("chest x-ray shows infiltrate", confidence=0.7)
+        diagnosis_id = graph.add_diagnosis("pneumonia", confidence=0.8)
+        
+        bulk = CausalGraph.from_dict(graph.to_dict())
+        graph.add_edge(evidence_id, diagnosis_id, EdgeType.SUPPORTS, 0.7)
+        bulk.add_edges_bulk([
+            (evidence_id, diagnosis_id, EdgeType.SUPPORTS, 0.7, CausalStrength.MODERATE)
+        ])
+        
+        assert bulk.get_edge(evidence_id, diagnosis_id) == graph.get_edge(evidence_id, diagnosis_id)
+        assert bulk.get_stats()["num_edges"] == 1
+        
+        with pytest.raises(ValueError):
+            bulk.add_edges_bulk([
+                (evidence_id, "missing", EdgeType.SUPPORTS, 0.7, CausalStrength.MODERATE)
+            ])
+    
     def test_edge_creation(self):
         """Test creating edges between nodes"""
         graph = CausalGraph()
@@ -84,6 +123,91 @@ class TestCausalGraph:
         assert removed == 1
         assert not graph.graph.has_edge(s, d)
     
+    def test_array_snapshot(self):
+        """Test CSR snapshot mirrors the graph and refreshes after changes"""
+        graph = CausalGraph()
+        s = graph.add_symptom("fever", 0.9)
+        d = graph.add_diagnosis("pneumonia", 0.85)
+        t = graph.add_treatment("antibiotics", 0.8)
+        graph.add_edge(s, d, EdgeType.CAUSES, 0.8)
+        
+        arrays = graph.arrays()
+        assert arrays is graph.arrays()
+        assert arrays.indptr.tolist() == [0, 1, 1, 1]
+        assert arrays.node_ids[arrays.indices[0]] == d
+        
+        graph.add_edge(d, t, EdgeType.TREATED_BY, 0.1)
+        arrays = graph.arrays()
+        assert arrays.indptr.tolist() == [0, 1, 2, 2]
+        assert arrays.edge_confidence.tolist() == [0.8, 0.1]
+        
+        assert graph.prune_low_confidence(threshold=0.3) == 1
+        assert graph.arrays().indptr.tolist() == [0, 1, 1, 1]
+    
+    def test_reachability(self):
+        """Test reachability lookups and unreachable path queries"""
+        graph = CausalGraph()
+        s = graph.add_symptom("fever", 0.9)
+        d = graph.add_diagnosis("pneumonia", 0.85)
+        t = graph.add_treatment("antibiotics", 0.8)
+        graph.add_edge(s, d, EdgeType.CAUSES, 0.8)
+        graph.add_edge(d, t, EdgeType.TREATED_BY, 0.9)
+        
+        assert graph.reaches(s, t)
+        assert not graph.reaches(t, s)
+        assert not graph.reaches(s, "missing")
+        assert graph.get_all_paths(t, s) == []
+        assert graph.get_all_paths(s, t) == [[s, d, t]]
+        assert graph.get_all_paths("missing", t) == []
+        
+        # Second route: paths are yielded in DFS order
+        graph.add_edge(s, t, EdgeType.TREATED_BY, 0.5)
+        assert list(graph.iter_simple_paths(s, t)) == [[s, d, t], [s, t]]
+    
+    def test_count_paths(self):
+        """Test path counting matches enumeration"""
+        graph = CausalGraph()
+        s = graph.add_symptom("fever", 0.9)
+        d1 = graph.add_diagnosis("pneumonia", 0.85)
+        d2 = graph.add_diagnosis("bronchitis", 0.6)
+        o = graph.add_outcome("recovery", 0.7)
+        for source, target in [(s, d1), (s, d2), (d1, o), (d2, o), (s, o)]:
+            graph.add_edge(source, target, EdgeType.CAUSES, 0.8)
+        
+        assert graph.count_paths([s], [o]) == (3, {s: 3, d1: 1, d2: 1, o: 3})
+        assert graph.count_paths([s], [o], cutoff=1) == (1, {s: 1, o: 1})
+        
+        graph.add_edge(o, s, EdgeType.CAUSES, 0.8)
+        assert graph.count_paths([s], [o]) is None
+    
+    def test_stats_refresh_after_changes(self):
+        """Test cached stats and cycle checks follow graph changes"""
+        graph = CausalGraph()
+        s = graph.add_symptom("fever", 0.9)
+        d = graph.add_diagnosis("pneumonia", 0.85)
+        graph.add_edge(s, d, EdgeType.CAUSES, 0.8)
+        
+        assert graph.get_stats()["num_edges"] == 1
+        assert not graph.has_cycles()
+        
+        graph.add_edge(d, s, EdgeType.CAUSES, 0.8)
+        assert graph.get_stats()["num_edges"] == 2
+        assert graph.has_cycles()
+    
+    def test_memoized_results_under_concurrent_reads(self):
+        """Test concurrent readers of a fresh graph all get derived results"""
+        graph = CausalGraph()
+        s = graph.add_symptom("fever", 0.9)
+        d = graph.add_diagnosis("pneumonia", 0.85)
+        graph.add_edge(s, d, EdgeType.CAUSES, 0.8)
+        readers = [graph.get_stats, graph.has_cycles, lambda: graph.reaches(s, d)] * 8
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda read: read(), readers))
+        
+        assert results[:3] == [graph.get_stats(), False, True]
+        assert results == results[:3] * 8
+    
     def test_json_export(self):
         """Test JSON export and import"""
         graph = CausalGraph()
@@ -97,6 +221,31 @@ class TestCausalGraph:
         graph2 = CausalGraph.from_json(json_str)
         assert graph2.graph_id == graph.graph_id
         assert len(list(graph2.graph.nodes())) == len(list(graph.graph.nodes()))
+        
+        # Compact export carries the same data
+        assert json.loads(graph.to_json(indent=None)) == json.loads(json_str)
+    
+    def test_lowered_contents_track_updates(self):
+        """Test memoized lowercased content follows node content changes"""
+        graph = CausalGraph()
+        node_id = graph.add_symptom("High Fever", confidence=0.9)
+        
+        assert [c for _, c, _ in graph.iter_lowered_contents()] == ["high fever"]
+        
+        graph.graph.nodes[node_id]["content"] = "Mild Fever"
+        assert [c for _, c, _ in graph.iter_lowered_contents()] == ["mild fever"]
+    
+    def test_find_nodes_by_type(self):
+        """Test type lookups include nodes added outside add_node"""
+        graph = CausalGraph()
+        symptom_id = graph.add_symptom("fever", confidence=0.9)
+        diagnosis_id = graph.add_diagnosis("flu", confidence=0.8)
+        
+        assert graph.find_nodes_by_type(NodeType.SYMPTOM) == [symptom_id]
+        assert graph.count_nodes_by_type(NodeType.TREATMENT) == 0
+        
+        restored = CausalGraph.from_dict(graph.to_dict())
+        assert restored.find_nodes_by_type(NodeType.DIAGNOSIS) == [diagnosis_id]
 
 
 class TestConfidenceScorer:
@@ -201,6 +350,19 @@ class TestGraphBuilder:
         
         assert graph.graph.number_of_nodes() > 0
         assert graph.graph.number_of_edges() >= 0
+    
+    def test_edge_type_and_strength(self):
+        """Test relationship keywords map to edge types in priority order"""
+        builder = get_graph_builder()
+        
+        assert builder._determine_edge_type("Treated, which causes relief") == EdgeType.CAUSES
+        assert builder._determine_edge_type("treated by") == EdgeType.TREATED_BY
+        assert builder._determine_edge_type("Results in") == EdgeType.LEADS_TO
+        assert builder._determine_edge_type("associated with") == EdgeType.SUPPORTS
+        
+        assert builder._determine_causal_strength(0.85) == CausalStrength.STRONG
+        assert builder._determine_causal_strength(0.6) == CausalStrength.MODERATE
+        assert builder._determine_causal_strength(0.2) == CausalStrength.WEAK
 
 
 class TestTrailExtractor:
@@ -226,6 +388,11 @@ class TestTrailExtractor:
         assert "graph_id" in trail
         assert trail["num_paths"] > 0
         assert len(trail["narratives"]) > 0
+        
+        # A direct route is listed before the longer one
+        graph.add_edge(s, o, EdgeType.LEADS_TO, 0.5)
+        trail = extractor.extract(graph)
+        assert [p["length"] for p in trail["paths"]] == [2, 4]
     
     def test_react_flow_export(self):
         """Test React Flow format export"""
@@ -241,3 +408,33 @@ class TestTrailExtractor:
         assert "edges" in react_flow_data
         assert len(react_flow_data["nodes"]) == 2
         assert len(react_flow_data["edges"]) == 1
+
+
+class TestBiasDetector:
+    """Test bias detection"""
+    
+    def test_demographic_usage(self):
+        """Test sensitive metadata values found in node content are reported"""
+        graph = CausalGraph()
+        graph.add_symptom("Chest pain in Male patient", confidence=0.6)
+        graph.add_diagnosis("Angina typical for age 70", confidence=0.9)
+        
+        usage = BiasDetector()._check_demographic_usage(
+            graph, {"gender": "male", "age": 70, "race": ""}
+        )
+        
+        assert usage["used_explicitly"] is True
+        assert usage["used_attributes"] == ["age", "gender"]
+        assert usage["impact_score"] == 0.9
+    
+    def test_premature_closure(self):
+        """Test confident diagnosis with a single piece of evidence is flagged"""
+        detector = BiasDetector()
+        graph = CausalGraph()
+        graph.add_evidence("Chest X-ray shows infiltrate", confidence=0.9)
+        graph.add_diagnosis("Pneumonia", confidence=0.9)
+        
+        assert detector._check_premature_closure(graph) is True
+        
+        graph.add_evidence("Elevated white cell count", confidence=0.8)
+        assert detector._check_premature_closure(graph) is False
@@ -26,3 +26,21 @@ def test_audit_logger():
     from core.logging_config import get_audit_logger
     audit_logger = get_audit_logger()
     assert audit_logger.name == "sevai.audit"
+
+
+def test_logging_is_queued(tmp_path):
+    """Records reach the file through the queue listener without stacking handlers"""
+    import logging
+    from logging.handlers import QueueHandler
+    from core.logging_config import _stop_listeners
+    
+    log_file = tmp_path / "queued.log"
+    setup_logging(log_level="DEBUG", log_file=log_file)
+    logger = setup_logging(log_level="DEBUG", log_file=log_file)
+    
+    assert len([h for h in logger.handlers if isinstance(h, QueueHandler)]) == 1
+    
+    get_logger("queued").debug("queued record")
+    _stop_listeners()  # flushes pending records
+    
+    assert "queued record" in log_file.read_text()
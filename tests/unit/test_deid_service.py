@@ -0,0 +1,44 @@
+"""
+Tests for De-identification Service
+"""
+
+from governance.deid_service import DeidService
+
+
+class TestDeidService:
+    def test_mask_text_labels_each_category(self):
+        """Every PHI category is masked with its own label"""
+        deid = DeidService()
+        
+        masked = deid.mask_text(
+            "MRN 1234567, SSN 123-45-6789, phone 555-123-4567, "
+            "email john.doe@example.com, DOB 01/02/1980, ZIP 90210"
+        )
+        
+        assert masked == (
+            "MRN [REDACTED] (PHI:MRN), SSN [REDACTED] (PHI:SSN), "
+            "phone [REDACTED] (PHI:PHONE), email [REDACTED] (PHI:EMAIL), "
+            "DOB [REDACTED] (PHI:DOB), ZIP [REDACTED] (PHI:ZIP)"
+        )
+
+    def test_mask_text_without_phi(self):
+        """Text without PHI is returned unchanged"""
+        deid = DeidService()
+        
+        assert deid.mask_text("Patient reports fever", replacement="***") == "Patient reports fever"
+
+    def test_mask_dict_only_masks_sensitive_keys(self):
+        """Nested sensitive keys are masked, other values kept"""
+        deid = DeidService()
+        
+        masked = deid.mask_dict({
+            "mrn": "1234567",
+            "note": "1234567",
+            "visits": [{"dob": "01/02/1980"}, "plain"]
+        })
+        
+        assert masked == {
+            "mrn": "[REDACTED] (PHI:MRN)",
+            "note": "1234567",
+            "visits": [{"dob": "[REDACTED] (PHI:DOB)"}, "plain"]
+        }
@@ -0,0 +1,91 @@
+"""
+Tests for LLM Response Cache
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from core.llm_cache import DiskResponseCache, LLMResponseCache
+
+
+class TestLLMResponseCache:
+    @pytest.fixture
+    def llm(self):
+        llm = MagicMock()
+        llm.generate.return_value = {"output": '{"symptoms": ["fever"]}', "cost": 0.01}
+        return llm
+
+    def test_exact_repeat_served_from_cache(self, llm):
+        """Identical requests only reach the LLM once"""
+        cache = LLMResponseCache(llm)
+        
+        first = cache.generate("Extract: fever", system_message="sys", temperature=0.3)
+        second = cache.generate("Extract: fever", system_message="sys", temperature=0.3)
+        
+        assert llm.generate.call_count == 1
+        assert second["output"] == first["output"]
+        assert second["cache_hit"] is True
+
+    def test_different_parameters_miss(self, llm):
+        """System message and parameters are part of the cache key"""
+        cache = LLMResponseCache(llm)
+        
+        cache.generate("Extract: fever", system_message="sys", temperature=0.3)
+        cache.generate("Extract: fever", system_message="other", temperature=0.3)
+        cache.generate("Extract: fever", system_message="sys", temperature=0.7)
+        
+        assert llm.generate.call_count == 3
+
+    def test_near_duplicate_prompts_miss(self, llm):
+        """Only exact prompts are served from cache"""
+        cache = LLMResponseCache(llm)
+        
+        cache.generate("Patient has fever")
+        cache.generate("Patient has no fever")
+        
+        assert llm.generate.call_count == 2
+
+    def test_ttl_expiry(self, llm):
+        """Expired entries are not served"""
+        cache = LLMResponseCache(llm, ttl_seconds=-1)
+        
+        cache.generate("Extract: fever")
+        cache.generate("Extract: fever")
+        
+        assert llm.generate.call_count == 2
+
+    def test_generate_json_reuses_parsed_output(self, llm):
+        """Parsed JSON is reused across hits; invalid JSON returns None"""
+        cache = LLMResponseCache(llm)
+        
+        first = cache.generate_json("Extract: fever")
+        second = cache.generate_json("Extract: fever")
+        
+        assert first == second == {"symptoms": ["fever"]}
+        assert llm.generate.call_count == 1
+        
+        llm.generate.return_value = {"output": "not json"}
+        assert cache.generate_json("Extract: cough") is None
+
+    def test_generate_json_returns_independent_copies(self, llm):
+        """Mutating a returned value does not leak into later hits"""
+        cache = LLMResponseCache(llm)
+        
+        first = cache.generate_json("Extract: fever")
+        first["symptoms"].append("cough")
+        first["severity"] = "high"
+        
+        assert cache.generate_json("Extract: fever") == {"symptoms": ["fever"]}
+
+
+class TestDiskResponseCache:
+    def test_responses_persist_across_instances(self, tmp_path):
+        """Stored responses are readable after reopening the file"""
+        path = str(tmp_path / "responses.db")
+        key = DiskResponseCache.key(model="gpt-4", prompt="Extract: fever")
+        
+        DiskResponseCache(path).put(key, {"output": "fever", "cost": 0.01})
+        reopened = DiskResponseCache(path)
+        
+        assert reopened.get(key) == {"output": "fever", "cost": 0.01}
+        assert reopened.get(DiskResponseCache.key(model="gpt-4", prompt="Extract: cough")) is None
+        assert len(reopened) == 1
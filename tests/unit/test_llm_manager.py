@@ -2,7 +2,9 @@
 Tests for LLM Manager
 """
 
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch, MagicMock
 from core.llm_manager import LLMManager
 
@@ -40,3 +42,78 @@ class TestLLMManager:
         
         # Short text
         assert llm.count_tokens("Hello world") > 0
+
+    def test_encoding_shared_between_instances(self, mock_openai):
+        """Tokenizer is loaded once per model name"""
+        first = LLMManager(api_key="test", model="gpt-4")
+        second = LLMManager(api_key="test", model="gpt-4")
+        
+        assert first.encoding is second.encoding
+
+    def test_encoding_loaded_once_under_concurrency(self, mock_openai):
+        """Concurrently created managers share one tokenizer load"""
+        def slow_load(model):
+            time.sleep(0.05)
+            return object()
+        
+        with patch('core.llm_manager.tiktoken.encoding_for_model', side_effect=slow_load) as load:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                managers = list(pool.map(
+                    lambda _: LLMManager(api_key="test", model="gpt-concurrency-test"), range(8)
+                ))
+        
+        assert load.call_count == 1
+        assert len({id(manager.encoding) for manager in managers}) == 1
+
+    def test_http_client_shared_between_instances(self, mock_openai):
+        """All managers reuse one HTTP connection pool"""
+        LLMManager(api_key="test")
+        LLMManager(api_key="other")
+        
+        first, second = (call.kwargs["http_client"] for call in mock_openai.call_args_list)
+        assert first is second
+
+    def test_input_tokens_include_system_message(self, mock_openai):
+        """System message and prompt both count against the context window"""
+        llm = LLMManager(api_key="test")
+        llm.max_tokens = 505
+        
+        with pytest.raises(ValueError):
+            llm.generate("four five six", system_message="one two three")
+
+    def test_batch_generate_keeps_prompt_order(self, mock_openai):
+        """Concurrent batch returns one response per prompt, in order"""
+        def create(**params):
+            completion = MagicMock()
+            completion.choices[0].message.content = params["messages"][-1]["content"].upper()
+            completion.usage.prompt_tokens = 10
+            completion.usage.completion_tokens = 5
+            completion.usage.total_tokens = 15
+            return completion
+        
+        mock_openai.return_value.chat.completions.create.side_effect = create
+        
+        llm = LLMManager(api_key="test")
+        results = llm.batch_generate(["fever", "cough", "rash"], max_workers=3)
+        
+        assert [r["output"] for r in results] == ["FEVER", "COUGH", "RASH"]
+        assert mock_openai.return_value.chat.completions.create.call_count == 3
+
+    def test_deterministic_requests_use_response_cache(self, mock_openai):
+        """Temperature-0 requests are cached; sampled requests are not"""
+        completion = MagicMock()
+        completion.choices[0].message.content = "Test response"
+        completion.usage.prompt_tokens = 10
+        completion.usage.completion_tokens = 5
+        completion.usage.total_tokens = 15
+        create = mock_openai.return_value.chat.completions.create
+        create.return_value = completion
+        
+        llm = LLMManager(api_key="test", cache_path=":memory:")
+        first = llm.generate("Test prompt", temperature=0)
+        second = llm.generate("Test prompt", temperature=0)
+        llm.generate("Test prompt", temperature=0.7)
+        
+        assert second["output"] == first["output"]
+        assert second["cache_hit"] is True
+        assert create.call_count == 2
@@ -2,23 +2,38 @@
 Tests for Agent Orchestrator
 """
 
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import DEFAULT, Mock, patch, MagicMock
 from agents.orchestrator import AgentOrchestrator
 from agents.base_agent import AgentResult
+from storage.vault import ExplainabilityVault as Vault, Input, AgentExecution, CausalStep, Output
+
+CHAINED_TABLES = (Input, AgentExecution, CausalStep, Output)
 
 class TestOrchestrator:
     @pytest.fixture
     def mock_agents(self):
-        with patch('agents.orchestrator.EvidenceIngestionAgent') as mock_ev, \
-             patch('agents.orchestrator.MedicalContextAgent') as mock_mc, \
-             patch('agents.orchestrator.CausalInferenceAgent') as mock_ci, \
-             patch('agents.orchestrator.ContradictionResolutionAgent') as mock_cr, \
-             patch('agents.orchestrator.get_vault') as mock_vault, \
-             patch('agents.orchestrator.get_graph_builder') as mock_gb, \
-             patch('agents.orchestrator.get_confidence_scorer') as mock_cs, \
-             patch('agents.orchestrator.get_trail_extractor') as mock_te, \
-             patch('agents.orchestrator.get_bias_detector') as mock_bd:
+        with patch.multiple(
+            'agents.orchestrator',
+            EvidenceIngestionAgent=DEFAULT,
+            MedicalContextAgent=DEFAULT,
+            CausalInferenceAgent=DEFAULT,
+            ContradictionResolutionAgent=DEFAULT
+        ) as mocks:
+            mock_ev = mocks["EvidenceIngestionAgent"]
+            mock_mc = mocks["MedicalContextAgent"]
+            mock_ci = mocks["CausalInferenceAgent"]
+            mock_cr = mocks["ContradictionResolutionAgent"]
+            
+            # Helpers are injected through the constructor
+            helpers = {
+                "vault": MagicMock(),
+                "graph_builder": MagicMock(),
+                "confidence_scorer": MagicMock(),
+                "trail_extractor": MagicMock(),
+                "bias_detector": MagicMock()
+            }
             
             # Setup agent instances
             common_result_args = {
@@ -45,27 +60,33 @@ class TestOrchestrator:
             mock_cr.return_value = cr_inst
             
             # Setup helpers
-            mock_gb.return_value.build_from_results.return_value = MagicMock(graph_id="test_graph")
-            mock_cs.return_value.calculate_from_factors.return_value = 0.88
-            mock_cs.return_value.get_level.return_value = "high"
-            mock_te.return_value.extract.return_value = {"paths": []}
+            helpers["graph_builder"].build_from_results.side_effect = lambda *args, **kwargs: MagicMock(graph_id="test_graph")
+            helpers["confidence_scorer"].calculate_from_factors.return_value = 0.88
+            helpers["confidence_scorer"].get_level.return_value = "high"
+            helpers["trail_extractor"].extract.return_value = {"paths": []}
+            helpers["trail_extractor"].export_graph_for_react_flow.return_value = {"nodes": [], "edges": []}
+            helpers["trail_extractor"].generate_summary.return_value = "summary"
             
             bd_report = MagicMock()
             bd_report.has_bias = False
+            bd_report.bias_score = 0.0
             bd_report.detected_types = []
-            mock_bd.return_value.check_graph.return_value = bd_report
+            bd_report.recommendations = []
+            bd_report.counterfactuals = []
+            helpers["bias_detector"].check_graph.return_value = bd_report
             
             yield {
                 "ev": ev_inst,
                 "mc": mc_inst, 
                 "ci": ci_inst,
                 "cr": cr_inst,
-                "vault": mock_vault
+                "vault": helpers["vault"],
+                "helpers": helpers
             }
 
     def test_pipeline_execution(self, mock_agents):
         """Test full pipeline execution flow"""
-        orchestrator = AgentOrchestrator()
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
         
         result = orchestrator.execute_pipeline("Patient has fever")
         
@@ -83,5 +104,191 @@ class TestOrchestrator:
         assert "bias_report" in result
         
         # Verify vault logging
-        assert mock_agents["vault"].return_value.log_input.called
-        assert mock_agents["vault"].return_value.log_output.called
+        assert mock_agents["vault"].log_input.called
+        assert mock_agents["vault"].log_output.called
+
+    def test_pipeline_result_memoized(self, mock_agents):
+        """Identical input is served from cache without re-running agents"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        first = orchestrator.execute_pipeline("Patient has fever")
+        second = orchestrator.execute_pipeline("Patient has fever")
+        
+        assert mock_agents["ev"].execute.call_count == 1
+        assert second["conclusion"] == first["conclusion"]
+        
+        # The cache hit is still audited
+        assert mock_agents["vault"].log_input.call_count == 2
+        assert mock_agents["vault"].log_output.call_count == 2
+        
+        orchestrator.clear_cache()
+        orchestrator.execute_pipeline("Patient has fever")
+        assert mock_agents["ev"].execute.call_count == 2
+
+    def test_bias_detection_adds_risk_flag(self, mock_agents):
+        """Detected bias is reported as a risk flag"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        bias_report = orchestrator.bias_detector.check_graph.return_value
+        bias_report.has_bias = True
+        bias_report.detected_types = ["demographic_bias"]
+        
+        result = orchestrator.execute_pipeline("Patient has fever")
+        
+        assert "BIAS_DETECTED: demographic_bias" in result["risk_flags"]
+
+    def test_minimal_detail_skips_exports(self, mock_agents):
+        """Minimal detail level does not render graph exports or the trail"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        result = orchestrator.execute_pipeline("Patient has fever", detail_level="minimal")
+        
+        assert result["causal_graph"]["export_json"] is None
+        assert result["reasoning_trail"] is None
+        assert not orchestrator.trail_extractor.extract.called
+
+    def test_get_similar_matches_by_symptoms(self, mock_agents):
+        """Previous runs are found by exact input or symptom overlap"""
+        mock_agents["ev"].execute.return_value.output = {"symptoms": ["Fever", "cough"]}
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        orchestrator.execute_pipeline("Patient has fever and cough")
+        
+        exact = orchestrator.get_similar("Patient has fever and cough")
+        assert exact["similarity"] == 1.0
+        
+        similar = orchestrator.get_similar("Febrile patient", symptoms=["fever", "cough", "rash"])
+        assert similar["similarity"] == pytest.approx(2 / 3)
+        
+        assert orchestrator.get_similar("Unrelated", symptoms=["fracture"]) is None
+    
+    def test_execute_batch(self, mock_agents):
+        """Batch execution returns one result per case"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        results = orchestrator.execute_batch(["Patient has fever", "Patient has cough"])
+        
+        assert len(results) == 2
+        assert mock_agents["ev"].execute.call_count == 2
+    
+    @pytest.fixture
+    def real_vault(self, mock_agents):
+        """Real in-memory vault in place of the mocked one, with int chain confidences"""
+        vault = Vault("sqlite:///:memory:")
+        mock_agents["helpers"]["vault"] = vault
+        mock_agents["ci"].execute.return_value.output = {
+            "causal_chains": [{"from": "fever", "to": "infection", "confidence": 1}]
+        }
+        yield vault
+        vault.close()
+
+    def test_execute_batch_keeps_vault_chain_valid(self, mock_agents, real_vault):
+        """Concurrent batch cases chain their vault records without forking"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        orchestrator.execute_batch([f"Patient case {i}" for i in range(8)])
+        
+        for table_class in CHAINED_TABLES:
+            assert real_vault.verify_chain(table_class)["valid"] is True
+        assert real_vault.verify_chain(Input)["records"] == 8
+    
+    def test_close_shuts_down_pools(self, mock_agents):
+        """A closed orchestrator releases its worker pools"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        orchestrator.execute_batch(["Patient has fever", "Patient has cough"])
+        
+        orchestrator.close()
+        
+        with pytest.raises(RuntimeError):
+            orchestrator.execute_batch(["Patient has rash"])
+    
+    def test_aexecute_batch(self, mock_agents):
+        """Async batch execution returns one result per case"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        results = asyncio.run(orchestrator.aexecute_batch(["Patient has fever", "Patient has cough"]))
+        
+        assert len(results) == 2
+        assert mock_agents["ev"].execute.call_count == 2
+
+    def test_aexecute_keeps_vault_chain_valid(self, mock_agents, real_vault):
+        """Async pipelines and batches chain their vault records without forking"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        async def run():
+            await asyncio.gather(
+                orchestrator.aexecute_pipeline("Patient case single"),
+                orchestrator.aexecute_batch([f"Patient case {i}" for i in range(6)])
+            )
+        
+        asyncio.run(run())
+        
+        for table_class in CHAINED_TABLES:
+            assert real_vault.verify_chain(table_class)["valid"] is True
+        assert real_vault.verify_chain(Input)["records"] == 7
+
+    def test_cache_hit_logged_to_vault(self, mock_agents, real_vault):
+        """A memoized result is served with its own vault output record"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        first = orchestrator.execute_pipeline("Patient has fever")
+        second = orchestrator.execute_pipeline("Patient has fever")
+        
+        assert mock_agents["ev"].execute.call_count == 1
+        assert second["input_id"] == first["input_id"]
+        assert second["output_id"] != first["output_id"]
+        
+        with real_vault.SessionLocal() as session:
+            output = session.get(Output, second["output_id"])
+            execution = session.get(AgentExecution, output.execution_id)
+        assert output.conclusion == first["conclusion"]
+        assert execution.agent_id == "result_cache"
+        assert real_vault.verify_chain(Output) == {
+            "table": "outputs", "records": 2, "valid": True, "first_invalid_id": None
+        }
+
+    @pytest.mark.parametrize("failing, logged_agents", [
+        ("graph", ["evidence_ingestion", "medical_context", "causal_inference", "contradiction_resolution"]),
+        ("causal", ["evidence_ingestion", "medical_context"])
+    ])
+    def test_failed_pipeline_logs_completed_agents(self, mock_agents, real_vault, failing, logged_agents):
+        """Agents that finished before a failure still reach the audit vault"""
+        if failing == "graph":
+            mock_agents["helpers"]["graph_builder"].build_from_results.side_effect = RuntimeError("graph failed")
+        else:
+            mock_agents["ci"].execute.side_effect = RuntimeError("agent failed")
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        with pytest.raises(RuntimeError):
+            orchestrator.execute_pipeline("Patient has fever")
+        
+        with real_vault.SessionLocal() as session:
+            executions = session.query(AgentExecution).order_by(AgentExecution.id).all()
+            outputs = session.query(Output).count()
+        assert [execution.agent_id for execution in executions] == logged_agents
+        assert outputs == 0
+        assert real_vault.verify_chain(AgentExecution)["valid"] is True
+
+    def test_chains_without_evidence_log_no_refs(self, mock_agents, real_vault):
+        """Causal steps only carry evidence refs the chain actually cites"""
+        mock_agents["ci"].execute.return_value.output = {"causal_chains": [
+            {"from": "fever", "to": "infection", "confidence": 0.8},
+            {"from": "infection", "to": "sepsis", "confidence": 0.6, "evidence": "lactate 4.1"}
+        ]}
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        orchestrator.execute_pipeline("Patient has fever")
+        
+        with real_vault.SessionLocal() as session:
+            refs = [step.evidence_refs for step in session.query(CausalStep).order_by(CausalStep.id)]
+        assert refs == [[], ["lactate 4.1"]]
+
+    def test_evidence_memo_keyed_on_source_and_metadata(self, mock_agents):
+        """Same text with different source or metadata re-runs evidence ingestion"""
+        orchestrator = AgentOrchestrator(**mock_agents["helpers"])
+        
+        orchestrator.execute_pipeline("Patient has fever", detail_level="minimal")
+        orchestrator.execute_pipeline("Patient has fever", detail_level="standard")
+        assert mock_agents["ev"].execute.call_count == 1
+        
+        orchestrator.execute_pipeline("Patient has fever", metadata={"age": 70})
+        orchestrator.execute_pipeline("Patient has fever", source="api")
+        assert mock_agents["ev"].execute.call_count == 3
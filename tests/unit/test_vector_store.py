@@ -2,8 +2,10 @@
 Tests for Vector Store
 """
 
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from core.config import get_settings
 from storage.vector_store import VectorStore
 
 class TestVectorStore:
@@ -20,8 +22,8 @@ class TestVectorStore:
             
             def encode_side_effect(text_or_list, **kwargs):
                 if isinstance(text_or_list, list):
-                    return [MagicMock(tolist=lambda: [0.1] * 384) for _ in text_or_list]
-                return MagicMock(tolist=lambda: [0.1] * 384)
+                    return np.full((len(text_or_list), 384), 0.1, dtype=np.float32)
+                return np.full(384, 0.1, dtype=np.float32)
                 
             mock_model.encode.side_effect = encode_side_effect
             mock_st.return_value = mock_model
@@ -33,20 +35,72 @@ class TestVectorStore:
         assert mock_pinecone.called
         assert mock_sentence_transformer.encode.called is False # Just init
 
-    def test_upsert_documents_chunking(self, mock_pinecone, mock_sentence_transformer):
+    def test_new_index_uses_dotproduct_on_normalized_embeddings(self, mock_pinecone, mock_sentence_transformer):
+        """New indexes use dot product and every encode normalizes"""
+        vs = VectorStore(api_key="test")
+        vs.generate_embedding("fever")
+        vs.generate_embeddings(["cough", "rash"])
+        
+        assert mock_pinecone.return_value.create_index.call_args.kwargs["metric"] == "dotproduct"
+        assert all(
+            call.kwargs["normalize_embeddings"] is True
+            for call in mock_sentence_transformer.encode.call_args_list
+        )
+
+    def test_large_batches_use_multi_process_pool(self, mock_pinecone, mock_sentence_transformer):
+        """With several workers, only large batches go through the process pool"""
+        vs = VectorStore(api_key="test")
+        vs.embedding_workers = 2
+        
+        vs.generate_embeddings([f"fever {i}" for i in range(10)])
+        vs.generate_embeddings([f"fever {i}" for i in range(64)])
+        vs.generate_embeddings([f"cough {i}" for i in range(100)])
+        vs.close()
+        
+        pool = mock_sentence_transformer.start_multi_process_pool.return_value
+        calls = mock_sentence_transformer.encode.call_args_list
+        assert "pool" not in calls[0].kwargs
+        assert calls[1].kwargs["pool"] is pool and calls[2].kwargs["pool"] is pool
+        mock_sentence_transformer.start_multi_process_pool.assert_called_once_with(
+            target_devices=["cpu", "cpu"]
+        )
+        mock_sentence_transformer.stop_multi_process_pool.assert_called_once_with(pool)
+
+    def test_embedding_model_loaded_on_first_use(self, mock_pinecone):
+        """Construction and stats skip the model load; the first embed loads it once"""
+        existing = MagicMock()
+        existing.name = "sevai-test"
+        mock_pinecone.return_value.list_indexes.return_value = [existing]
+        with patch('storage.vector_store.SentenceTransformer') as mock_st:
+            mock_st.return_value.encode.return_value = np.full(384, 0.1, dtype=np.float32)
+            vs = VectorStore(api_key="test", index_name="sevai-test")
+            vs.index = MagicMock()
+            vs.index.describe_index_stats.return_value = {'total_vector_count': 0, 'dimension': 384}
+            
+            assert vs.get_stats()["dimension"] == 384
+            assert not mock_st.called
+            
+            vs.generate_embedding("fever")
+            vs.generate_embedding("cough")
+        
+        assert mock_st.call_count == 1
+
+    @pytest.mark.parametrize("n_sentences,batch_size", [(10, 10), (100, 10), (500, 64)])
+    def test_upsert_documents_chunking(self, mock_pinecone, mock_sentence_transformer, n_sentences, batch_size):
         """Test document chunking and upsert"""
         vs = VectorStore(api_key="test")
         vs.index = MagicMock()
         vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
         
         # Long text that needs chunking
-        long_text = "word " * 1000 
+        long_text = ". ".join(f"Sentence {i} about fever and cough" for i in range(n_sentences))
         docs = [{"text": long_text, "metadata": {"source": "test"}}]
         
-        stats = vs.upsert_documents(docs, batch_size=10)
+        stats = vs.upsert_documents(docs, batch_size=batch_size)
         
-        assert vs.index.upsert.called
-        assert stats["vectors"] > 0
+        batches = [call.kwargs["vectors"] for call in vs.index.upsert.call_args_list]
+        assert stats["vectors"] == len(vs.chunk_document(long_text)) == sum(map(len, batches))
+        assert max(map(len, batches)) <= batch_size
         
     def test_retrieve(self, mock_pinecone, mock_sentence_transformer):
         """Test semantic search (retrieve)"""
@@ -63,3 +117,215 @@ class TestVectorStore:
         assert len(results) == 1
         assert results[0]["score"] == 0.9
         assert mock_sentence_transformer.encode.called
+    
+    def test_retrieve_batch(self, mock_pinecone, mock_sentence_transformer):
+        """Test batched retrieval embeds once and returns results per query"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.query.return_value = {
+            "matches": [
+                {"id": "1", "score": 0.9, "metadata": {"chunk_text": "result"}}
+            ]
+        }
+        
+        results = vs.retrieve_batch(["fever cough", "pneumonia"], top_k=1)
+        
+        assert len(results) == 2
+        assert results[1][0]["text"] == "result"
+        assert mock_sentence_transformer.encode.call_count == 1
+        assert vs.index.query.call_count == 2
+
+    def test_retrieve_serves_repeated_queries_from_cache(self, mock_pinecone, mock_sentence_transformer):
+        """Repeated queries skip Pinecone until an upsert invalidates the cache"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
+        vs.index.query.return_value = {
+            "matches": [
+                {"id": "1", "score": 0.9, "metadata": {"chunk_text": "result"}}
+            ]
+        }
+        
+        first = vs.retrieve("fever cough", top_k=1)
+        first[0]["text"] = "mutated"
+        batch = vs.retrieve_batch(["fever cough", "pneumonia"], top_k=1)
+        
+        assert batch[0][0]["text"] == "result"
+        assert vs.index.query.call_count == 2
+        
+        vs.upsert_documents([{"text": "new guideline", "metadata": {"source": "a"}}])
+        vs.retrieve("fever cough", top_k=1)
+        
+        assert vs.index.query.call_count == 3
+
+    def test_vector_count_refreshed_only_when_stale(self, mock_pinecone, mock_sentence_transformer):
+        """Back-to-back ingests reuse the tracked count instead of describing the index"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 10}
+        
+        vs.upsert_documents([{"text": "first guideline", "metadata": {"source": "a"}}])
+        vs.upsert_documents([{"text": "second guideline", "metadata": {"source": "b"}}])
+        
+        assert vs.index.describe_index_stats.call_count == 1
+        assert vs._current_vector_count() == 12
+        
+        vs.delete_all()
+        vs._current_vector_count()
+        
+        assert vs.index.describe_index_stats.call_count == 2
+
+    def test_upsert_documents_streams_embedding_windows(self, mock_pinecone, mock_sentence_transformer):
+        """Chunks are embedded one window at a time and every chunk is upserted"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
+        
+        docs = ({"text": f"guideline {i}", "metadata": {"source": str(i)}} for i in range(20))
+        
+        stats = vs.upsert_documents(docs, batch_size=3, embed_batch_size=8)
+        
+        windows = [len(call.args[0]) for call in mock_sentence_transformer.encode.call_args_list]
+        upserted = sum(len(call.kwargs["vectors"]) for call in vs.index.upsert.call_args_list)
+        assert stats["documents"] == 20
+        assert windows == [8, 8, 4]
+        assert upserted == stats["vectors"] == 20
+
+    def test_upsert_documents_deduplicates_identical_chunks(self, mock_pinecone, mock_sentence_transformer):
+        """Repeated text is encoded once; repeated IDs are upserted once"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
+        
+        docs = [
+            {"text": "Consent form", "metadata": {"source": "a"}},
+            {"text": "Consent form", "metadata": {"source": "b"}},
+            {"text": "Consent form", "metadata": {"source": "b"}}
+        ]
+        
+        stats = vs.upsert_documents(docs)
+        
+        upserted = vs.index.upsert.call_args.kwargs["vectors"]
+        assert mock_sentence_transformer.encode.call_args.args[0] == ["Consent form."]
+        assert len(upserted) == stats["vectors"] == 2
+        assert stats["chunks"] == 3
+
+    def test_upsert_documents_batches_embeddings(self, mock_pinecone, mock_sentence_transformer):
+        """Chunks of all documents are embedded in one call and every batch is upserted"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
+        
+        docs = [
+            {"text": "word " * 1000, "metadata": {"source": "a"}},
+            {"text": "other " * 1000, "metadata": {"source": "b"}}
+        ]
+        
+        stats = vs.upsert_documents(docs, batch_size=2)
+        
+        assert mock_sentence_transformer.encode.call_count == 1
+        upserted = [
+            vector
+            for call in vs.index.upsert.call_args_list
+            for vector in call.kwargs["vectors"]
+        ]
+        assert len(upserted) == stats["vectors"] == stats["chunks"]
+        assert vs.index.upsert.call_count == -(-stats["vectors"] // 2)
+
+    def test_embedding_cache_skips_unchanged_text(self, mock_pinecone, mock_sentence_transformer):
+        """Re-embedding the same texts is served from the embedding cache"""
+        vs = VectorStore(api_key="test", embedding_cache_path=":memory:")
+        
+        first = vs.generate_embeddings(["fever", "cough"])
+        second = vs.generate_embeddings(["cough", "fever", "rash"])
+        
+        assert mock_sentence_transformer.encode.call_count == 2
+        assert mock_sentence_transformer.encode.call_args[0][0] == ["rash"]
+        assert second[1] == pytest.approx(first[0])
+        assert len(vs.embedding_cache) == 3
+
+    def test_embedding_backend_passed_to_model(self, mock_pinecone):
+        """A non-default inference backend is forwarded to SentenceTransformer"""
+        with patch('storage.vector_store.SentenceTransformer') as mock_st:
+            mock_st.return_value.get_sentence_embedding_dimension.return_value = 384
+            
+            VectorStore(api_key="test", embedding_backend="onnx").embedding_model
+        
+        assert mock_st.call_args.kwargs == {"backend": "onnx"}
+
+    def test_embedding_model_file_passed_to_model(self, mock_pinecone):
+        """An optimized ONNX file and provider are forwarded as model_kwargs"""
+        settings = get_settings().model_copy(update={
+            "embedding_model_file": "onnx/model_O4.onnx",
+            "embedding_provider": "CPUExecutionProvider"
+        })
+        with patch('storage.vector_store.get_settings', return_value=settings), \
+                patch('storage.vector_store.SentenceTransformer') as mock_st:
+            mock_st.return_value.get_sentence_embedding_dimension.return_value = 384
+            
+            VectorStore(api_key="test", embedding_backend="onnx").embedding_model
+        
+        assert mock_st.call_args.kwargs == {
+            "backend": "onnx",
+            "model_kwargs": {
+                "file_name": "onnx/model_O4.onnx",
+                "provider": "CPUExecutionProvider"
+            }
+        }
+
+    def test_grpc_transport(self, mock_pinecone, mock_sentence_transformer):
+        """use_grpc builds the index from the gRPC client"""
+        with patch('pinecone.grpc.PineconeGRPC') as mock_grpc:
+            vs = VectorStore(api_key="test", use_grpc=True)
+        
+        mock_grpc.assert_called_once_with(api_key="test")
+        assert not mock_pinecone.called
+        assert vs.index is mock_grpc.return_value.Index.return_value
+
+    def test_upsert_backs_off_on_rate_limit(self, mock_pinecone, mock_sentence_transformer):
+        """A throttled batch is retried and halves upsert concurrency"""
+        vs = VectorStore(api_key="test")
+        vs.index = MagicMock()
+        vs.index.describe_index_stats.return_value = {'total_vector_count': 0}
+        
+        throttled = Exception("Too Many Requests")
+        throttled.status = 429
+        vs.index.upsert.side_effect = [throttled, None]
+        
+        with patch('storage.vector_store.time.sleep') as mock_sleep:
+            stats = vs.upsert_documents([{"text": "fever", "metadata": {}}])
+        
+        assert stats["vectors"] == 1
+        assert vs.index.upsert.call_count == 2
+        mock_sleep.assert_called_once_with(1)
+
+    def test_chunk_document_overlap_is_sized_in_characters(self, mock_pinecone, mock_sentence_transformer):
+        """Overlap carries just enough trailing sentences to cover chunk_overlap"""
+        vs = VectorStore(api_key="test")
+        text = ". ".join(["a" * 30, "b" * 30, "c" * 30, "d" * 30])
+        
+        chunks = vs.chunk_document(text, chunk_size=70, chunk_overlap=25)
+        no_overlap = vs.chunk_document(text, chunk_size=70, chunk_overlap=0)
+        
+        assert [c["text"] for c in chunks] == [
+            "a" * 30 + ". " + "b" * 30 + ".",
+            "b" * 30 + ". " + "c" * 30 + ".",
+            "c" * 30 + ". " + "d" * 30 + "."
+        ]
+        assert len(no_overlap) == 2
+
+    def test_chunk_document_by_tokens(self, mock_pinecone, mock_sentence_transformer):
+        """Token-aware chunks respect the token limit and pack small pieces together"""
+        # Whitespace tokenizer: one token per word
+        mock_sentence_transformer.tokenizer.side_effect = lambda texts, **kwargs: {
+            "input_ids": [text.split() for text in texts]
+        }
+        vs = VectorStore(api_key="test")
+        
+        text = "Fever is common. Cough too.\n\n" + " ".join(["word"] * 25) + ". Short one."
+        chunks = vs.chunk_document_by_tokens(text, max_tokens=10)
+        
+        assert chunks[0]["text"] == "Fever is common. Cough too."
+        assert all(chunk["token_count"] <= 10 for chunk in chunks)
+        assert chunks[-1]["text"].endswith("Short one.")
+        assert " ".join(chunk["text"] for chunk in chunks).split() == text.split()